@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark multi-process CSV -> JSONL conversion from 1 to N processes.
+
+Usage:
+    python benchmarks/bench_csv_parallel.py --rows 200000 --max-processes 8
+"""
+
+import argparse
+import csv
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.csv_converter import TEMPLATE_SECTIONS, csv_to_jsonl_parallel
+
+
+def write_sample_csv(path: str, rows: int, seed: int = 42) -> None:
+    """Write a wide character CSV with quoted multi-line cells."""
+    rng = random.Random(seed)
+    fields = ['name', 'json_output'] + [
+        field for section in TEMPLATE_SECTIONS.values() for field in section
+        if field != 'name'
+    ]
+    samples = ['', 'short', 'two words', 'with, comma', 'multi\nline "quoted" text']
+
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(fields)
+        for row in range(rows):
+            writer.writerow(
+                [f'Character {row}', 'yes'] + [rng.choice(samples) for _ in fields[2:]]
+            )
+
+
+def _read_text(path: str) -> str:
+    """Read a file with universal newlines (output line endings may differ)."""
+    with open(path, 'r', encoding='utf-8') as fh:
+        return fh.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel CSV conversion')
+    parser.add_argument('--rows', type=int, default=100_000, help='Rows in the generated CSV')
+    parser.add_argument(
+        '--max-processes', type=int, default=os.cpu_count() or 1,
+        help='Highest process count to try (doubles from 1)'
+    )
+    args = parser.parse_args()
+
+    # Keep per-chunk log lines out of the timings
+    logging.getLogger('character_creation').setLevel(logging.ERROR)
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_processes:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != args.max_processes:
+        counts.append(args.max_processes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'characters.csv')
+        print(f"Generating {args.rows:,} rows...")
+        write_sample_csv(csv_path, args.rows)
+        size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+        print(f"Input: {size_mb:.1f} MB\n")
+
+        print(f"{'processes':>9}  {'seconds':>8}  {'rows/s':>10}  {'speedup':>7}")
+        baseline_path = None
+        baseline_seconds = None
+        for processes in counts:
+            out_path = os.path.join(tmp, f'out_{processes}.jsonl')
+            started = time.perf_counter()
+            is_valid, error, _ = csv_to_jsonl_parallel(csv_path, out_path, processes)
+            elapsed = time.perf_counter() - started
+            if not is_valid:
+                print(f"[ERROR] {error}")
+                return 1
+
+            if baseline_path is None:
+                baseline_path, baseline_seconds = out_path, elapsed
+            elif _read_text(baseline_path) != _read_text(out_path):
+                print(f"[ERROR] Output with {processes} processes differs from 1 process")
+                return 1
+
+            print(
+                f"{processes:>9}  {elapsed:>8.2f}  {args.rows / elapsed:>10,.0f}  "
+                f"{baseline_seconds / elapsed:>6.2f}x"
+            )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
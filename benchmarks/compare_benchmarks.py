@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Compare two benchmark result files.
+
+Usage:
+    python benchmarks/compare_benchmarks.py base.json head.json [--threshold 0.10]
+
+Exits with status 1 if any benchmark got slower than the threshold.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.10
+) -> List[Dict[str, Any]]:
+    """Compare benchmarks present in both result documents.
+
+    Args:
+        baseline: Results document from run_benchmarks.py
+        current: Results document to compare against the baseline
+        threshold: Relative slowdown (0.10 = 10%) reported as a regression
+
+    Returns:
+        One row per shared benchmark with base/head times, ratio and status
+    """
+    rows = []
+    for key, head in current['results'].items():
+        base = baseline['results'].get(key)
+        if not base:
+            continue
+        ratio = head['min_s'] / base['min_s'] if base['min_s'] else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 - threshold:
+            status = 'improvement'
+        else:
+            status = 'unchanged'
+        rows.append({
+            'key': key,
+            'base_s': base['min_s'],
+            'head_s': head['min_s'],
+            'ratio': ratio,
+            'status': status,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    """Print a comparison table."""
+    print(f"{'benchmark':<56} {'base ms':>11} {'head ms':>11} {'ratio':>7}")
+    for row in rows:
+        marker = {'regression': '  [SLOWER]', 'improvement': '  [FASTER]'}.get(row['status'], '')
+        print(
+            f"{row['key']:<56} {row['base_s'] * 1000:>11.3f} {row['head_s'] * 1000:>11.3f} "
+            f"{row['ratio']:>6.2f}x{marker}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline', help='Baseline results JSON')
+    parser.add_argument('current', help='Results JSON to compare')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    with open(args.baseline, 'r', encoding='utf-8') as fh:
+        baseline = json.load(fh)
+    with open(args.current, 'r', encoding='utf-8') as fh:
+        current = json.load(fh)
+
+    rows = compare_results(baseline, current, args.threshold)
+    print_comparison(rows)
+    return 1 if any(row['status'] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Synthetic data generators for the benchmark suite.
+
+Every generator is deterministic for a given size and seed, so results
+from different commits are measured against identical inputs.
+"""
+
+import csv
+import json
+import os
+import random
+from typing import Any, Dict, List
+
+from src.csv_converter import TEMPLATE_SECTIONS
+from src.csv_tracker import CharacterCSVTracker
+
+SPECIES = ['Human', 'Elf', 'Dwarf', 'Halfling', 'Tiefling', 'Orc', 'Gnome']
+CLASSES = ['Fighter', 'Rogue', 'Wizard', 'Cleric', 'Bard', 'Ranger', 'Warlock']
+OCCUPATIONS = ['Pilot', 'Blacksmith', 'Scholar', 'Merchant', 'Guard', 'Sailor']
+FILLER = [
+    'quiet', 'stubborn', 'curious', 'loyal', 'scarred', 'tall', 'nervous',
+    'brilliant', 'reckless', 'kind', 'weathered', 'ambitious',
+]
+
+
+def character_name(index: int) -> str:
+    """Return the unique name used for record ``index``."""
+    return f"Character {index:07d}"
+
+
+def make_character_input(index: int, rng: random.Random) -> Dict[str, Any]:
+    """Build a nested character input record like test/example_characters.jsonl."""
+    return {
+        'metadata': {'new_doc_title': f"{character_name(index)} - Profile", 'json_output': index % 2 == 0},
+        'Demographics': {
+            'name': character_name(index),
+            'age': rng.choice(['teen', 'adult', 'middle-aged', 'elderly']),
+            'sex/gender': rng.choice(['male|he/him', 'female|she/her', 'nonbinary|they/them']),
+            'ethnicity': rng.choice(SPECIES),
+            'occupation': rng.choice(OCCUPATIONS),
+        },
+        'Physical Appearance': {
+            'eye color': rng.choice(['green', 'brown', 'grey']),
+            'height': f"{rng.randint(140, 200)} cm",
+        },
+        'Psychological Traits': {
+            'personality traits': ', '.join(rng.sample(FILLER, 3)),
+            'hobbies': rng.choice(['chess', 'sailing', 'forging', 'poetry']),
+        },
+    }
+
+
+def make_character_inputs(size: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """Build ``size`` character input records in memory."""
+    rng = random.Random(seed)
+    return [make_character_input(i, rng) for i in range(size)]
+
+
+def write_input_jsonl(path: str, size: int, seed: int = 1) -> None:
+    """Write ``size`` character input records as JSONL."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as fh:
+        for i in range(size):
+            fh.write(json.dumps(make_character_input(i, rng), ensure_ascii=False) + '\n')
+
+
+def write_input_csv(path: str, size: int, seed: int = 1) -> None:
+    """Write ``size`` character rows with every template column (plus a few unknown ones)."""
+    rng = random.Random(seed)
+    columns = ['new_doc_title', 'json_output']
+    for fields in TEMPLATE_SECTIONS.values():
+        columns.extend(field for field in fields if field not in columns)
+    columns += ['internal id', 'spreadsheet owner']
+
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        for i in range(size):
+            row = [f"{character_name(i)} - Profile", 'yes', character_name(i)]
+            row += [rng.choice(FILLER) if rng.random() < 0.6 else '' for _ in columns[3:]]
+            writer.writerow(row)
+
+
+def write_tracker_csv(path: str, size: int, seed: int = 1) -> None:
+    """Write a CharacterCSVTracker file with ``size`` records."""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.DictWriter(fh, fieldnames=CharacterCSVTracker.HEADERS)
+        writer.writeheader()
+        for i in range(size):
+            dnd = rng.random() < 0.7
+            writer.writerow({
+                'name': character_name(i),
+                'sex': rng.choice(['male', 'female']),
+                'gender': rng.choice(['he/him', 'she/her', 'they/them']),
+                'age_range': rng.choice(['teen', 'adult', 'elderly']),
+                'occupation': rng.choice(OCCUPATIONS),
+                'species': rng.choice(SPECIES) if dnd else '',
+                'class': rng.choice(CLASSES) if dnd else '',
+                'subclass': '',
+                'level': rng.randint(1, 20) if dnd else '',
+                'doc_url': f"https://docs.google.com/document/d/{i:012d}/edit",
+                'created_at': f"2025-01-01T00:00:{i % 60:02d}.{i:06d}",
+            })
+
+
+def write_tracker_jsonl(path: str, size: int, seed: int = 1, profile_chars: int = 2000) -> None:
+    """Write a characters.jsonl file with ``size`` records of full AI output."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as fh:
+        for i in range(size):
+            profile = ' '.join(rng.choice(FILLER) for _ in range(profile_chars // 8))
+            record = {
+                'metadata': {
+                    'created_at': f"2025-01-01T00:00:{i % 60:02d}.{i:06d}",
+                    'name': character_name(i),
+                    'inputs': {'sex': 'female', 'gender': 'she/her', 'age_range': 'adult',
+                               'occupation': rng.choice(OCCUPATIONS)},
+                    'doc_url': f"https://docs.google.com/document/d/{i:012d}/edit",
+                    'dnd': {'species': rng.choice(SPECIES), 'class': rng.choice(CLASSES),
+                            'subclass': None, 'level': rng.randint(1, 20)},
+                },
+                'ai_output': {'base_character': profile, 'dnd_enhancement': None},
+            }
+            fh.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def make_template(num_fields: int, fields_per_section: int = 25) -> str:
+    """Build a template in the Google Docs layout with ``num_fields`` fields."""
+    lines = []
+    for i in range(num_fields):
+        if i % fields_per_section == 0:
+            lines.append(f"### Section {i // fields_per_section + 1}")
+        if i % 2:
+            lines.append(f"**Field {i}:** {{{{FIELD_{i}}}}}")
+        else:
+            lines.append(f"- Field {i}: [blank]")
+    return '\n'.join(lines)
+
+
+def make_model_response(num_fields: int, fields_per_section: int = 25) -> str:
+    """Build a model response wrapping a JSON character with ``num_fields`` fields."""
+    data: Dict[str, Dict[str, str]] = {}
+    for i in range(num_fields):
+        section = data.setdefault(f"Section {i // fields_per_section + 1}", {})
+        section[f"Field {i}"] = f"value {i} with some {{braces}} and \"quotes\""
+    return "Here is the character:\n```json\n" + json.dumps(data, indent=2) + "\n```\nEnjoy!"
+
+
+def cached_file(data_dir: str, name: str, size: int, writer) -> str:
+    """Return the path of a generated data file, creating it on first use."""
+    path = os.path.join(data_dir, f"{size}_{name}")
+    if not os.path.exists(path):
+        tmp_path = path + '.tmp'
+        writer(tmp_path, size)
+        os.replace(tmp_path, path)
+    return path
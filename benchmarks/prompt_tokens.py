@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Compare input tokens of the full and compact JSON-mode prompts.
+
+By default the template is rebuilt from character_template_structure.json
+and tokens are estimated (~4 characters per token). Use --from-drive to
+fetch the real template with TEMPLATE_DOC_ID, and --count-tokens to count
+with the model's tokenizer through Vertex AI (free countTokens API).
+
+Usage:
+    python benchmarks/prompt_tokens.py
+    python benchmarks/prompt_tokens.py --from-drive --count-tokens --characters 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline import build_character_inputs
+from src.rate_limiter import estimate_tokens
+from src.template_parser import build_json_character_prompt, render_template_text
+from src.usage import get_model_pricing
+
+TEMPLATE_STRUCTURE_PATH = Path(__file__).parent.parent / 'character_template_structure.json'
+
+SAMPLE_CHARACTER = {
+    'name': 'Astra Moon',
+    'sex': 'female',
+    'gender': 'she/her',
+    'age_range': 'adult',
+    'ethnicity': 'Human',
+    'occupation': 'Starship Pilot',
+}
+
+
+def load_template(args: argparse.Namespace) -> str:
+    """Load the template text from a file, Drive or the structure JSON."""
+    if args.template_file:
+        with open(args.template_file, 'r', encoding='utf-8') as fh:
+            return fh.read()
+
+    if args.from_drive:
+        from dotenv import load_dotenv
+        from src.gdocs import create_services, get_template_text
+
+        load_dotenv()
+        drive_service, _ = create_services(os.environ['GOOGLE_APPLICATION_CREDENTIALS'])
+        return get_template_text(drive_service, os.environ['TEMPLATE_DOC_ID'])
+
+    with open(TEMPLATE_STRUCTURE_PATH, 'r', encoding='utf-8') as fh:
+        return render_template_text(json.load(fh))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare full vs compact JSON prompt tokens')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--template-file', help='Read the template text from this file')
+    source.add_argument('--from-drive', action='store_true',
+                        help='Export the template from Drive (GOOGLE_APPLICATION_CREDENTIALS, TEMPLATE_DOC_ID)')
+    parser.add_argument('--count-tokens', action='store_true',
+                        help='Count with the Gemini tokenizer (GOOGLE_PROJECT, GEMINI_MODEL) instead of estimating')
+    parser.add_argument('--characters', type=int, default=1000,
+                        help='Batch size used to project savings (default: 1000)')
+    args = parser.parse_args()
+
+    template_text = load_template(args)
+    inputs = build_character_inputs(SAMPLE_CHARACTER)
+    prompts = {
+        'full': build_json_character_prompt(template_text, inputs),
+        'compact': build_json_character_prompt(template_text, inputs, compact=True),
+    }
+
+    model_name = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+    if args.count_tokens:
+        from dotenv import load_dotenv
+        from src.gemini_client import GeminiClient
+
+        load_dotenv()
+        model_name = os.getenv('GEMINI_MODEL', model_name)
+        client = GeminiClient(os.environ['GOOGLE_PROJECT'], os.getenv('GOOGLE_LOCATION', 'us-central1'), model_name)
+        counter, method = client.count_tokens, f"{model_name} tokenizer"
+    else:
+        counter, method = estimate_tokens, "estimate, ~4 chars/token"
+
+    tokens = {mode: counter(prompt) for mode, prompt in prompts.items()}
+    saved = tokens['full'] - tokens['compact']
+
+    print(f"Template: {len(template_text):,} characters")
+    print(f"Prompt input tokens ({method}):")
+    for mode, prompt in prompts.items():
+        print(f"   {mode:<8} {tokens[mode]:>8,} tokens  {len(prompt):>8,} characters")
+    print(f"   saved    {saved:>8,} tokens per character ({saved / tokens['full']:.0%})")
+
+    pricing = get_model_pricing(model_name)
+    projected = saved * args.characters
+    line = f"   {args.characters:,} characters: {projected:,} input tokens saved"
+    if pricing is not None:
+        line += f" (~${projected * pricing[0] / 1_000_000:.2f} at {model_name} input pricing)"
+    print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the offline hot paths.
+
+Runs each benchmark at the requested record counts and stores the results
+as JSON so runs from different commits can be compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py                       # 1k and 100k records
+    python benchmarks/run_benchmarks.py --sizes 1k,100k,1m --data-dir .cache/bench
+    python benchmarks/run_benchmarks.py --only tracker --compare benchmarks/results/base.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks import data_generators as gen
+from benchmarks.compare_benchmarks import compare_results, print_comparison
+from src.character_input import process_character_file, validate_character_input
+from src.csv_converter import csv_to_json
+from src.csv_tracker import CharacterCSVTracker
+from src.json_tracker import get_character_by_name, list_characters, load_index
+from src.sqlite_tracker import CharacterSQLiteTracker
+from src.template_parser import (
+    build_json_character_prompt,
+    clear_template_cache,
+    parse_template_structure,
+    validate_json_output,
+)
+
+# name -> setup(size, data_dir) returning the zero-argument callable to time
+BENCHMARKS: Dict[str, Callable[[int, str], Callable[[], Any]]] = {}
+
+SAMPLE_INPUTS = {
+    'name': 'Astra Moon', 'sex': 'female', 'gender': 'she/her',
+    'age_range': 'adult', 'occupation': 'Starship Pilot',
+}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function under ``name``."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark('csv_converter.csv_to_json')
+def bench_csv_to_json(size, data_dir):
+    path = gen.cached_file(data_dir, 'input.csv', size, gen.write_input_csv)
+    return lambda: csv_to_json(path)
+
+
+@benchmark('character_input.process_character_file')
+def bench_process_character_file(size, data_dir):
+    path = gen.cached_file(data_dir, 'input.jsonl', size, gen.write_input_jsonl)
+    return lambda: process_character_file(path, is_jsonl=True)
+
+
+@benchmark('character_input.validate_character_input')
+def bench_validate_character_input(size, data_dir):
+    records = gen.make_character_inputs(size)
+    return lambda: [validate_character_input(record) for record in records]
+
+
+@benchmark('template_parser.parse_template_structure')
+def bench_parse_template_structure(size, data_dir):
+    template = gen.make_template(size)
+    return lambda: parse_template_structure(template)
+
+
+@benchmark('template_parser.parse_uncached')
+def bench_parse_template_structure_uncached(size, data_dir):
+    template = gen.make_template(size)
+
+    def parse_uncached():
+        clear_template_cache()
+        return parse_template_structure(template)
+
+    return parse_uncached
+
+
+@benchmark('template_parser.build_json_character_prompt')
+def bench_build_json_character_prompt(size, data_dir):
+    template = gen.make_template(size)
+    return lambda: build_json_character_prompt(template, SAMPLE_INPUTS)
+
+
+@benchmark('template_parser.validate_json_output')
+def bench_validate_json_output(size, data_dir):
+    response = gen.make_model_response(size)
+    return lambda: validate_json_output(response)
+
+
+@benchmark('csv_tracker.get_character_by_name')
+def bench_csv_tracker_by_name(size, data_dir):
+    tracker = CharacterCSVTracker(gen.cached_file(data_dir, 'tracker.csv', size, gen.write_tracker_csv))
+    name = gen.character_name(size - 1)
+    return lambda: tracker.get_character_by_name(name)
+
+
+@benchmark('csv_tracker.get_records_by_class')
+def bench_csv_tracker_by_class(size, data_dir):
+    tracker = CharacterCSVTracker(gen.cached_file(data_dir, 'tracker.csv', size, gen.write_tracker_csv))
+    return lambda: tracker.get_records_by_class('Wizard')
+
+
+@benchmark('sqlite_tracker.get_character_by_name')
+def bench_sqlite_tracker_by_name(size, data_dir):
+    def write_db(path, size):
+        csv_path = gen.cached_file(data_dir, 'tracker.csv', size, gen.write_tracker_csv)
+        tracker = CharacterSQLiteTracker(path)
+        tracker.import_from_csv(csv_path)
+        tracker.close()
+
+    tracker = CharacterSQLiteTracker(gen.cached_file(data_dir, 'tracker.db', size, write_db))
+    name = gen.character_name(size - 1)
+    return lambda: tracker.get_character_by_name(name)
+
+
+@benchmark('json_tracker.get_character_by_name')
+def bench_json_tracker_by_name(size, data_dir):
+    path = gen.cached_file(data_dir, 'tracker.jsonl', size, gen.write_tracker_jsonl)
+    load_index(path)  # Build the sidecar index outside the timed region
+    name = gen.character_name(size - 1)
+    return lambda: get_character_by_name(path, name)
+
+
+@benchmark('json_tracker.list_characters')
+def bench_json_tracker_list(size, data_dir):
+    path = gen.cached_file(data_dir, 'tracker.jsonl', size, gen.write_tracker_jsonl)
+    load_index(path)
+    return lambda: list_characters(path)
+
+
+def parse_size(text: str) -> int:
+    """Parse a record count like ``1000``, ``100k`` or ``1m``."""
+    text = text.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def time_callable(fn: Callable[[], Any], repeats: int, min_time: float) -> Tuple[List[float], int]:
+    """Time ``fn``, looping fast calls so each sample lasts at least ``min_time``.
+
+    Returns:
+        Tuple of (per-call seconds for each repeat, calls per repeat)
+    """
+    started = time.perf_counter()
+    fn()  # Warm-up call also calibrates the loop count
+    first = time.perf_counter() - started
+    number = max(1, int(min_time / first)) if first > 0 else 1000
+
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    return samples, number
+
+
+def git_commit() -> Optional[str]:
+    """Return the current short commit hash, if available."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent.parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    sizes: List[int],
+    data_dir: str,
+    only: Optional[str] = None,
+    repeats: int = 3,
+    min_time: float = 0.2
+) -> Dict[str, Any]:
+    """Run the selected benchmarks and return the results document."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, setup in BENCHMARKS.items():
+        if only and only not in name:
+            continue
+        for size in sizes:
+            fn = setup(size, data_dir)
+            samples, number = time_callable(fn, repeats, min_time)
+            entry = {
+                'name': name,
+                'size': size,
+                'min_s': min(samples),
+                'median_s': statistics.median(samples),
+                'repeats': repeats,
+                'number': number,
+            }
+            results[f"{name}@{size}"] = entry
+            print(f"{name:<45} {size:>9,}  {entry['min_s'] * 1000:>11.3f} ms")
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the offline hot-path benchmark suite')
+    parser.add_argument('--sizes', default='1k,100k', help='Comma-separated record counts (e.g. 1k,100k,1m)')
+    parser.add_argument('--only', help='Run only benchmarks whose name contains this text')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed samples per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per sample')
+    parser.add_argument('--data-dir', help='Directory to cache generated data (default: temporary)')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/<timestamp>-<commit>.json)')
+    parser.add_argument('--compare', help='Baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    # Per-call log lines would dominate the timings
+    logging.getLogger('character_creation').setLevel(logging.ERROR)
+
+    sizes = [parse_size(size) for size in args.sizes.split(',') if size.strip()]
+    print(f"{'benchmark':<45} {'records':>9}  {'min per call':>14}")
+
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+        document = run_suite(sizes, args.data_dir, args.only, args.repeats, args.min_time)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            document = run_suite(sizes, tmp, args.only, args.repeats, args.min_time)
+
+    output = args.output
+    if not output:
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+        output = str(Path(__file__).parent / 'results' / f"{stamp}-{document['meta']['commit'] or 'nogit'}.json")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as fh:
+        json.dump(document, fh, indent=2)
+    print(f"\nResults saved to: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        rows = compare_results(baseline, document, args.threshold)
+        print()
+        print_comparison(rows)
+        return 1 if any(row['status'] == 'regression' for row in rows) else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
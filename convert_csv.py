@@ -9,7 +9,7 @@ from src.logger import setup_logging, get_logger
 from src.csv_converter import (
     csv_to_json,
     csv_to_json_file,
-    csv_to_jsonl_file,
+    csv_to_jsonl_parallel,
     validate_csv_columns,
 )
 
@@ -51,6 +51,13 @@ def main():
         help='Preview conversion without saving'
     )
     
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='Worker processes for --jsonl conversion (default: 1, streams in-process)'
+    )
+    
     args = parser.parse_args()
     
     logger.info("=" * 60)
@@ -131,15 +138,20 @@ def main():
     
     # JSONL conversion
     if args.jsonl:
-        print(f"[CONVERT] Converting to JSONL: {args.jsonl}\n")
-        is_valid, error = csv_to_jsonl_file(args.csv_file, args.jsonl)
+        if args.processes > 1:
+            print(f"[CONVERT] Converting to JSONL with {args.processes} processes: {args.jsonl}\n")
+        else:
+            print(f"[CONVERT] Streaming to JSONL: {args.jsonl}\n")
+        is_valid, error, written = csv_to_jsonl_parallel(
+            args.csv_file, args.jsonl, processes=args.processes
+        )
         
         if not is_valid:
             print(f"[ERROR] {error}")
             logger.error(error)
             sys.exit(1)
         
-        print(f"[OK] Successfully converted and saved to: {args.jsonl}")
+        print(f"[OK] Successfully converted {written} character(s) and saved to: {args.jsonl}")
         logger.info(f"Conversion complete: {args.csv_file} -> {args.jsonl}")
         sys.exit(0)
 
@@ -0,0 +1,535 @@
+"""In-process stand-ins for Vertex AI Gemini and the Google Drive/Docs APIs.
+
+The fakes keep the same call shapes as the real clients (``generate_content``,
+``documents().create(...).execute()``, ...) and simulate latency, token
+counts, transient errors and 429 responses, so the full pipeline can be
+load tested without credentials or quota.
+
+Used by load_test.py and the tests only; not part of the ``src`` package.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import httplib2
+from google.api_core import exceptions as api_exceptions
+from googleapiclient.errors import HttpError
+
+from src.gdocs import split_paragraphs
+from src.gemini_client import GeminiClient
+
+# Approximate characters per token used for fake token counts
+CHARS_PER_TOKEN = 4
+
+# Characters per chunk of a fake streamed response
+STREAM_CHUNK_CHARS = 120
+
+_SCHEMA_RE = re.compile(r'REQUIRED JSON OUTPUT STRUCTURE:[^{]*(\{.*?\})\n\n', re.DOTALL)
+_FILLER_WORDS = (
+    'steady', 'wary', 'gifted', 'restless', 'gentle', 'stubborn', 'curious',
+    'scarred', 'loyal', 'quiet', 'brilliant', 'haunted', 'proud', 'kind',
+)
+
+
+class FakeLatencyModel:
+    """Simulated latency, errors and call statistics shared by the fakes."""
+
+    def __init__(
+        self,
+        latency_median: float = 0.2,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        time_scale: float = 1.0,
+        seed: Optional[int] = None
+    ) -> None:
+        """Initialize the latency model.
+
+        Args:
+            latency_median: Median call latency in seconds
+            latency_sigma: Log-normal spread of the latency (0 = constant)
+            error_rate: Probability a call fails with a transient 503
+            rate_limit_rate: Probability a call is rejected with a 429
+            retry_after: Retry-After hint (simulated seconds) sent with every
+                failure, so client backoff follows the simulated clock
+            time_scale: Multiplier applied to every sleep (e.g. 0.01 to run
+                a load test 100x faster than real time)
+            seed: Optional random seed for reproducible runs
+        """
+        self.latency_median: float = latency_median
+        self.latency_sigma: float = latency_sigma
+        self.error_rate: float = error_rate
+        self.rate_limit_rate: float = rate_limit_rate
+        self.retry_after: float = retry_after
+        self.time_scale: float = time_scale
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def random(self) -> float:
+        """Return a random float in [0, 1) (thread-safe)."""
+        with self._lock:
+            return self._rng.random()
+
+    def sample_latency(self, extra: float = 0.0) -> float:
+        """Sample a call latency in (unscaled) seconds."""
+        with self._lock:
+            jitter = self._rng.gauss(0.0, self.latency_sigma) if self.latency_sigma else 0.0
+        return self.latency_median * math.exp(jitter) + extra
+
+    def outcome(self) -> Optional[str]:
+        """Decide whether a call fails: 'rate_limited', 'error' or None."""
+        roll = self.random()
+        if roll < self.rate_limit_rate:
+            return 'rate_limited'
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 'error'
+        return None
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep for a simulated duration."""
+        time.sleep(seconds * self.time_scale)
+
+    async def asleep(self, seconds: float) -> None:
+        """Sleep for a simulated duration without blocking the event loop."""
+        await asyncio.sleep(seconds * self.time_scale)
+
+    def retry_after_header(self) -> str:
+        """Return the Retry-After value in real seconds (scaled)."""
+        return f"{self.retry_after * self.time_scale:.3f}"
+
+    def record(self, operation: str, seconds: float, failed: Optional[str] = None) -> None:
+        """Record a finished call (simulated seconds, before time_scale)."""
+        with self._lock:
+            self.calls.setdefault(operation, []).append(seconds)
+            if failed:
+                key = f"{operation}:{failed}"
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+
+class _FakeHTTPResponse:
+    """Carries headers on api_core exceptions (read by retry_after_seconds)."""
+
+    def __init__(self, headers: Dict[str, str]) -> None:
+        self.headers: Dict[str, str] = headers
+
+
+class FakeUsageMetadata:
+    """Token counts attached to fake Gemini responses."""
+
+    def __init__(
+        self,
+        prompt_token_count: int,
+        candidates_token_count: int,
+        cached_content_token_count: int = 0
+    ) -> None:
+        self.prompt_token_count: int = prompt_token_count
+        self.candidates_token_count: int = candidates_token_count
+        self.cached_content_token_count: int = cached_content_token_count
+        self.total_token_count: int = prompt_token_count + candidates_token_count
+
+
+class FakeGenerationResponse:
+    """Minimal stand-in for a Vertex AI GenerationResponse."""
+
+    def __init__(self, text: str, usage_metadata: Optional[FakeUsageMetadata]) -> None:
+        self.text: str = text
+        self.usage_metadata: Optional[FakeUsageMetadata] = usage_metadata
+
+
+class FakeCachedContent:
+    """Stand-in for a Vertex AI CachedContent holding a prompt prefix."""
+
+    def __init__(self, prefix: str, ttl: float) -> None:
+        self.prefix: str = prefix
+        self.ttl: float = ttl
+        self.updates: int = 0
+        self.deleted: bool = False
+
+    def update(self, ttl=None, expire_time=None) -> None:
+        """Record a TTL extension."""
+        self.updates += 1
+
+    def delete(self) -> None:
+        """Mark the cache deleted."""
+        self.deleted = True
+
+
+class FakeCountTokensResponse:
+    """Minimal stand-in for a Vertex AI CountTokensResponse."""
+
+    def __init__(self, total_tokens: int) -> None:
+        self.total_tokens: int = total_tokens
+
+
+class FakeGenerativeModel:
+    """Stand-in for ``vertexai.generative_models.GenerativeModel``."""
+
+    def __init__(
+        self,
+        model_name: str,
+        latency: FakeLatencyModel,
+        output_tokens: int = 900,
+        tokens_per_second: float = 150.0,
+        cached_content: Optional[FakeCachedContent] = None
+    ) -> None:
+        """Initialize the fake model.
+
+        Args:
+            model_name: Model name reported in responses
+            latency: Shared latency model
+            output_tokens: Typical response length in tokens (capped by
+                the request's max_output_tokens)
+            tokens_per_second: Simulated decode speed added to latency
+            cached_content: Context cache whose prefix precedes every prompt
+        """
+        self.model_name: str = model_name
+        self.latency: FakeLatencyModel = latency
+        self.output_tokens: int = output_tokens
+        self.tokens_per_second: float = tokens_per_second
+        self.cached_content: Optional[FakeCachedContent] = cached_content
+
+    def _plan(self, prompt: str, generation_config: Optional[Dict[str, Any]]):
+        """Pick the response, its latency and whether the call fails."""
+        cached_prefix = self.cached_content.prefix if self.cached_content else ''
+        prompt = cached_prefix + prompt
+        # GenerationConfig objects (used for response schemas) or plain dicts
+        config = generation_config.to_dict() if hasattr(generation_config, 'to_dict') else (generation_config or {})
+        max_tokens = int(config.get('max_output_tokens', 2048))
+        target = max(1, min(max_tokens, int(self.output_tokens * (0.75 + self.latency.random() / 2))))
+        response_schema = None
+        if config.get('response_mime_type') == 'application/json':
+            response_schema = config.get('response_schema')
+        text = self._response_text(prompt, target, response_schema)
+        tokens = max(1, len(text) // CHARS_PER_TOKEN)
+        seconds = self.latency.sample_latency(extra=tokens / self.tokens_per_second)
+        usage = FakeUsageMetadata(
+            max(1, len(prompt) // CHARS_PER_TOKEN), tokens, len(cached_prefix) // CHARS_PER_TOKEN
+        )
+        return FakeGenerationResponse(text, usage), seconds, self.latency.outcome()
+
+    def _response_text(
+        self,
+        prompt: str,
+        tokens: int,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build a plausible response: filled JSON schema or prose.
+
+        With a response schema the result is always JSON of that shape;
+        otherwise the schema is read from the prompt, as the model would.
+        """
+        words = [
+            _FILLER_WORDS[int(self.latency.random() * len(_FILLER_WORDS))]
+            for _ in range(max(1, tokens * CHARS_PER_TOKEN // 8))
+        ]
+        if response_schema:
+            properties = response_schema['properties']
+            skeleton = {}
+            for section in response_schema.get('property_ordering') or properties:
+                value = properties[section]
+                skeleton[section] = (
+                    dict.fromkeys(value.get('property_ordering') or value['properties'])
+                    if value.get('type') == 'OBJECT' else None
+                )
+            return json.dumps(self._fill(skeleton, words), ensure_ascii=False)
+        match = _SCHEMA_RE.search(prompt)
+        if match:
+            try:
+                schema = json.loads(match.group(1))
+            except json.JSONDecodeError:
+                schema = None
+            if isinstance(schema, dict):
+                return json.dumps(self._fill(schema, words), indent=2)
+        return ' '.join(words)
+
+    @staticmethod
+    def _fill(schema: Dict[str, Any], words: List[str]) -> Dict[str, Any]:
+        """Fill a section -> fields skeleton with the response words."""
+        fields = sum(len(v) if isinstance(v, dict) else 1 for v in schema.values()) or 1
+        per_field = max(1, len(words) // fields)
+        return {
+            section: {
+                field: ' '.join(words[i * per_field:(i + 1) * per_field])
+                for i, field in enumerate(value)
+            } if isinstance(value, dict) else ' '.join(words[:per_field])
+            for section, value in schema.items()
+        }
+
+    def _error(self, outcome: str) -> Exception:
+        """Build the exception Vertex AI raises for a failed call."""
+        response = _FakeHTTPResponse({'retry-after': self.latency.retry_after_header()})
+        if outcome == 'rate_limited':
+            return api_exceptions.ResourceExhausted('Quota exceeded (simulated)', response=response)
+        return api_exceptions.ServiceUnavailable('Service unavailable (simulated)', response=response)
+
+    def count_tokens(self, prompt: str) -> 'FakeCountTokensResponse':
+        """Simulate countTokens (instant, never fails)."""
+        return FakeCountTokensResponse(max(1, len(prompt) // CHARS_PER_TOKEN))
+
+    def generate_content(
+        self,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ):
+        """Simulate a synchronous generate_content call (or a streamed one)."""
+        if stream:
+            return self._stream(prompt, generation_config)
+        response, seconds, outcome = self._plan(prompt, generation_config)
+        if outcome:
+            # Rejections come back quickly, before any decoding
+            seconds = self.latency.sample_latency() / 4
+        self.latency.sleep(seconds)
+        self.latency.record('gemini.generate', seconds, outcome)
+        if outcome:
+            raise self._error(outcome)
+        return response
+
+    def _stream(self, prompt: str, generation_config: Optional[Dict[str, Any]]):
+        """Yield a response in chunks, paced at the simulated decode speed.
+
+        Like the real SDK, errors surface on the first chunk and only the
+        last chunk carries the token usage.
+        """
+        response, seconds, outcome = self._plan(prompt, generation_config)
+        if outcome:
+            seconds = self.latency.sample_latency() / 4
+            self.latency.sleep(seconds)
+            self.latency.record('gemini.stream', seconds, outcome)
+            raise self._error(outcome)
+
+        text = response.text
+        decode_seconds = response.usage_metadata.candidates_token_count / self.tokens_per_second
+        chunks = [
+            text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)
+        ]
+        self.latency.sleep(max(0.0, seconds - decode_seconds))
+        for i, chunk in enumerate(chunks):
+            self.latency.sleep(decode_seconds / len(chunks))
+            last = i == len(chunks) - 1
+            yield FakeGenerationResponse(chunk, response.usage_metadata if last else None)
+        self.latency.record('gemini.stream', seconds)
+
+    async def generate_content_async(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None):
+        """Simulate an async generate_content call."""
+        response, seconds, outcome = self._plan(prompt, generation_config)
+        if outcome:
+            seconds = self.latency.sample_latency() / 4
+        await self.latency.asleep(seconds)
+        self.latency.record('gemini.generate', seconds, outcome)
+        if outcome:
+            raise self._error(outcome)
+        return response
+
+
+class FakeGeminiClient(GeminiClient):
+    """GeminiClient backed by FakeGenerativeModel instead of Vertex AI.
+
+    Retries, rate limiting, caching and response parsing all run through
+    the real GeminiClient code; only the model call is simulated.
+    """
+
+    def __init__(
+        self,
+        model_name: str = 'fake-gemini',
+        latency: Optional[FakeLatencyModel] = None,
+        output_tokens: int = 900,
+        tokens_per_second: float = 150.0,
+        **kwargs: Any
+    ) -> None:
+        """Initialize the fake client.
+
+        Args:
+            model_name: Model name used for cache keys and reporting
+            latency: Latency model (default: 1.5s median, no errors)
+            output_tokens: Typical response length in tokens
+            tokens_per_second: Simulated decode speed
+            **kwargs: Passed to GeminiClient (max_in_flight, cache, ...)
+        """
+        super().__init__('fake-project', 'fake-location', model_name, **kwargs)
+        self.latency: FakeLatencyModel = latency or FakeLatencyModel(latency_median=1.5)
+        self.output_tokens: int = output_tokens
+        self.tokens_per_second: float = tokens_per_second
+
+    def _initialize_model(self) -> FakeGenerativeModel:
+        """Return the fake model (never touches Vertex AI)."""
+        if self._model is None:
+            self._model = FakeGenerativeModel(
+                self.model_name, self.latency, self.output_tokens, self.tokens_per_second
+            )
+        return self._model
+
+    def _create_cached_content(self, prefix: str, ttl: float) -> FakeCachedContent:
+        """Create an in-memory context cache."""
+        return FakeCachedContent(prefix, ttl)
+
+    def _model_from_cached_content(self, cached_content: FakeCachedContent) -> FakeGenerativeModel:
+        """Return a fake model that prepends the cached prefix."""
+        return FakeGenerativeModel(
+            self.model_name, self.latency, self.output_tokens,
+            self.tokens_per_second, cached_content=cached_content
+        )
+
+
+class _FakeRequest:
+    """Deferred fake API call with an ``execute()`` method."""
+
+    def __init__(self, service: '_FakeGoogleService', operation: str, handler) -> None:
+        self._service = service
+        self._operation = operation
+        self._handler = handler
+
+    def execute(self) -> Any:
+        """Run the simulated call (may be called again on retry)."""
+        return self._service._call(self._operation, self._handler)
+
+
+class _FakeGoogleService:
+    """Shared latency/error behaviour for the fake Drive and Docs services."""
+
+    def __init__(self, latency: Optional[FakeLatencyModel] = None) -> None:
+        self.latency: FakeLatencyModel = latency or FakeLatencyModel(latency_median=0.3)
+
+    def _call(self, operation: str, handler) -> Any:
+        """Sleep, maybe fail like googleapiclient, then run the handler."""
+        seconds = self.latency.sample_latency()
+        outcome = self.latency.outcome()
+        self.latency.sleep(seconds)
+        self.latency.record(operation, seconds, outcome)
+        if outcome == 'rate_limited':
+            resp = httplib2.Response({'status': 429, 'retry-after': self.latency.retry_after_header()})
+            raise HttpError(resp, b'{"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}')
+        if outcome == 'error':
+            resp = httplib2.Response({'status': 503, 'retry-after': self.latency.retry_after_header()})
+            raise HttpError(resp, b'{"error": {"code": 503}}')
+        return handler()
+
+
+class FakeDriveService(_FakeGoogleService):
+    """Stand-in for the Drive v3 service (template export and revision metadata)."""
+
+    def __init__(self, template_text: str, latency: Optional[FakeLatencyModel] = None) -> None:
+        """Initialize the fake Drive service.
+
+        Args:
+            template_text: Text returned when any document is exported
+            latency: Latency model (default: 0.3s median, no errors)
+        """
+        super().__init__(latency)
+        self.template_text: str = template_text
+        self.version: int = 1
+
+    def update_template(self, template_text: str) -> None:
+        """Replace the template text, bumping its revision like an edit in Docs."""
+        self.template_text = template_text
+        self.version += 1
+
+    def files(self) -> 'FakeDriveService':
+        return self
+
+    def export(self, fileId: str, mimeType: str) -> _FakeRequest:
+        return _FakeRequest(self, 'drive.export', lambda: self.template_text.encode('utf-8'))
+
+    def get(self, fileId: str, fields: str = '') -> _FakeRequest:
+        return _FakeRequest(self, 'drive.get', lambda: {
+            'modifiedTime': f"2025-01-01T00:00:{self.version % 60:02d}.000Z",
+            'version': str(self.version),
+        })
+
+
+def _check_body_range(data: bytes, start: int, end: int) -> None:
+    """Reject a range that is empty or reaches the body's final newline, like Docs."""
+    if not 0 <= start <= end <= len(data):
+        resp = httplib2.Response({'status': 400})
+        raise HttpError(resp, b'{"error": {"code": 400, "status": "INVALID_ARGUMENT"}}')
+
+
+class FakeDocsService(_FakeGoogleService):
+    """Stand-in for the Docs v1 service that keeps created docs in memory."""
+
+    def __init__(self, latency: Optional[FakeLatencyModel] = None) -> None:
+        """Initialize the fake Docs service.
+
+        Args:
+            latency: Latency model (default: 0.3s median, no errors)
+        """
+        super().__init__(latency)
+        self.documents_by_id: Dict[str, Dict[str, Any]] = {}
+        self._revisions: Dict[str, int] = {}
+        self._docs_lock = threading.Lock()
+
+    def documents(self) -> 'FakeDocsService':
+        return self
+
+    def create(self, body: Dict[str, Any]) -> _FakeRequest:
+        def handler():
+            doc_id = uuid.uuid4().hex
+            with self._docs_lock:
+                self.documents_by_id[doc_id] = {'title': body.get('title', ''), 'text': ''}
+            return {'documentId': doc_id, 'title': body.get('title', '')}
+        return _FakeRequest(self, 'docs.create', handler)
+
+    def batchUpdate(self, documentId: str, body: Dict[str, Any]) -> _FakeRequest:
+        def handler():
+            with self._docs_lock:
+                doc = self.documents_by_id[documentId]
+                required = body.get('writeControl', {}).get('requiredRevisionId')
+                if required and required != self._revision(documentId):
+                    resp = httplib2.Response({'status': 400})
+                    raise HttpError(resp, b'{"error": {"code": 400, "status": "FAILED_PRECONDITION"}}')
+                # Docs indexes count UTF-16 code units and start at 1
+                data = doc['text'].encode('utf-16-le')
+                for request in body.get('requests', []):
+                    insert = request.get('insertText')
+                    delete = request.get('deleteContentRange')
+                    if insert and 'endOfSegmentLocation' in insert:
+                        data += insert['text'].encode('utf-16-le')
+                    elif insert:
+                        offset = (insert['location']['index'] - 1) * 2
+                        _check_body_range(data, offset, offset)
+                        data = data[:offset] + insert['text'].encode('utf-16-le') + data[offset:]
+                    elif delete:
+                        start = (delete['range']['startIndex'] - 1) * 2
+                        end = (delete['range']['endIndex'] - 1) * 2
+                        _check_body_range(data, start, end)
+                        data = data[:start] + data[end:]
+                doc['text'] = data.decode('utf-16-le')
+                self._revisions[documentId] = self._revisions.get(documentId, 0) + 1
+            return {'documentId': documentId, 'replies': [{} for _ in body.get('requests', [])]}
+        return _FakeRequest(self, 'docs.batchUpdate', handler)
+
+    def get(self, documentId: str, fields: str = '') -> _FakeRequest:
+        def handler():
+            with self._docs_lock:
+                doc = self.documents_by_id[documentId]
+                # Section break, then one element per paragraph; the body
+                # always ends with a newline after the text
+                content = [{'endIndex': 1, 'sectionBreak': {}}]
+                index = 1
+                for paragraph in split_paragraphs(doc['text'] + '\n'):
+                    index += len(paragraph.encode('utf-16-le')) // 2
+                    content.append({
+                        'endIndex': index,
+                        'paragraph': {'elements': [{'textRun': {'content': paragraph}}]},
+                    })
+                return {
+                    'documentId': documentId,
+                    'title': doc['title'],
+                    'revisionId': self._revision(documentId),
+                    'body': {'content': content},
+                }
+        return _FakeRequest(self, 'docs.get', handler)
+
+    def _revision(self, document_id: str) -> str:
+        """Return a document's current revision ID."""
+        return f"rev-{self._revisions.get(document_id, 0)}"
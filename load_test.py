@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""End-to-end load test of main.py against in-process fake Google services.
+
+Runs the real pipeline (workers, retries, rate limiting, trackers) with
+FakeGeminiClient and fake Drive/Docs services, then reports throughput,
+latency percentiles per API operation and per pipeline span, and peak
+memory for each batch size.
+
+Usage:
+    python load_test.py --characters 20,100 --workers 8 --time-scale 0.05
+    python load_test.py --characters 50 --rate-limit-rate 0.1 --error-rate 0.02 --dnd
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import main as character_main
+from fake_services import (
+    FakeDocsService,
+    FakeDriveService,
+    FakeGeminiClient,
+    FakeLatencyModel,
+)
+from src.csv_tracker import CharacterCSVTracker
+from src.template_parser import render_template_text
+
+TEMPLATE_STRUCTURE_PATH = Path(__file__).parent / 'character_template_structure.json'
+
+
+def build_template_text() -> str:
+    """Build template text in the Google Docs layout from the template structure JSON."""
+    with open(TEMPLATE_STRUCTURE_PATH, 'r', encoding='utf-8') as fh:
+        return render_template_text(json.load(fh))
+
+
+def write_input_file(path: str, count: int) -> None:
+    """Write ``count`` character records as a JSONL input file."""
+    with open(path, 'w', encoding='utf-8') as fh:
+        for i in range(count):
+            record = {
+                'Demographics': {
+                    'name': f"Load Test {i:05d}",
+                    'age': 'adult',
+                    'sex/gender': 'female|she/her' if i % 2 else 'male|he/him',
+                    'ethnicity': 'Human',
+                    'occupation': 'Cartographer',
+                },
+            }
+            fh.write(json.dumps(record) + '\n')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the ``pct`` percentile (0-100) using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def peak_rss_mb() -> float:
+    """Return the process peak resident set size in MB, if available."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_batch(count: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run main() once for ``count`` characters and collect the metrics."""
+    gemini_latency = FakeLatencyModel(
+        latency_median=args.gemini_latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        time_scale=args.time_scale,
+        seed=args.seed,
+    )
+    google_latency = FakeLatencyModel(
+        latency_median=args.docs_latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        time_scale=args.time_scale,
+        seed=args.seed,
+    )
+    gemini_client = FakeGeminiClient(latency=gemini_latency, output_tokens=args.output_tokens)
+    services = (
+        FakeDriveService(build_template_text(), latency=google_latency),
+        FakeDocsService(latency=google_latency),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'input.jsonl')
+        write_input_file(input_path, count)
+        csv_path = os.path.join(tmp, 'characters.csv')
+        os.environ.update({
+            'TEMPLATE_DOC_ID': 'fake-template',
+            'CHARACTERS_CSV': csv_path,
+            'CHARACTERS_JSONL': os.path.join(tmp, 'characters.jsonl'),
+            'CHARACTERS_JSON_DIR': os.path.join(tmp, 'characters'),
+            'CHARACTERS_RUNS_DIR': os.path.join(tmp, 'runs'),
+            'CHARACTERS_DB': '',
+        })
+
+        timings_path = os.path.join(tmp, 'timings.json')
+        argv = ['--jsonl', input_path, '--workers', str(args.workers), '--timings-json', timings_path]
+        if args.dnd:
+            argv += ['--species', 'Elf', '--class', 'Wizard', '--level', '5']
+
+        cwd = os.getcwd()
+        started = time.perf_counter()
+        os.chdir(tmp)  # Keep logs/ out of the working tree
+        try:
+            with open(os.devnull, 'w', encoding='utf-8') as devnull, \
+                    contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+                character_main.main(argv, gemini_client=gemini_client, services=services)
+        except SystemExit:
+            pass  # Failures are counted from the tracker below
+        finally:
+            os.chdir(cwd)
+        elapsed = time.perf_counter() - started
+
+        completed = CharacterCSVTracker(csv_path).get_record_count() if os.path.exists(csv_path) else 0
+        pipeline_stages = {}
+        if os.path.exists(timings_path):
+            with open(timings_path, 'r', encoding='utf-8') as fh:
+                pipeline_stages = json.load(fh)['stages']
+
+    # Convert wall time back to simulated time
+    simulated = elapsed / args.time_scale if args.time_scale else elapsed
+    stages = {}
+    for latency in (gemini_latency, google_latency):
+        for operation, samples in latency.calls.items():
+            stages[operation] = {
+                'calls': len(samples),
+                'p50_s': percentile(samples, 50),
+                'p95_s': percentile(samples, 95),
+                'p99_s': percentile(samples, 99),
+            }
+    errors = {**gemini_latency.errors, **google_latency.errors}
+
+    return {
+        'characters': count,
+        'completed': completed,
+        'workers': args.workers,
+        'wall_seconds': elapsed,
+        'simulated_seconds': simulated,
+        'characters_per_minute': completed / simulated * 60 if simulated else 0.0,
+        'stages': stages,
+        'pipeline_stages': pipeline_stages,
+        'errors': errors,
+        'peak_rss_mb': peak_rss_mb(),
+        'peak_traced_mb': tracemalloc.get_traced_memory()[1] / (1024 * 1024) if tracemalloc.is_tracing() else None,
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    """Print one batch result."""
+    print(
+        f"\n[{result['characters']} characters, {result['workers']} workers] "
+        f"{result['completed']} completed in {result['simulated_seconds']:.1f}s simulated "
+        f"({result['wall_seconds']:.1f}s wall): {result['characters_per_minute']:.1f} characters/min"
+    )
+    print(f"   {'stage':<20} {'calls':>6} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8}")
+    for stage, stats in sorted(result['stages'].items()):
+        print(
+            f"   {stage:<20} {stats['calls']:>6} {stats['p50_s']:>8.2f} "
+            f"{stats['p95_s']:>8.2f} {stats['p99_s']:>8.2f}"
+        )
+    if result['pipeline_stages']:
+        print(f"   {'pipeline span':<20} {'count':>6} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8}  (wall time)")
+        for stage, stats in result['pipeline_stages'].items():
+            print(
+                f"   {stage:<20} {stats['count']:>6} {stats['p50_s']:>8.3f} "
+                f"{stats['p95_s']:>8.3f} {stats['p99_s']:>8.3f}"
+            )
+    if result['errors']:
+        print("   simulated failures: " + ", ".join(f"{k}={v}" for k, v in sorted(result['errors'].items())))
+    memory = f"peak RSS {result['peak_rss_mb']:.1f} MB"
+    if result['peak_traced_mb'] is not None:
+        memory += f", peak traced {result['peak_traced_mb']:.1f} MB"
+    print(f"   memory: {memory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the character pipeline with fake Google services')
+    parser.add_argument('--characters', default='20', help='Comma-separated batch sizes (default: 20)')
+    parser.add_argument('--workers', type=int, default=8, help='Pipeline workers (default: 8)')
+    parser.add_argument('--time-scale', type=float, default=0.05,
+                        help='Real seconds per simulated second (default: 0.05 = 20x faster)')
+    parser.add_argument('--gemini-latency', type=float, default=2.0, help='Median Gemini latency in seconds')
+    parser.add_argument('--docs-latency', type=float, default=0.4, help='Median Drive/Docs latency in seconds')
+    parser.add_argument('--output-tokens', type=int, default=900, help='Typical Gemini response tokens')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of a simulated 503 per call')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Probability of a simulated 429 per call')
+    parser.add_argument('--dnd', action='store_true', help='Enable the D&D enhancement stage')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the fakes')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Also report tracemalloc peak (slows the run)')
+    parser.add_argument('--output', help='Write results as JSON to this path')
+    args = parser.parse_args()
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    results = []
+    for count in (int(c) for c in args.characters.split(',') if c.strip()):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        result = run_batch(count, args)
+        print_report(result)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump({'settings': vars(args), 'results': results}, fh, indent=2)
+        print(f"\nResults saved to: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
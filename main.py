@@ -5,37 +5,42 @@ import argparse
 import os
 import json
 import sys
-from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
 
 from src.logger import setup_logging, get_logger
-from src.gdocs import create_services, get_template_text, create_doc, insert_text, get_doc_url
+from src.gdocs import create_services
 from src.gemini_client import GeminiClient
-from src.csv_tracker import CharacterCSVTracker
-from src.json_tracker import append_character_json
-from src.template_parser import (
-    build_json_character_prompt,
-    validate_json_output,
-    flatten_json_for_text,
-    save_character_json
-)
+from src.batch_prediction import LocalBatchBackend, VertexBatchBackend
+from src.response_cache import ResponseCache
 from src.dnd_enhancement import (
     DNDEnhancer,
-    generate_dnd_enhancement,
     DND_SPECIES,
     DND_CLASSES,
-    DND_SUBCLASSES
 )
 from src.character_input import (
     process_character_file,
     extract_character_args,
 )
+from src.pipeline import CharacterPipeline
+from src.rate_limiter import configure_rate_limiter
+from src.run_journal import RunJournal
+from src.sqlite_tracker import CharacterSQLiteTracker
+from src.template_cache import TemplateCache
+from src.timing import StageTimer
 
 
-def main():
-    """Main entry point for the character creation CLI."""
+def main(argv=None, gemini_client=None, services=None):
+    """Main entry point for the character creation CLI.
+    
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+        gemini_client: Optional pre-built Gemini client (e.g. a
+            FakeGeminiClient for load tests) used instead of Vertex AI
+        services: Optional (drive_service, docs_service) pair used instead
+            of authenticating with the service account
+    """
     # Initialize logging
     setup_logging()
     logger = get_logger()
@@ -119,7 +124,105 @@ def main():
         help='D&D 5e 2024 level (1-20)'
     )
     
-    args = parser.parse_args()
+    # Batch execution (optional)
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of characters to process concurrently (default: 1)'
+    )
+    parser.add_argument(
+        '--gemini-concurrency',
+        type=int,
+        default=None,
+        help='Max concurrent Gemini calls (default: --workers)'
+    )
+    parser.add_argument(
+        '--docs-concurrency',
+        type=int,
+        default=None,
+        help='Max concurrent Google Docs calls (default: --workers)'
+    )
+    parser.add_argument(
+        '--cache',
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help='Reuse cached Gemini responses for identical requests (default: off)'
+    )
+    parser.add_argument(
+        '--context-cache',
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help='Serve the shared template/instruction prompt prefix from a Vertex AI '
+             'context cache, so each request only carries the character inputs (default: off)'
+    )
+    parser.add_argument(
+        '--gemini-batch',
+        nargs='?',
+        const='vertex',
+        choices=['vertex', 'local'],
+        default=None,
+        help='Generate all characters through a batch prediction job before '
+             'writing docs (vertex = Vertex AI batch prediction via '
+             'GEMINI_BATCH_GCS_URI, local = file-based stand-in)'
+    )
+    parser.add_argument(
+        '--resume',
+        metavar='RUN_ID',
+        default=None,
+        help='Resume an interrupted run, skipping stages it already finished'
+    )
+    
+    parser.add_argument(
+        '--offline-template',
+        action='store_true',
+        help='Use the locally cached template without checking Drive for a newer revision'
+    )
+    parser.add_argument(
+        '--compact-prompt',
+        action='store_true',
+        help='In JSON mode, send only the output schema and inputs instead of '
+             'the full template text (fewer input tokens)'
+    )
+    parser.add_argument(
+        '--structured-output',
+        action='store_true',
+        help='In JSON mode, constrain Gemini to a response schema built from the '
+             'template, so responses are always parseable JSON'
+    )
+    parser.add_argument(
+        '--section-parallel',
+        action='store_true',
+        help='In JSON mode, generate a short character summary and then each template '
+             'section concurrently, instead of the whole profile in one request'
+    )
+    parser.add_argument(
+        '--json-repair-model',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='When local fixes cannot repair an invalid JSON response, ask Gemini to '
+             'fix it before falling back to text output (default: on)'
+    )
+    parser.add_argument(
+        '--stream-docs',
+        action='store_true',
+        help='Stream the generation that produces the document text and append it '
+             'to the Google Doc while it is generated (text mode or D&D enhancement)'
+    )
+    parser.add_argument(
+        '--timings-json',
+        metavar='PATH',
+        default=None,
+        help='Write per-stage timing totals and percentiles as JSON'
+    )
+    parser.add_argument(
+        '--timings-prom',
+        metavar='PATH',
+        default=None,
+        help='Write per-stage timings as a Prometheus textfile (e.g. for node_exporter)'
+    )
+    
+    args = parser.parse_args(argv)
     
     # Load and prepare character arguments
     character_args_list = []
@@ -189,9 +292,32 @@ def main():
     location = os.getenv('GOOGLE_LOCATION', 'us-central1')
     model_name = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
     csv_path = os.getenv('CHARACTERS_CSV', 'characters.csv')
+    db_path = os.getenv('CHARACTERS_DB')
     jsonl_path = os.getenv('CHARACTERS_JSONL', 'characters.jsonl')
     json_dir = os.getenv('CHARACTERS_JSON_DIR', 'characters')
     template_doc_id = os.getenv('TEMPLATE_DOC_ID')
+    cache_path = os.getenv('GEMINI_CACHE_PATH', os.path.join('.cache', 'gemini_responses.sqlite3'))
+    cache_ttl = float(os.getenv('GEMINI_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+    cache_max_mb = float(os.getenv('GEMINI_CACHE_MAX_MB', '512'))
+    context_cache_ttl = float(os.getenv('GEMINI_CONTEXT_CACHE_TTL_SECONDS', '3600'))
+    context_cache_min_tokens = int(os.getenv('GEMINI_CONTEXT_CACHE_MIN_TOKENS', '1024'))
+    runs_dir = os.getenv('CHARACTERS_RUNS_DIR', 'runs')
+    template_cache_dir = os.getenv('TEMPLATE_CACHE_DIR', os.path.join('.cache', 'templates'))
+    batch_gcs_uri = os.getenv('GEMINI_BATCH_GCS_URI')
+    batch_poll_seconds = float(os.getenv('GEMINI_BATCH_POLL_SECONDS', '30'))
+    
+    # Shared API rate limits (unset = unlimited; 429s are still retried)
+    configure_rate_limiter(
+        'gemini',
+        requests_per_minute=float(os.getenv('GEMINI_QPM', '0')) or None,
+        tokens_per_minute=float(os.getenv('GEMINI_TPM', '0')) or None
+    )
+    configure_rate_limiter(
+        'docs', requests_per_minute=float(os.getenv('DOCS_QPM', '0')) or None
+    )
+    configure_rate_limiter(
+        'drive', requests_per_minute=float(os.getenv('DRIVE_QPM', '0')) or None
+    )
     
     logger.debug(
         f"Configuration: project={project}, location={location}, "
@@ -200,7 +326,24 @@ def main():
     )
     
     # Initialize clients
-    gemini_client = GeminiClient(project, location, model_name)
+    response_cache = None
+    if args.cache:
+        response_cache = ResponseCache(
+            cache_path,
+            ttl_seconds=cache_ttl,
+            max_size_bytes=int(cache_max_mb * 1024 * 1024)
+        )
+        logger.info(f"Gemini response cache enabled: {cache_path}")
+    
+    uses_vertex = gemini_client is None or args.gemini_batch == 'vertex'
+    if gemini_client is None:
+        gemini_client = GeminiClient(project, location, model_name, cache=response_cache)
+    elif response_cache is not None:
+        gemini_client.cache = response_cache
+    if args.context_cache:
+        gemini_client.context_cache_ttl = context_cache_ttl
+        gemini_client.context_cache_min_tokens = context_cache_min_tokens
+        logger.info(f"Gemini context caching enabled (ttl {context_cache_ttl:.0f}s)")
     logger.debug("Gemini client initialized")
     
     # Initialize D&D enhancer with shared gemini_client
@@ -211,308 +354,205 @@ def main():
     logger.debug("D&D Enhancer initialized")
     
     # Validate configuration
-    if not service_account_file or not os.path.exists(service_account_file):
+    if services is None and (not service_account_file or not os.path.exists(service_account_file)):
         logger.error(f"Service account file not found: {service_account_file}")
         raise SystemExit(
             'ERROR: Set GOOGLE_APPLICATION_CREDENTIALS to a valid '
             'service account JSON path'
         )
-    if not project:
+    if not project and uses_vertex:
         logger.error("GOOGLE_PROJECT environment variable not set")
         raise SystemExit('ERROR: Set GOOGLE_PROJECT environment variable')
     if not template_doc_id:
         logger.error("TEMPLATE_DOC_ID environment variable not set")
         raise SystemExit('ERROR: Set TEMPLATE_DOC_ID environment variable')
+    if args.gemini_batch == 'vertex' and not batch_gcs_uri:
+        logger.error("GEMINI_BATCH_GCS_URI environment variable not set")
+        raise SystemExit('ERROR: Set GEMINI_BATCH_GCS_URI (gs://bucket/prefix) for --gemini-batch')
     
     logger.info("Configuration validated successfully")
     
     # Initialize Google services once
     print("🔗 Connecting to Google APIs...")
     logger.info("Connecting to Google APIs...")
-    drive_service, docs_service = create_services(service_account_file)
+    if services is None:
+        drive_service, docs_service = create_services(service_account_file)
+    else:
+        drive_service, docs_service = services
     
-    # Fetch template once
+    # Fetch template once (re-exported only when its Drive revision changed)
+    timer = StageTimer()
     print("📋 Loading template...")
     logger.info(f"Loading template from document: {template_doc_id}")
-    template_text = get_template_text(drive_service, template_doc_id)
+    try:
+        with timer.span('template_load'):
+            template_text = TemplateCache(template_cache_dir).get_template_text(
+                drive_service, template_doc_id, offline=args.offline_template
+            )
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        raise SystemExit(f'ERROR: {e}') from e
     
-    # Process each character
-    for char_idx, char_args in enumerate(character_args_list, 1):
-        print(f"\n{'='*60}")
-        print(f"📝 Character {char_idx}/{len(character_args_list)}: {char_args['name']}")
-        print(f"{'='*60}\n")
-        
-        logger.info(
-            f"Processing character {char_idx}: name={char_args.get('name')}, "
-            f"ethnicity={char_args.get('ethnicity')}, "
-            f"sex/gender={char_args.get('sex')}/{char_args.get('gender')}, "
-            f"age={char_args.get('age_range')}, "
-            f"occupation={char_args.get('occupation')}"
+    # Open the run journal (new run, or replay of an interrupted one)
+    if args.resume:
+        journal_path = os.path.join(runs_dir, f"{args.resume}.jsonl")
+        if not os.path.exists(journal_path):
+            logger.error(f"Run journal not found: {journal_path}")
+            raise SystemExit(f'ERROR: No run journal found for run ID {args.resume}')
+        journal = RunJournal(args.resume, runs_dir)
+        print(
+            f"♻️  Resuming run {journal.run_id} "
+            f"({journal.completed_count()} character(s) already completed)"
         )
-        
-        # Prepare character inputs
-        character_inputs = {
-            'name': char_args.get('name'),
-            'sex': char_args.get('sex'),
-            'gender': char_args.get('gender'),
-            'age_range': char_args.get('age_range'),
-            'ethnicity': char_args.get('ethnicity'),
-            'occupation': char_args.get('occupation'),
-        }
-        
-        # Add optional template fields if present
-        optional_fields = {}
-        for section in [
-            'Demographics', 'Physical Appearance', 'History',
-            'Psychological Traits', 'Communication',
-            'Strengths, Weaknesses, and Abilities', 'Relationships',
-            'Character Growth'
-        ]:
-            for key, value in char_args.items():
-                if key not in [
-                    'name', 'sex', 'gender', 'age_range', 'ethnicity',
-                    'occupation', 'species', 'character_class', 'level',
-                    'subclass', 'new_doc_title', 'json_output'
-                ]:
-                    optional_fields[key] = value
-        
-        if optional_fields:
-            character_inputs['optional_fields'] = optional_fields
-            logger.debug(f"Added {len(optional_fields)} optional fields")
-        
-        # Build prompt and call Gemini
-        print("🤖 Generating character with Gemini AI...")
-        logger.info("Building character generation prompt")
-        
-        json_output_mode = char_args.get('json_output', False)
-        
-        if json_output_mode:
-            print("   → Using structured JSON output")
-            logger.info("JSON output mode: requesting JSON from Gemini")
-            prompt = build_json_character_prompt(template_text, character_inputs)
-        else:
-            # Use legacy text-based approach
-            optional_text = ""
-            if optional_fields:
-                optional_text = (
-                    "\nOPTIONAL TEMPLATE FIELDS:\n"
-                    + "\n".join(
-                        f"- {k}: {v}" for k, v in optional_fields.items()
-                    ) + "\n"
+        logger.info(f"Resuming run {journal.run_id}")
+    else:
+        journal = RunJournal(RunJournal.new_run_id(), runs_dir)
+        print(f"🆔 Run ID: {journal.run_id} (resume with --resume {journal.run_id})")
+        logger.info(f"Starting run {journal.run_id}")
+    journal.start(
+        input=args.json or args.jsonl or 'cli',
+        characters=len(character_args_list)
+    )
+    
+    # Process characters (sequentially or through the worker pool)
+    workers = max(1, args.workers)
+    docs_service_factory = None
+    if workers > 1 and services is None:
+        def docs_service_factory():
+            return create_services(service_account_file)[1]
+
+    # Optional indexed SQLite tracker; the first run imports the existing CSV
+    tracker = None
+    if db_path:
+        tracker = CharacterSQLiteTracker(db_path)
+        if tracker.get_record_count() == 0 and os.path.exists(csv_path):
+            imported = tracker.import_from_csv(csv_path)
+            print(f"🗄️  Imported {imported} record(s) from {csv_path} into {db_path}")
+    
+    pipeline = CharacterPipeline(
+        gemini_client=gemini_client,
+        dnd_enhancer=dnd_enhancer,
+        docs_service=docs_service,
+        template_text=template_text,
+        csv_path=csv_path,
+        jsonl_path=jsonl_path,
+        json_dir=json_dir,
+        docs_service_factory=docs_service_factory,
+        gemini_concurrency=args.gemini_concurrency or workers,
+        docs_concurrency=args.docs_concurrency or workers,
+        journal=journal,
+        tracker=tracker,
+        timer=timer,
+        compact_prompt=args.compact_prompt,
+        stream_docs=args.stream_docs,
+        structured_output=args.structured_output,
+        json_repair_model=args.json_repair_model,
+        section_parallel=args.section_parallel,
+    )
+    
+    try:
+        if args.gemini_batch:
+            if args.gemini_batch == 'vertex':
+                batch_backend = VertexBatchBackend(project, location, model_name, batch_gcs_uri)
+            else:
+                # Local stand-in: answers the batch file with the online client
+                batch_backend = LocalBatchBackend(
+                    lambda prompt, config: gemini_client.generate(prompt, **config),
+                    work_dir=os.path.join(runs_dir, 'batch_local')
                 )
-            
-            prompt = (
-                "You are a creative character development assistant. "
-                "Fill in the following character template "
-                "by replacing all placeholder fields with realistic and interesting "
-                "details based on the provided inputs. "
-                "Maintain creative consistency and make the character vivid and memorable.\n\n"
-                
-                "CHARACTER INPUTS:\n"
-                f"- Name: {character_inputs['name']}\n"
-                f"- Sex: {character_inputs['sex']}\n"
-                f"- Gender Identity: {character_inputs['gender']}\n"
-                f"- Ethnicity: {character_inputs['ethnicity']}\n"
-                f"- Age Range: {character_inputs['age_range']}\n"
-                f"- Occupation: {character_inputs['occupation']}\n"
-                f"{optional_text}"
-                
-                "TEMPLATE TO FILL:\n"
-                "---START TEMPLATE---\n"
-                f"{template_text}\n"
-                "---END TEMPLATE---\n\n"
-                
-                "Instructions:\n"
-                "1. Replace all {{NAME}}, {{SEX}}, {{GENDER}}, {{AGE_RANGE}}, "
-                "{{OCCUPATION}} with the provided values\n"
-                "2. Fill in any other blank sections with creative and consistent "
-                "character details\n"
-                "3. Make the character's background, personality, and traits coherent\n"
-                "4. Output ONLY the completed character profile, nothing else\n"
-            )
-        
-        logger.info("Calling Gemini to generate base character profile")
-        gemini_response = gemini_client.generate(
-            prompt=prompt,
-            temperature=0.7,
-            max_output_tokens=2048
-        )
-        
-        # Process response based on output mode
-        character_json = None
-        if json_output_mode:
-            print("✓ Validating JSON structure...")
-            is_valid, character_json, error_msg = validate_json_output(
-                gemini_response
-            )
-            if not is_valid:
-                logger.warning(
-                    f"JSON validation failed: {error_msg}. Falling back to text mode."
+            try:
+                pipeline.prefetch_with_batch(
+                    character_args_list,
+                    batch_backend,
+                    work_dir=os.path.join(runs_dir, f"{journal.run_id}_batch"),
+                    poll_interval=batch_poll_seconds
                 )
-                print("⚠️  JSON validation failed, using text output instead")
-                filled_content = gemini_response
-            else:
-                logger.info("JSON validation successful")
-                filled_content = flatten_json_for_text(character_json)
-        else:
-            filled_content = gemini_response
-        
-        # Create new Google Doc
-        print("📄 Creating Google Doc...")
-        doc_title = (
-            char_args.get('new_doc_title') or
-            f"Character - {char_args['name']} - {datetime.utcnow().date()}"
-        )
-        logger.info(f"Creating new Google Doc: {doc_title}")
-        doc_id = create_doc(docs_service, doc_title)
-        
-        # Insert generated content
-        print("✍️  Inserting generated content...")
-        logger.info("Inserting generated content into document")
-        insert_text(docs_service, doc_id, filled_content)
+            except Exception as e:
+                # Whatever the batch finished is journaled; the rest is
+                # generated online, as for individual failed requests
+                logger.error(f"Batch prediction failed: {e}. Falling back to online generation.")
+                print(f"⚠️  Batch prediction failed ({e}); generating online instead")
         
-        # Check if D&D enhancement is requested
-        enhanced_content = None
-        species = char_args.get('species')
-        character_class = char_args.get('character_class')
-        level = char_args.get('level')
-        subclass = char_args.get('subclass')
-        
-        if species and character_class and level:
-            print("🐉 Generating D&D 5e 2024 enhancements...")
-            logger.info("D&D enhancement requested")
-            
-            if level < 1 or level > 20:
-                print("⚠️  Warning: Level should be between 1-20")
-                logger.warning(f"Invalid level: {level}")
-            
-            # Validate subclass if provided
-            if subclass:
-                valid_subclasses = DND_SUBCLASSES.get(character_class, [])
-                if subclass not in valid_subclasses:
-                    print(
-                        f"⚠️  Warning: '{subclass}' is not a valid subclass "
-                        f"for {character_class}"
-                    )
-                    logger.warning(
-                        f"Invalid subclass: {subclass} for {character_class}"
-                    )
-                    print(f"Valid options: {', '.join(valid_subclasses)}")
-                    subclass = None
-                else:
-                    print(f"   Subclass: {subclass}")
-                    logger.debug(f"Subclass validated: {subclass}")
-            
-            enhanced_content = dnd_enhancer.enhance_character(
-                base_character=filled_content,
-                species=species,
-                character_class=character_class,
-                level=level,
-                subclass=subclass
-            )
-            
-            # Clear the doc and insert enhanced content
-            print("📝 Updating document with D&D enhancements...")
-            logger.info("Replacing document content with D&D enhanced version")
-            requests = [
-                {
-                    'deleteContentRange': {
-                        'range': {'startIndex': 1, 'endIndex': 99999}
-                    }
-                },
-                {
-                    'insertText': {
-                        'location': {'index': 1},
-                        'text': enhanced_content
-                    }
-                }
-            ]
-            docs_service.documents().batchUpdate(
-                documentId=doc_id, body={'requests': requests}
-            ).execute()
-            final_content = enhanced_content
-        else:
-            final_content = filled_content
-        
-        # Get the document URL
-        doc_url = get_doc_url(doc_id)
-        logger.debug(f"Document created: {doc_url}")
-        
-        # Save to CSV
-        print("💾 Saving to character tracking CSV...")
-        logger.info(f"Saving character record to CSV: {csv_path}")
-        csv_tracker = CharacterCSVTracker(csv_path)
-        csv_tracker.append_record(
-            name=char_args['name'],
-            sex=char_args.get('sex'),
-            gender=char_args.get('gender'),
-            age_range=char_args.get('age_range'),
-            occupation=char_args.get('occupation'),
-            doc_url=doc_url,
-            species=species,
-            character_class=character_class,
-            level=level,
-            subclass=subclass
-        )
-        
-        # Save to JSONL with full AI output
-        print("📄 Saving to character tracking JSONL...")
-        logger.info(f"Saving character record to JSONL: {jsonl_path}")
-        append_character_json(
-            json_path=jsonl_path,
-            name=char_args['name'],
-            sex=char_args.get('sex'),
-            gender=char_args.get('gender'),
-            age_range=char_args.get('age_range'),
-            occupation=char_args.get('occupation'),
-            doc_url=doc_url,
-            filled_content=filled_content,
-            species=species,
-            character_class=character_class,
-            level=level,
-            subclass=subclass,
-            dnd_enhancement=enhanced_content
+        results, failures = pipeline.run(character_args_list, workers=workers)
+    finally:
+        # Stop paying for context cache storage once the batch is done
+        gemini_client.release_context_caches()
+    
+    if response_cache is not None:
+        stats = response_cache.stats()
+        logger.info(
+            f"Gemini response cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+            f"{stats['entries']} entries ({stats['size_bytes']} bytes)"
         )
-        
-        # Save individual character JSON if requested
-        if json_output_mode and character_json:
-            os.makedirs(json_dir, exist_ok=True)
-            json_filename = (
-                f"{char_args['name'].lower().replace(' ', '_')}_"
-                f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
-            )
-            json_file_path = os.path.join(json_dir, json_filename)
-            print("💾 Saving structured character JSON...")
-            logger.info(f"Saving structured character JSON: {json_file_path}")
-            save_character_json(json_file_path, character_json, char_args['name'])
-            print(f"   → {json_filename}")
-        
-        # Success output
-        print("\n✅ Character created successfully!\n")
-        print(f"📎 Document URL: {doc_url}")
-        logger.info("Character Creation Completed Successfully")
-        
-        if species:
-            subclass_info = f" ({subclass})" if subclass else ""
-            print(
-                f"🐉 D&D Profile: {species} {character_class} "
-                f"(Level {level}){subclass_info}"
-            )
-            logger.info(
-                f"D&D Profile: {species} {character_class} "
-                f"(Level {level}){subclass_info}"
-            )
-        
-        print(f"📊 Tracked in: {csv_path} & {jsonl_path}")
-        if json_output_mode:
-            print(f"💾 JSON saved to: {json_dir}/")
+        print(f"🗄️  Response cache: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+        response_cache.close()
+    if tracker is not None:
+        tracker.close()
     
     # Final summary
     print("\n" + "=" * 60)
-    print(f"✅ COMPLETE: {len(character_args_list)} character(s) created successfully!")
+    if failures:
+        print(
+            f"⚠️  COMPLETE: {len(results)} of {len(character_args_list)} "
+            f"character(s) created, {len(failures)} failed"
+        )
+        for name, error in failures:
+            print(f"   ❌ {name}: {error}")
+        print(f"♻️  Retry the failed character(s) with: --resume {journal.run_id}")
+    else:
+        print(f"✅ COMPLETE: {len(results)} character(s) created successfully!")
     print("=" * 60)
-    print("\nYour character(s) are ready to view and edit in Google Docs!")
+    if results:
+        print("\nYour character(s) are ready to view and edit in Google Docs!")
+    
+    # Gemini token usage and estimated cost
+    usage_total = gemini_client.usage.total()
+    print("\n🔢 Gemini usage:")
+    print(gemini_client.usage.format_summary())
+    estimated_cost = gemini_client.usage.estimated_cost()
+    logger.info(
+        f"Gemini usage: {usage_total.calls} call(s), {usage_total.prompt_tokens} prompt + "
+        f"{usage_total.candidates_tokens} output = {usage_total.total_tokens} tokens"
+        + (f", estimated cost ${estimated_cost:.4f}" if estimated_cost is not None else "")
+    )
+    
+    # How often each JSON repair tier fired
+    repair_stats = pipeline.json_repairer.stats()
+    if repair_stats['attempts']:
+        print("\n🩹 JSON repairs:")
+        print(pipeline.json_repairer.format_summary())
+        logger.info(
+            "JSON repairs: " + ", ".join(f"{tier}={count}" for tier, count in repair_stats.items())
+        )
+    
+    # Per-stage timing report
+    print("\n⏱️  Stage timings:")
+    print(timer.format_summary())
+    for stage, stats in timer.summary().items():
+        logger.info(
+            f"Stage {stage}: count={stats['count']}, total={stats['total_s']:.3f}s, "
+            f"p50={stats['p50_s']:.3f}s, p95={stats['p95_s']:.3f}s, errors={stats['errors']}"
+        )
+    if args.timings_json:
+        timer.write_json(
+            args.timings_json,
+            extra={
+                'run_id': journal.run_id,
+                'characters': len(character_args_list),
+                'completed': len(results),
+                'failed': len(failures),
+                'usage': gemini_client.usage.to_dict(),
+                'json_repair': repair_stats,
+            }
+        )
+        print(f"📈 Timings saved to: {args.timings_json}")
+    if args.timings_prom:
+        timer.write_prometheus(args.timings_prom)
+        print(f"📈 Prometheus timings saved to: {args.timings_prom}")
     logger.info("=" * 60)
+    if failures:
+        logger.error(f"{len(failures)} character(s) failed")
+        raise SystemExit(1)
     logger.info("All characters created successfully")
 
 
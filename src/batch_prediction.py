@@ -0,0 +1,304 @@
+"""Vertex AI batch prediction for large offline character runs."""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('character_creation')
+
+# Job states reported by backends
+JOB_RUNNING = 'RUNNING'
+JOB_SUCCEEDED = 'SUCCEEDED'
+JOB_FAILED = 'FAILED'
+
+
+def _prompt_digest(prompt: str) -> str:
+    """Hash a prompt so results can be matched back to their request."""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+def write_batch_input(
+    path: str,
+    requests: List[Tuple[str, str]],
+    generation_config: Dict[str, Any]
+) -> Dict[str, List[str]]:
+    """Write prompts as a Gemini batch-prediction input JSONL file.
+
+    Args:
+        path: Output JSONL path
+        requests: List of (request_id, prompt)
+        generation_config: Generation config applied to every request
+
+    Returns:
+        Mapping of prompt digest -> request IDs, used to match output
+        lines (which echo the request) back to their characters
+    """
+    digests: Dict[str, List[str]] = {}
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8') as fh:
+        for request_id, prompt in requests:
+            line = {
+                'request': {
+                    'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+                    'generationConfig': generation_config,
+                },
+            }
+            fh.write(json.dumps(line, ensure_ascii=False) + '\n')
+            digests.setdefault(_prompt_digest(prompt), []).append(request_id)
+
+    logger.info(f"Wrote {len(requests)} batch request(s) to {path}")
+    return digests
+
+
+def _response_text(response: Dict[str, Any]) -> Optional[str]:
+    """Extract generated text from a batch output response object."""
+    candidates = response.get('candidates') or []
+    if not candidates:
+        return None
+    parts = (candidates[0].get('content') or {}).get('parts') or []
+    texts = [part.get('text', '') for part in parts if 'text' in part]
+    return ''.join(texts) if texts else None
+
+
+def read_batch_output(
+    path: str,
+    digests: Dict[str, List[str]]
+) -> Dict[str, Any]:
+    """Read a batch-prediction output JSONL file.
+
+    Args:
+        path: Output JSONL path
+        digests: Mapping returned by write_batch_input()
+
+    Returns:
+        Mapping of request_id -> generated text, or an Exception for
+        requests that failed or are missing from the output
+    """
+    pending = {digest: list(ids) for digest, ids in digests.items()}
+    results: Dict[str, Any] = {}
+
+    with open(path, 'r', encoding='utf-8') as fh:
+        for line_num, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            try:
+                prompt = entry['request']['contents'][0]['parts'][0]['text']
+            except (KeyError, IndexError, TypeError):
+                logger.warning(f"Batch output line {line_num} has no request echo; skipping")
+                continue
+
+            ids = pending.get(_prompt_digest(prompt))
+            if not ids:
+                logger.warning(f"Batch output line {line_num} does not match any request")
+                continue
+            request_id = ids.pop(0)
+
+            text = _response_text(entry.get('response') or {})
+            if text is None:
+                status = entry.get('status') or 'empty response'
+                results[request_id] = RuntimeError(f"Batch request failed: {status}")
+            else:
+                results[request_id] = text
+
+    for ids in pending.values():
+        for request_id in ids:
+            results[request_id] = RuntimeError("Missing from batch output")
+
+    failed = sum(1 for value in results.values() if isinstance(value, Exception))
+    logger.info(f"Read {len(results) - failed} batch result(s), {failed} failed, from {path}")
+    return results
+
+
+class LocalBatchBackend:
+    """File-based stand-in for the Vertex AI batch endpoint.
+
+    Reads the same input JSONL, answers each request with ``responder``
+    and writes an output JSONL in the Vertex format, so the full batch
+    flow can run (and be tested) without GCS or Vertex AI.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[str, Dict[str, Any]], str],
+        work_dir: str = os.path.join('.cache', 'batch_local')
+    ) -> None:
+        """Initialize the local backend.
+
+        Args:
+            responder: Callable (prompt, generation_config) -> text; it may
+                raise to simulate a failed request
+            work_dir: Directory for job output files
+        """
+        self.responder = responder
+        self.work_dir: str = work_dir
+        self._jobs: Dict[str, str] = {}
+
+    def submit(self, input_path: str, display_name: str) -> str:
+        """Process the input file and return a job ID."""
+        job_id = f"local-{display_name}-{uuid.uuid4().hex[:6]}"
+        os.makedirs(self.work_dir, exist_ok=True)
+        output_path = os.path.join(self.work_dir, f"{job_id}.predictions.jsonl")
+
+        with open(input_path, 'r', encoding='utf-8') as src, \
+                open(output_path, 'w', encoding='utf-8') as dst:
+            for line in src:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                request = entry['request']
+                prompt = request['contents'][0]['parts'][0]['text']
+                try:
+                    text = self.responder(prompt, request.get('generationConfig') or {})
+                    entry['response'] = {
+                        'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}}]
+                    }
+                    entry['status'] = ''
+                except Exception as e:
+                    entry['status'] = str(e)
+                dst.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        self._jobs[job_id] = output_path
+        logger.info(f"Local batch job finished: {job_id}")
+        return job_id
+
+    def poll(self, job_id: str) -> str:
+        """Return the job state (local jobs finish on submit)."""
+        return JOB_SUCCEEDED if job_id in self._jobs else JOB_FAILED
+
+    def fetch_results(self, job_id: str, dest_path: str) -> str:
+        """Copy the job output to ``dest_path`` and return it."""
+        with open(self._jobs[job_id], 'rb') as src, open(dest_path, 'wb') as dst:
+            dst.write(src.read())
+        return dest_path
+
+
+class VertexBatchBackend:
+    """Vertex AI batch prediction backend (input/output staged in GCS)."""
+
+    def __init__(self, project: str, location: str, model_name: str, gcs_uri: str) -> None:
+        """Initialize the Vertex backend.
+
+        Args:
+            project: GCP project ID
+            location: GCP region
+            model_name: Gemini model name
+            gcs_uri: gs://bucket/prefix used to stage inputs and outputs
+        """
+        if not gcs_uri.startswith('gs://'):
+            raise ValueError(f"Batch GCS URI must start with gs://: {gcs_uri}")
+        self.project: str = project
+        self.location: str = location
+        self.model_name: str = model_name
+        self.gcs_uri: str = gcs_uri.rstrip('/')
+        self._jobs: Dict[str, Any] = {}
+
+    def _split_uri(self, uri: str) -> Tuple[str, str]:
+        """Split gs://bucket/path into (bucket, path)."""
+        bucket, _, blob = uri[len('gs://'):].partition('/')
+        return bucket, blob
+
+    def submit(self, input_path: str, display_name: str) -> str:
+        """Upload the input file and submit a batch prediction job."""
+        import vertexai
+        from google.cloud import storage
+        from vertexai.batch_prediction import BatchPredictionJob
+
+        vertexai.init(project=self.project, location=self.location)
+
+        input_uri = f"{self.gcs_uri}/{display_name}/input.jsonl"
+        bucket_name, blob_name = self._split_uri(input_uri)
+        storage.Client(project=self.project).bucket(bucket_name).blob(
+            blob_name
+        ).upload_from_filename(input_path)
+        logger.info(f"Uploaded batch input to {input_uri}")
+
+        job = BatchPredictionJob.submit(
+            source_model=self.model_name,
+            input_dataset=input_uri,
+            output_uri_prefix=f"{self.gcs_uri}/{display_name}/output",
+            job_display_name=display_name,
+        )
+        self._jobs[job.resource_name] = job
+        logger.info(f"Submitted Vertex AI batch job: {job.resource_name}")
+        return job.resource_name
+
+    def poll(self, job_id: str) -> str:
+        """Refresh and return the job state."""
+        job = self._jobs[job_id]
+        job.refresh()
+        if not job.has_ended:
+            return JOB_RUNNING
+        return JOB_SUCCEEDED if job.has_succeeded else JOB_FAILED
+
+    def fetch_results(self, job_id: str, dest_path: str) -> str:
+        """Download and concatenate the job's prediction files."""
+        from google.cloud import storage
+
+        job = self._jobs[job_id]
+        bucket_name, prefix = self._split_uri(job.output_location)
+        client = storage.Client(project=self.project)
+
+        with open(dest_path, 'wb') as dst:
+            for blob in client.list_blobs(bucket_name, prefix=prefix):
+                if blob.name.endswith('.jsonl'):
+                    dst.write(blob.download_as_bytes())
+        logger.info(f"Downloaded batch output from {job.output_location}")
+        return dest_path
+
+
+def run_batch_job(
+    backend,
+    requests: List[Tuple[str, str]],
+    generation_config: Dict[str, Any],
+    work_dir: str,
+    display_name: str,
+    poll_interval: float = 30.0,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """Write, submit and poll a batch job, returning results per request.
+
+    Args:
+        backend: LocalBatchBackend or VertexBatchBackend
+        requests: List of (request_id, prompt)
+        generation_config: Generation config for every request
+        work_dir: Local directory for input/output files
+        display_name: Job name (also used for file names)
+        poll_interval: Seconds between status checks
+        timeout: Max seconds to wait for the job (None = no limit)
+
+    Returns:
+        Mapping of request_id -> generated text or Exception
+
+    Raises:
+        RuntimeError: If the job fails
+        TimeoutError: If the job does not finish in time
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    input_path = os.path.join(work_dir, f"{display_name}.input.jsonl")
+    output_path = os.path.join(work_dir, f"{display_name}.output.jsonl")
+
+    digests = write_batch_input(input_path, requests, generation_config)
+    job_id = backend.submit(input_path, display_name)
+
+    started = time.monotonic()
+    state = backend.poll(job_id)
+    while state == JOB_RUNNING:
+        if timeout is not None and time.monotonic() - started > timeout:
+            raise TimeoutError(f"Batch job {job_id} did not finish within {timeout}s")
+        logger.info(f"Batch job {job_id} running; checking again in {poll_interval}s")
+        time.sleep(poll_interval)
+        state = backend.poll(job_id)
+
+    if state != JOB_SUCCEEDED:
+        raise RuntimeError(f"Batch job {job_id} ended in state {state}")
+
+    backend.fetch_results(job_id, output_path)
+    return read_batch_output(output_path, digests)
@@ -1,7 +1,11 @@
 """Convert CSV files to JSON/JSONL format for character creation."""
 
 import csv
+import io
+import itertools
 import json
+import multiprocessing
+import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -172,6 +176,25 @@ def normalize_field_name(field: str) -> str:
     return field.lower().strip().replace(' ', '_')
 
 
+def _build_field_lookup() -> Dict[str, Tuple[str, str]]:
+    """Map every normalized field name to its (section, field).
+    
+    Metadata fields come first, then sections in template order; the first
+    occurrence wins for names shared by several sections (e.g. 'other notes').
+    """
+    lookup: Dict[str, Tuple[str, str]] = {}
+    for meta_field in METADATA_FIELDS:
+        lookup.setdefault(normalize_field_name(meta_field), ('metadata', meta_field))
+    for section, fields in TEMPLATE_SECTIONS.items():
+        for field in fields:
+            lookup.setdefault(normalize_field_name(field), (section, field))
+    return lookup
+
+
+# Normalized field name -> (section, field), built once at import
+FIELD_LOOKUP: Dict[str, Tuple[str, str]] = _build_field_lookup()
+
+
 def find_matching_field(csv_column: str) -> Optional[Tuple[str, str]]:
     """Find the template field that matches a CSV column name.
     
@@ -181,20 +204,75 @@ def find_matching_field(csv_column: str) -> Optional[Tuple[str, str]]:
     Returns:
         Tuple of (section_name, field_name) or None if no match
     """
-    normalized = normalize_field_name(csv_column)
+    return FIELD_LOOKUP.get(normalize_field_name(csv_column))
+
+
+def build_column_plan(
+    fieldnames: List[str],
+) -> Tuple[List[Tuple[int, str, str]], List[str]]:
+    """Resolve a CSV header into a reusable column plan.
     
-    # Check metadata fields
-    for meta_field in METADATA_FIELDS:
-        if normalize_field_name(meta_field) == normalized:
-            return ('metadata', meta_field)
+    Args:
+        fieldnames: CSV header row
+        
+    Returns:
+        Tuple of (plan, unmatched_columns) where plan is a list of
+        (column_index, section_name, field_name) for matched columns
+    """
+    plan = []
+    unmatched = []
+    # Like csv.DictReader, a repeated header name keeps its first position
+    # but takes the value from its last column
+    last_index = {column: idx for idx, column in enumerate(fieldnames)}
+    seen = set()
+    for column in fieldnames:
+        if column in seen:
+            continue
+        seen.add(column)
+        match = find_matching_field(column)
+        if match:
+            plan.append((last_index[column], match[0], match[1]))
+        else:
+            unmatched.append(column)
     
-    # Check template sections
-    for section, fields in TEMPLATE_SECTIONS.items():
-        for field in fields:
-            if normalize_field_name(field) == normalized:
-                return (section, field)
+    if unmatched:
+        logger.warning(
+            f"Skipping {len(unmatched)} unmatched CSV column(s): "
+            f"{', '.join(unmatched[:5])}"
+            f"{'...' if len(unmatched) > 5 else ''}"
+        )
+    return plan, unmatched
+
+
+def plan_row_to_character(
+    values: List[str],
+    plan: List[Tuple[int, str, str]],
+) -> Dict[str, Any]:
+    """Convert a raw CSV row using a plan from build_column_plan().
     
-    return None
+    Args:
+        values: Row values as returned by csv.reader
+        plan: Column plan for the file's header
+        
+    Returns:
+        Character data dict (empty if the row has no matched values)
+    """
+    character: Dict[str, Dict[str, Any]] = {}
+    num_values = len(values)
+    
+    for idx, section, field in plan:
+        if idx >= num_values:
+            continue
+        converted_value = convert_value(values[idx], field)
+        if converted_value is None:
+            continue
+        
+        section_data = character.get(section)
+        if section_data is None:
+            section_data = character[section] = {}
+        section_data[field] = converted_value
+    
+    return character
 
 
 def convert_value(value: str, field_name: str) -> Union[str, bool, None]:
@@ -294,7 +372,7 @@ def csv_to_json(
         logger.error(error)
         return False, error, None
     
-    if not csv_file.suffix.lower() == '.csv':
+    if csv_file.suffix.lower() != '.csv':
         error = f"File is not a CSV: {csv_path}"
         logger.error(error)
         return False, error, None
@@ -305,22 +383,21 @@ def csv_to_json(
         characters = []
         
         with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            fieldnames = next(reader, None)
             
-            if not reader.fieldnames:
+            if not fieldnames:
                 error = "CSV file is empty or has no header row"
                 logger.error(error)
                 return False, error, None
             
-            logger.debug(f"CSV columns: {reader.fieldnames}")
+            logger.debug(f"CSV columns: {fieldnames}")
+            plan, _ = build_column_plan(fieldnames)
             
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is 1)
-                is_valid, error, character = csv_row_to_character(row)
-                
-                if not is_valid:
-                    error_msg = f"Row {row_num} validation failed: {error}"
-                    logger.error(error_msg)
-                    return False, error_msg, None
+            for row_num, values in enumerate(reader, start=2):  # Start at 2 (header is 1)
+                if not values:
+                    continue
+                character = plan_row_to_character(values, plan)
                 
                 if character:  # Only add if we got valid data
                     characters.append(character)
@@ -387,6 +464,277 @@ def csv_to_json(
         return False, error, None
 
 
+def _check_csv_path(csv_path: str) -> Optional[str]:
+    """Return an error message if csv_path is not an existing CSV file."""
+    csv_file = Path(csv_path)
+    if not csv_file.exists():
+        return f"CSV file not found: {csv_path}"
+    if csv_file.suffix.lower() != '.csv':
+        return f"File is not a CSV: {csv_path}"
+    return None
+
+
+def csv_to_jsonl_stream(
+    csv_path: str,
+    jsonl_output_path: str,
+) -> Tuple[bool, Optional[str], int]:
+    """Convert CSV to JSONL one row at a time with constant memory.
+    
+    Each row is converted and written as soon as it is read, so the size
+    of the input does not matter. Output goes to a temporary file that
+    replaces ``jsonl_output_path`` only when the conversion succeeds.
+    
+    Args:
+        csv_path: Path to CSV file
+        jsonl_output_path: Path to save JSONL file
+        
+    Returns:
+        Tuple of (is_valid, error_message, characters_written)
+    """
+    error = _check_csv_path(csv_path)
+    if error:
+        logger.error(error)
+        return False, error, 0
+    
+    logger.info(f"Streaming CSV file to JSONL: {csv_path}")
+    
+    output_file = Path(jsonl_output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_file.with_name(output_file.name + '.tmp')
+    written = 0
+    
+    try:
+        with open(csv_path, 'r', encoding='utf-8') as src, \
+                open(tmp_path, 'w', encoding='utf-8') as dst:
+            reader = csv.reader(src)
+            fieldnames = next(reader, None)
+            
+            if not fieldnames:
+                error = "CSV file is empty or has no header row"
+                logger.error(error)
+                return False, error, 0
+            
+            logger.debug(f"CSV columns: {fieldnames}")
+            plan, _ = build_column_plan(fieldnames)
+            
+            for row_num, values in enumerate(reader, start=2):  # Start at 2 (header is 1)
+                if not values:
+                    continue
+                character = plan_row_to_character(values, plan)
+                
+                if character:
+                    dst.write(json.dumps(character, ensure_ascii=False) + '\n')
+                    written += 1
+                else:
+                    logger.warning(f"Row {row_num} produced no character data")
+        
+        if not written:
+            error = "No valid character data found in CSV"
+            logger.error(error)
+            return False, error, 0
+        
+        os.replace(tmp_path, output_file)
+        logger.info(f"Saved {written} character(s) to JSONL: {jsonl_output_path}")
+        return True, None, written
+    
+    except csv.Error as e:
+        error = f"CSV parsing error: {e}"
+        logger.error(error)
+        return False, error, 0
+    except Exception as e:
+        error = f"Unexpected error: {e}"
+        logger.error(error)
+        return False, error, 0
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+# Bounds for the byte size of each chunk handed to a worker process
+MIN_CHUNK_BYTES = 1024 * 1024
+MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Block size used when scanning for row boundaries
+_SCAN_BLOCK_BYTES = 4 * 1024 * 1024
+
+
+def find_row_boundaries(
+    csv_path: str,
+    chunk_bytes: int,
+) -> Tuple[int, List[Tuple[int, int]]]:
+    """Split a CSV file into byte ranges that start and end on row boundaries.
+    
+    Quote parity is tracked while scanning, so newlines inside quoted
+    fields never end a chunk (escaped quotes ``""`` keep the parity).
+    
+    Args:
+        csv_path: Path to CSV file
+        chunk_bytes: Approximate size of each chunk
+        
+    Returns:
+        Tuple of (header_end_offset, [(start, end), ...]) covering the
+        data rows after the header
+    """
+    file_size = os.path.getsize(csv_path)
+    boundaries: List[int] = []
+    in_quotes = False
+    target = 0  # The header ends at the first row boundary
+    
+    with open(csv_path, 'rb') as fh:
+        pos = 0
+        while True:
+            block = fh.read(_SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            start = 0
+            while True:
+                if pos + len(block) <= target:
+                    # No boundary wanted in the rest of this block
+                    in_quotes ^= block.count(b'"', start) % 2 == 1
+                    break
+                newline = block.find(b'\n', max(start, target - pos))
+                if newline == -1:
+                    in_quotes ^= block.count(b'"', start) % 2 == 1
+                    break
+                in_quotes ^= block.count(b'"', start, newline) % 2 == 1
+                start = newline + 1
+                if not in_quotes:
+                    boundaries.append(pos + start)
+                    target = pos + start + chunk_bytes
+            pos += len(block)
+    
+    if not boundaries:
+        return file_size, []
+    
+    header_end = boundaries[0]
+    edges = boundaries + ([file_size] if boundaries[-1] < file_size else [])
+    ranges = list(itertools.pairwise(edges))
+    return header_end, ranges
+
+
+def _convert_chunk(task: Tuple[str, int, int, List[Tuple[int, str, str]]]) -> Tuple[bytes, int, int]:
+    """Convert one byte range of a CSV file to JSONL text (worker process).
+    
+    Args:
+        task: (csv_path, start, end, column_plan)
+        
+    Returns:
+        Tuple of (utf8_jsonl_bytes, characters_converted, empty_rows)
+    """
+    csv_path, start, end, plan = task
+    with open(csv_path, 'rb') as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    
+    # Decode like open(csv_path, 'r', encoding='utf-8') would
+    text = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')
+    lines = []
+    empty = 0
+    for values in csv.reader(text):
+        if not values:
+            continue
+        character = plan_row_to_character(values, plan)
+        if character:
+            lines.append(json.dumps(character, ensure_ascii=False))
+        else:
+            empty += 1
+    
+    # Encode here so the parent process only has to write bytes
+    jsonl = ('\n'.join(lines) + '\n').encode('utf-8') if lines else b''
+    return jsonl, len(lines), empty
+
+
+def csv_to_jsonl_parallel(
+    csv_path: str,
+    jsonl_output_path: str,
+    processes: int,
+    chunk_bytes: Optional[int] = None,
+) -> Tuple[bool, Optional[str], int]:
+    """Convert CSV to JSONL using a pool of worker processes.
+    
+    The file is split into byte ranges on row boundaries; each range is
+    converted in a worker and the results are written in the original
+    order, so the output is identical to csv_to_jsonl_stream().
+    
+    Args:
+        csv_path: Path to CSV file
+        jsonl_output_path: Path to save JSONL file
+        processes: Number of worker processes (1 = stream in-process)
+        chunk_bytes: Optional chunk size (default: sized from the file and
+            the number of processes)
+        
+    Returns:
+        Tuple of (is_valid, error_message, characters_written)
+    """
+    if processes <= 1:
+        return csv_to_jsonl_stream(csv_path, jsonl_output_path)
+    
+    error = _check_csv_path(csv_path)
+    if error:
+        logger.error(error)
+        return False, error, 0
+    
+    if chunk_bytes is None:
+        file_size = os.path.getsize(csv_path)
+        chunk_bytes = min(MAX_CHUNK_BYTES, max(MIN_CHUNK_BYTES, file_size // (processes * 4)))
+    
+    output_file = Path(jsonl_output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_file.with_name(output_file.name + '.tmp')
+    written = 0
+    empty_rows = 0
+    
+    try:
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            fieldnames = next(csv.reader(f), None)
+        
+        if not fieldnames:
+            error = "CSV file is empty or has no header row"
+            logger.error(error)
+            return False, error, 0
+        
+        logger.debug(f"CSV columns: {fieldnames}")
+        plan, _ = build_column_plan(fieldnames)
+        _, ranges = find_row_boundaries(csv_path, chunk_bytes)
+        tasks = [(csv_path, start, end, plan) for start, end in ranges]
+        
+        logger.info(
+            f"Converting CSV file to JSONL with {processes} processes "
+            f"({len(tasks)} chunk(s)): {csv_path}"
+        )
+        
+        with multiprocessing.Pool(processes) as pool, \
+                open(tmp_path, 'wb') as dst:
+            for jsonl, count, empty in pool.imap(_convert_chunk, tasks):
+                dst.write(jsonl)
+                written += count
+                empty_rows += empty
+        
+        if empty_rows:
+            logger.warning(f"{empty_rows} row(s) produced no character data")
+        
+        if not written:
+            error = "No valid character data found in CSV"
+            logger.error(error)
+            return False, error, 0
+        
+        os.replace(tmp_path, output_file)
+        logger.info(f"Saved {written} character(s) to JSONL: {jsonl_output_path}")
+        return True, None, written
+    
+    except csv.Error as e:
+        error = f"CSV parsing error: {e}"
+        logger.error(error)
+        return False, error, 0
+    except Exception as e:
+        error = f"Unexpected error: {e}"
+        logger.error(error)
+        return False, error, 0
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
 def csv_to_json_file(
     csv_path: str,
     json_output_path: str,
@@ -413,6 +761,9 @@ def csv_to_jsonl_file(
 ) -> Tuple[bool, Optional[str]]:
     """Convert CSV to JSONL file.
     
+    Streams rows (see csv_to_jsonl_stream), so large files are not
+    loaded into memory.
+    
     Args:
         csv_path: Path to CSV file
         jsonl_output_path: Path to save JSONL file
@@ -420,10 +771,7 @@ def csv_to_jsonl_file(
     Returns:
         Tuple of (is_valid, error_message)
     """
-    is_valid, error, _ = csv_to_json(
-        csv_path,
-        jsonl_output_path=jsonl_output_path
-    )
+    is_valid, error, _ = csv_to_jsonl_stream(csv_path, jsonl_output_path)
     return is_valid, error
 
 
@@ -1,15 +1,19 @@
 """D&D 5e 2024 specific character generation and enhancements."""
 
 import logging
-from typing import Optional, List, Dict, TYPE_CHECKING
+from typing import Any, Iterator, Optional, List, Dict
 
-from src.gemini_client import generate_from_prompt
-
-if TYPE_CHECKING:
-    from src.gemini_client import GeminiClient
+from src.gemini_client import GeminiClient, generate_from_prompt
 
 logger = logging.getLogger('character_creation')
 
+# Generation settings for every D&D enhancement path (sync, streaming,
+# async and batch prediction)
+DND_GENERATION_CONFIG: Dict[str, Any] = {
+    'temperature': 0.8,
+    'max_output_tokens': 3500,
+}
+
 
 class DNDEnhancer:
     """D&D 5e 2024 character enhancement system.
@@ -281,7 +285,7 @@ class DNDEnhancer:
         )
         return prompt
 
-    def enhance_character(
+    def _prepare_enhancement(
         self,
         base_character: str,
         species: str,
@@ -289,20 +293,10 @@ class DNDEnhancer:
         level: int,
         subclass: Optional[str] = None
     ) -> str:
-        """Generate D&D 5e 2024 enhancements for a character.
-
-        Args:
-            base_character: The base character profile to enhance
-            species: D&D species
-            character_class: D&D class
-            level: Character level (1-20)
-            subclass: Optional D&D subclass
-
-        Returns:
-            Enhanced character profile with D&D mechanics
+        """Validate D&D inputs and build the enhancement prompt.
 
         Raises:
-            ValueError: If species or class is invalid
+            ValueError: If species, class or subclass is invalid
         """
         if not self.is_valid_species(species):
             raise ValueError(f"Invalid D&D species: {species}")
@@ -322,7 +316,34 @@ class DNDEnhancer:
         if subclass:
             logger.debug(f"Subclass: {subclass}")
 
-        prompt = self.build_enhancement_prompt(
+        return self.build_enhancement_prompt(
+            base_character, species, character_class, level, subclass
+        )
+
+    def enhance_character(
+        self,
+        base_character: str,
+        species: str,
+        character_class: str,
+        level: int,
+        subclass: Optional[str] = None
+    ) -> str:
+        """Generate D&D 5e 2024 enhancements for a character.
+
+        Args:
+            base_character: The base character profile to enhance
+            species: D&D species
+            character_class: D&D class
+            level: Character level (1-20)
+            subclass: Optional D&D subclass
+
+        Returns:
+            Enhanced character profile with D&D mechanics
+
+        Raises:
+            ValueError: If species or class is invalid
+        """
+        prompt = self._prepare_enhancement(
             base_character, species, character_class, level, subclass
         )
 
@@ -330,8 +351,7 @@ class DNDEnhancer:
         if self.gemini_client:
             enhanced = self.gemini_client.generate(
                 prompt=prompt,
-                temperature=0.8,
-                max_output_tokens=3500
+                **DND_GENERATION_CONFIG
             )
         else:
             enhanced = generate_from_prompt(
@@ -339,13 +359,94 @@ class DNDEnhancer:
                 location=self.location,
                 model_name=self.model_name,
                 prompt=prompt,
-                temperature=0.8,
-                max_output_tokens=3500
+                **DND_GENERATION_CONFIG
             )
 
         logger.info(f"D&D enhancement completed ({len(enhanced)} characters)")
         return enhanced
 
+    def stream_enhance_character(
+        self,
+        base_character: str,
+        species: str,
+        character_class: str,
+        level: int,
+        subclass: Optional[str] = None
+    ) -> Iterator[str]:
+        """Streaming variant of enhance_character() using GeminiClient.generate_stream().
+
+        The D&D arguments are validated immediately; generation starts
+        when the returned iterator is first consumed.
+
+        Args:
+            base_character: The base character profile to enhance
+            species: D&D species
+            character_class: D&D class
+            level: Character level (1-20)
+            subclass: Optional D&D subclass
+
+        Returns:
+            Iterator over chunks of the enhanced character profile
+
+        Raises:
+            ValueError: If species or class is invalid
+        """
+        prompt = self._prepare_enhancement(
+            base_character, species, character_class, level, subclass
+        )
+
+        if self.gemini_client is None:
+            self.gemini_client = GeminiClient(
+                self.project, self.location, self.model_name
+            )
+
+        logger.debug("Streaming D&D enhancements from Gemini")
+        return self.gemini_client.generate_stream(
+            prompt=prompt,
+            **DND_GENERATION_CONFIG
+        )
+
+    async def aenhance_character(
+        self,
+        base_character: str,
+        species: str,
+        character_class: str,
+        level: int,
+        subclass: Optional[str] = None
+    ) -> str:
+        """Async variant of enhance_character() using GeminiClient.agenerate().
+
+        Args:
+            base_character: The base character profile to enhance
+            species: D&D species
+            character_class: D&D class
+            level: Character level (1-20)
+            subclass: Optional D&D subclass
+
+        Returns:
+            Enhanced character profile with D&D mechanics
+
+        Raises:
+            ValueError: If species or class is invalid
+        """
+        prompt = self._prepare_enhancement(
+            base_character, species, character_class, level, subclass
+        )
+
+        if self.gemini_client is None:
+            self.gemini_client = GeminiClient(
+                self.project, self.location, self.model_name
+            )
+
+        logger.debug("Calling Gemini (async) to generate D&D enhancements")
+        enhanced = await self.gemini_client.agenerate(
+            prompt=prompt,
+            **DND_GENERATION_CONFIG
+        )
+
+        logger.info(f"D&D enhancement completed ({len(enhanced)} characters)")
+        return enhanced
+
 
 # Backward compatibility: Keep module-level functions and constants
 DND_SUBCLASSES = DNDEnhancer.SUBCLASSES
@@ -0,0 +1,158 @@
+"""Incremental Google Docs writes for streamed Gemini output."""
+
+import contextlib
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+from src.gdocs import append_text, create_doc
+from src.timing import StageTimer
+
+logger = logging.getLogger('character_creation')
+
+# Docs allows about 60 write requests per minute per user
+DEFAULT_MIN_WRITE_INTERVAL = 1.0
+
+
+class DocStreamWriter:
+    """Creates a Google Doc and appends text to it while it is generated.
+
+    ``write()`` only buffers text, so the caller can keep consuming the
+    Gemini stream. A background thread creates the document on the first
+    write, then appends everything buffered since its previous request in
+    one batchUpdate, at most once per ``min_interval`` seconds. Streaming
+    N chunks therefore costs a handful of Docs writes, and a character's
+    wall time approaches max(generation, doc writes) instead of their sum.
+
+    All Docs calls run on the writer thread; the caller must not use
+    ``docs_service`` until close() returns.
+    """
+
+    def __init__(
+        self,
+        docs_service,
+        title: str,
+        on_created: Optional[Callable[[str], None]] = None,
+        min_interval: float = DEFAULT_MIN_WRITE_INTERVAL,
+        slots: Optional[threading.Semaphore] = None,
+        timer: Optional[StageTimer] = None
+    ) -> None:
+        """Initialize the writer (nothing is sent until the first write).
+
+        Args:
+            docs_service: Authenticated Docs service
+            title: Title for the new document
+            on_created: Optional callback invoked with the document ID
+                once the doc exists (e.g. to checkpoint it)
+            min_interval: Minimum seconds between two appends
+            slots: Optional semaphore held around each Docs call
+            timer: Optional StageTimer receiving doc_create/doc_insert spans
+        """
+        self.docs_service = docs_service
+        self.title: str = title
+        self.on_created = on_created
+        self.min_interval: float = min_interval
+        self.slots = slots
+        self.timer: Optional[StageTimer] = timer
+        self.doc_id: Optional[str] = None
+        self.writes: int = 0
+
+        self._buffer: List[str] = []
+        self._closed = False
+        self._error: Optional[Exception] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def started(self) -> bool:
+        """Whether any text has been written (and the doc creation started)."""
+        return self._thread is not None
+
+    def write(self, text: str) -> None:
+        """Buffer text to append to the document.
+
+        Raises:
+            Exception: The writer thread's error, if a Docs call failed
+        """
+        if not text:
+            return
+        with self._cond:
+            if self._error is not None:
+                raise self._error
+            self._buffer.append(text)
+            self._cond.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"{threading.current_thread().name}-docwriter", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> str:
+        """Flush the remaining text and wait for the writer thread.
+
+        Returns:
+            Document ID of the written doc
+
+        Raises:
+            RuntimeError: If nothing was written
+            Exception: The writer thread's error, if a Docs call failed
+        """
+        if self._thread is None:
+            raise RuntimeError("DocStreamWriter.close() called before any text was written")
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        logger.info(f"Streamed content into document {self.doc_id} in {self.writes} write(s)")
+        return self.doc_id
+
+    def abort(self) -> None:
+        """Stop the writer thread, dropping text not yet sent (never raises)."""
+        with self._cond:
+            self._closed = True
+            self._buffer.clear()
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _span(self, stage: str):
+        """Return a timer span for a stage, or a no-op without a timer."""
+        return self.timer.span(stage) if self.timer is not None else contextlib.nullcontext()
+
+    def _slot(self):
+        """Return the Docs concurrency slot, or a no-op without one."""
+        return self.slots if self.slots is not None else contextlib.nullcontext()
+
+    def _run(self) -> None:
+        """Writer thread: create the doc, then append buffered text until closed."""
+        try:
+            with self._slot(), self._span('doc_create'):
+                self.doc_id = create_doc(self.docs_service, self.title)
+            if self.on_created is not None:
+                self.on_created(self.doc_id)
+
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._buffer or self._closed)
+                    if not self._buffer:
+                        return
+                    text = ''.join(self._buffer)
+                    self._buffer.clear()
+
+                started = time.monotonic()
+                with self._slot(), self._span('doc_insert'):
+                    append_text(self.docs_service, self.doc_id, text)
+                self.writes += 1
+
+                # Coalesce what arrives in the meantime; wake early on close
+                remaining = self.min_interval - (time.monotonic() - started)
+                if remaining > 0:
+                    with self._cond:
+                        self._cond.wait_for(lambda: self._closed, timeout=remaining)
+        except Exception as e:
+            logger.error(f"Streaming write to Google Doc failed: {e}")
+            with self._cond:
+                self._error = e
@@ -1,12 +1,21 @@
 """Google Docs API helpers for template management and document creation."""
 
+import contextlib
+import difflib
 import logging
+import re
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from typing import Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.rate_limiter import call_with_retry, get_rate_limiter
+from src.timing import StageTimer
 
 logger = logging.getLogger('character_creation')
 
+# A paragraph's text plus its newline (the last one may have none)
+_PARAGRAPH_RE = re.compile(r'[^\n]*\n|[^\n]+$')
+
 SCOPES = [
     'https://www.googleapis.com/auth/drive',
     'https://www.googleapis.com/auth/documents'
@@ -50,9 +59,12 @@ def get_template_text(drive_service, template_id: str) -> str:
     """
     logger.debug(f"Fetching template text from doc: {template_id}")
     try:
-        resp = drive_service.files().export(
-            fileId=template_id, mimeType='text/plain'
-        ).execute()
+        resp = call_with_retry(
+            drive_service.files().export(
+                fileId=template_id, mimeType='text/plain'
+            ).execute,
+            limiter=get_rate_limiter('drive')
+        )
         if isinstance(resp, bytes):
             text = resp.decode('utf-8')
         else:
@@ -64,6 +76,33 @@ def get_template_text(drive_service, template_id: str) -> str:
         raise
 
 
+def get_file_revision(drive_service, file_id: str) -> Dict[str, Any]:
+    """Fetch a Drive file's revision metadata (no content).
+    
+    Native Google Docs report ``modifiedTime`` and ``version``; binary
+    files additionally report ``headRevisionId``.
+    
+    Args:
+        drive_service: Authenticated Drive service
+        file_id: Drive file ID
+        
+    Returns:
+        Dict with whichever of headRevisionId, modifiedTime and version
+        Drive returned
+    """
+    logger.debug(f"Fetching revision metadata for file: {file_id}")
+    try:
+        return call_with_retry(
+            drive_service.files().get(
+                fileId=file_id, fields='headRevisionId,modifiedTime,version'
+            ).execute,
+            limiter=get_rate_limiter('drive')
+        )
+    except Exception as e:
+        logger.error(f"Failed to fetch file revision metadata: {e}")
+        raise
+
+
 def create_doc(docs_service, title: str) -> str:
     """Create a new blank Google Doc.
     
@@ -76,7 +115,12 @@ def create_doc(docs_service, title: str) -> str:
     """
     logger.debug(f"Creating new Google Doc with title: {title}")
     try:
-        created = docs_service.documents().create(body={'title': title}).execute()
+        # Not idempotent: only retry rate-limit errors, which were not executed
+        created = call_with_retry(
+            docs_service.documents().create(body={'title': title}).execute,
+            limiter=get_rate_limiter('docs'),
+            idempotent=False
+        )
         doc_id = created.get('documentId')
         logger.info(f"Google Doc created successfully. ID: {doc_id}")
         return doc_id
@@ -85,9 +129,44 @@ def create_doc(docs_service, title: str) -> str:
         raise
 
 
+def create_doc_with_content(
+    docs_service,
+    title: str,
+    text: str,
+    on_created: Optional[Callable[[str], None]] = None,
+    timer: Optional[StageTimer] = None
+) -> str:
+    """Create a Google Doc and write its content in one batchUpdate.
+    
+    Args:
+        docs_service: Authenticated Docs service
+        title: Title for the new document
+        text: Full document content
+        on_created: Optional callback invoked with the document ID once the
+            doc exists, before the content is written (e.g. to checkpoint it)
+        timer: Optional StageTimer receiving doc_create/doc_insert spans
+        
+    Returns:
+        Document ID of the created doc
+    """
+    def span(stage: str):
+        return timer.span(stage) if timer is not None else contextlib.nullcontext()
+
+    with span('doc_create'):
+        doc_id = create_doc(docs_service, title)
+    if on_created is not None:
+        on_created(doc_id)
+    with span('doc_insert'):
+        insert_text(docs_service, doc_id, text)
+    return doc_id
+
+
 def insert_text(docs_service, document_id: str, text: str):
     """Insert text at the start of a Google Doc.
     
+    Only rate-limit errors are retried, so a timed-out insert is never
+    applied twice.
+    
     Args:
         docs_service: Authenticated Docs service
         document_id: Document ID to insert into
@@ -103,15 +182,222 @@ def insert_text(docs_service, document_id: str, text: str):
                 }
             }
         ]
-        docs_service.documents().batchUpdate(
-            documentId=document_id, body={'requests': requests}
-        ).execute()
+        batch_update(docs_service, document_id, requests, idempotent=False)
         logger.info(f"Text inserted successfully into document: {document_id}")
     except Exception as e:
         logger.error(f"Failed to insert text into document: {e}")
         raise
 
 
+def append_text(docs_service, document_id: str, text: str):
+    """Append text at the end of a Google Doc's body.
+    
+    Uses ``endOfSegmentLocation``, so no document indexes need to be
+    tracked between appends. Only rate-limit errors are retried: a
+    timed-out append may already have been applied.
+    
+    Args:
+        docs_service: Authenticated Docs service
+        document_id: Document ID to append to
+        text: Text to append
+    """
+    logger.debug(f"Appending {len(text)} characters to document {document_id}")
+    requests = [
+        {
+            'insertText': {
+                'endOfSegmentLocation': {},
+                'text': text
+            }
+        }
+    ]
+    batch_update(docs_service, document_id, requests, idempotent=False)
+
+
+def utf16_len(text: str) -> int:
+    """Return the length of ``text`` in UTF-16 code units (Docs API indexes)."""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Split text into Docs paragraphs, each keeping its trailing newline."""
+    return _PARAGRAPH_RE.findall(text)
+
+
+def get_doc_text(docs_service, document_id: str) -> Tuple[str, Optional[str]]:
+    """Read the plain text of a Google Doc's body.
+    
+    Args:
+        docs_service: Authenticated Docs service
+        document_id: Document ID to read
+        
+    Returns:
+        Tuple of (text, revision_id); the text excludes the newline that
+        ends every body, so it matches what insert_text() wrote
+    """
+    document = call_with_retry(
+        docs_service.documents().get(
+            documentId=document_id,
+            fields='revisionId,body(content(paragraph(elements(textRun(content)))))'
+        ).execute,
+        limiter=get_rate_limiter('docs')
+    )
+    parts = []
+    for element in document.get('body', {}).get('content', []):
+        for run in element.get('paragraph', {}).get('elements', []):
+            parts.append(run.get('textRun', {}).get('content', ''))
+    text = ''.join(parts)
+    if text.endswith('\n'):
+        text = text[:-1]
+    return text, document.get('revisionId')
+
+
+def build_text_diff_requests(old_text: str, new_text: str) -> List[Dict[str, Any]]:
+    """Build the Docs requests that turn a body reading ``old_text`` into ``new_text``.
+    
+    The texts are diffed paragraph by paragraph; only changed paragraphs
+    are deleted or inserted. Both are compared with the newline that ends
+    every body, so appending to a text without a trailing newline only
+    inserts the new paragraphs. That final newline cannot be deleted, so
+    a change at the end of the body is shifted to keep it. Requests are
+    ordered from the end of the document backwards, so each one's UTF-16
+    indexes stay valid while the earlier ones are applied.
+    
+    Args:
+        old_text: Current body text (as returned by get_doc_text())
+        new_text: Desired body text
+        
+    Returns:
+        List of deleteContentRange/insertText requests (empty if equal)
+    """
+    old_paragraphs = split_paragraphs(old_text + '\n')
+    new_paragraphs = split_paragraphs(new_text + '\n')
+
+    # Docs index of the start of each old paragraph (the body starts at 1)
+    starts = [1]
+    for paragraph in old_paragraphs:
+        starts.append(starts[-1] + utf16_len(paragraph))
+    body_end = starts[-1] - 1  # index of the body's final newline
+
+    matcher = difflib.SequenceMatcher(None, old_paragraphs, new_paragraphs, autojunk=False)
+    requests: List[Dict[str, Any]] = []
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == 'equal':
+            continue
+        start, end = starts[i1], starts[i2]
+        text = ''.join(new_paragraphs[j1:j2])
+        if i2 == len(old_paragraphs):
+            # Both removed and inserted text end with the final newline:
+            # keep it and move the edit before it instead
+            end = body_end
+            if text:
+                text = text[:-1]
+                if i1 == i2:
+                    start, text = body_end, '\n' + text
+            elif i1 > 0:
+                start -= 1
+        if end > start:
+            requests.append({
+                'deleteContentRange': {'range': {'startIndex': start, 'endIndex': end}}
+            })
+        if text:
+            requests.append({'insertText': {'location': {'index': start}, 'text': text}})
+    return requests
+
+
+def apply_text_diff(
+    docs_service,
+    document_id: str,
+    old_text: str,
+    new_text: str,
+    revision_id: Optional[str] = None
+) -> int:
+    """Patch a Google Doc whose body reads ``old_text`` so it reads ``new_text``.
+    
+    Only the paragraphs that differ are sent (see build_text_diff_requests()),
+    in one batchUpdate. A patch is not idempotent, so only rate-limit errors
+    are retried; pass ``revision_id`` to make Docs reject the patch if the
+    document changed since ``old_text`` was read.
+    
+    Args:
+        docs_service: Authenticated Docs service
+        document_id: Document ID to patch
+        old_text: Current body text
+        new_text: Desired body text
+        revision_id: Optional revision the patch requires
+        
+    Returns:
+        Number of requests sent (0 if the texts are equal)
+    """
+    requests = build_text_diff_requests(old_text, new_text)
+    if not requests:
+        logger.debug(f"Document {document_id} already up to date")
+        return 0
+
+    body: Dict[str, Any] = {'requests': requests}
+    if revision_id:
+        body['writeControl'] = {'requiredRevisionId': revision_id}
+    logger.debug(
+        f"Patching document {document_id} with {len(requests)} request(s) "
+        f"({sum(utf16_len(r['insertText']['text']) for r in requests if 'insertText' in r)} "
+        "characters inserted)"
+    )
+    call_with_retry(
+        docs_service.documents().batchUpdate(documentId=document_id, body=body).execute,
+        limiter=get_rate_limiter('docs'),
+        idempotent=False
+    )
+    return len(requests)
+
+
+def replace_text(docs_service, document_id: str, text: str):
+    """Make a Google Doc's body read ``text``, rewriting only what differs.
+    
+    Args:
+        docs_service: Authenticated Docs service
+        document_id: Document ID to rewrite
+        text: New document content
+    """
+    logger.debug(f"Replacing content of document {document_id} ({len(text)} characters)")
+    try:
+        current_text, revision_id = get_doc_text(docs_service, document_id)
+        sent = apply_text_diff(docs_service, document_id, current_text, text, revision_id)
+        logger.info(f"Content replaced in document {document_id} ({sent} request(s))")
+    except Exception as e:
+        logger.error(f"Failed to replace document content: {e}")
+        raise
+
+
+def batch_update(
+    docs_service,
+    document_id: str,
+    requests: List[Dict[str, Any]],
+    idempotent: bool = False
+) -> Dict[str, Any]:
+    """Send a batchUpdate to a Google Doc under the shared Docs rate limiter.
+    
+    By default only rate-limit errors are retried: a request that failed
+    with a server error or timed out may already have been applied, and
+    replaying an insert would duplicate its text.
+    
+    Args:
+        docs_service: Authenticated Docs service
+        document_id: Document ID to update
+        requests: List of Docs API request dicts
+        idempotent: Also retry transient server errors; only for requests
+            that are safe to apply twice
+        
+    Returns:
+        batchUpdate response
+    """
+    return call_with_retry(
+        docs_service.documents().batchUpdate(
+            documentId=document_id, body={'requests': requests}
+        ).execute,
+        limiter=get_rate_limiter('docs'),
+        idempotent=idempotent
+    )
+
+
 def get_doc_url(doc_id: str) -> str:
     """Generate the Google Docs URL for a document.
     
@@ -1,13 +1,35 @@
 """Gemini AI client for character generation."""
 
+import asyncio
+import hashlib
+import itertools
 import logging
-from typing import Optional
+import threading
+import time
+import weakref
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import vertexai
-from vertexai.generative_models import GenerativeModel
+from google.api_core import exceptions as api_exceptions
+from vertexai.generative_models import Content, GenerationConfig, GenerativeModel, Part
+
+from src.rate_limiter import (
+    acall_with_retry,
+    call_with_retry,
+    estimate_tokens,
+    get_rate_limiter,
+)
+from src.usage import TokenUsage, UsageTracker, record_usage
+
+if TYPE_CHECKING:
+    from src.response_cache import ResponseCache
 
 logger = logging.getLogger('character_creation')
 
+# Errors meaning a context cache no longer exists (expired or deleted)
+CONTEXT_CACHE_GONE_ERRORS = (api_exceptions.NotFound, api_exceptions.FailedPrecondition)
+
 
 class GeminiClient:
     """Gemini/Vertex AI text generation client.
@@ -20,7 +42,12 @@ class GeminiClient:
         self,
         project: str,
         location: str,
-        model_name: str
+        model_name: str,
+        max_in_flight: int = 8,
+        request_timeout: Optional[float] = None,
+        cache: Optional['ResponseCache'] = None,
+        context_cache_ttl: Optional[float] = None,
+        context_cache_min_tokens: int = 1024
     ) -> None:
         """Initialize the Gemini client.
         
@@ -28,11 +55,40 @@ class GeminiClient:
             project: GCP project ID
             location: GCP region (e.g., 'us-central1')
             model_name: Gemini model name (e.g., 'gemini-2.5-flash')
+            max_in_flight: Max concurrent async requests (agenerate) per
+                event loop
+            request_timeout: Default per-call timeout in seconds for
+                async requests (None = no timeout)
+            cache: Optional ResponseCache consulted before calling Gemini
+            context_cache_ttl: Lifetime in seconds of Vertex AI context
+                caches created for prompt prefixes (None = no context
+                caching; prefixes are sent inline)
+            context_cache_min_tokens: Prefixes estimated below this size
+                are sent inline instead of being cached
         """
         self.project: str = project
         self.location: str = location
         self.model_name: str = model_name
+        self.max_in_flight: int = max(1, max_in_flight)
+        self.request_timeout: Optional[float] = request_timeout
+        self.cache: Optional['ResponseCache'] = cache
+        self.usage: UsageTracker = UsageTracker()
+        self.context_cache_ttl: Optional[float] = context_cache_ttl
+        self.context_cache_min_tokens: int = context_cache_min_tokens
+        # prefix hash -> {'cached_content', 'model', 'expires_at', 'refreshing'},
+        # or None for prefixes that are sent inline (too small or creation failed)
+        self._context_caches: Dict[str, Optional[Dict[str, Any]]] = {}
+        # prefix hash -> event set once the thread creating its cache is done
+        self._context_cache_pending: Dict[str, threading.Event] = {}
+        # Caches no longer used for requests but still to be deleted
+        self._retired_context_caches: List[Any] = []
+        # Guards the three structures above; never held during network calls
+        self._context_cache_lock = threading.Lock()
         self._model: Optional[GenerativeModel] = None
+        # One semaphore per event loop: asyncio primitives are bound to the
+        # loop they are used in, and each thread running asyncio.run() has its own
+        self._async_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._async_semaphores_lock = threading.Lock()
         
         logger.debug(
             f"GeminiClient initialized with model: {model_name} "
@@ -70,7 +126,9 @@ class GeminiClient:
         self,
         prompt: str,
         temperature: float = 0.7,
-        max_output_tokens: int = 2048
+        max_output_tokens: int = 2048,
+        prefix: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None
     ) -> str:
         """Generate text from a prompt using Gemini.
         
@@ -78,6 +136,12 @@ class GeminiClient:
             prompt: Input prompt for text generation
             temperature: Creativity level (0.0-1.0, default: 0.7)
             max_output_tokens: Maximum response length (default: 2048)
+            prefix: Optional static text preceding ``prompt`` (the model
+                sees ``prefix + prompt``); served from a Vertex AI context
+                cache when context caching is enabled
+            response_schema: Optional response schema; the response is
+                then JSON (``response_mime_type='application/json'``)
+                constrained to it
             
         Returns:
             Generated text from the model
@@ -89,27 +153,544 @@ class GeminiClient:
             f"Generating text with temperature={temperature}, "
             f"max_tokens={max_output_tokens}"
         )
+        full_prompt = (prefix or '') + prompt
+        cache_key = self._cache_key(full_prompt, temperature, max_output_tokens, response_schema)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Using cached Gemini response")
+                return cached
+
+        generation_config = self._generation_config(temperature, max_output_tokens, response_schema)
         try:
-            model = self._initialize_model()
-            
-            # Use the generative_models API
-            response = model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": temperature,
-                    "max_output_tokens": max_output_tokens,
-                }
-            )
+            model, contents, from_context_cache = self._resolve_prefix(prompt, prefix)
+            try:
+                # Use the generative_models API
+                response = call_with_retry(
+                    model.generate_content,
+                    contents,
+                    generation_config=generation_config,
+                    limiter=get_rate_limiter('gemini'),
+                    tokens=estimate_tokens(full_prompt)
+                )
+            except CONTEXT_CACHE_GONE_ERRORS as e:
+                if not from_context_cache:
+                    raise
+                self._drop_context_cache(prefix, e)
+                response = call_with_retry(
+                    self._initialize_model().generate_content,
+                    full_prompt,
+                    generation_config=generation_config,
+                    limiter=get_rate_limiter('gemini'),
+                    tokens=estimate_tokens(full_prompt)
+                )
             logger.debug("Generation completed successfully")
         except Exception as e:
             logger.error(f"Failed to generate text from Gemini: {e}")
             raise
 
+        self._record_usage(response)
+
         # Handle different response types
         text = self._extract_text(response)
         logger.debug(f"Generated {len(text)} characters")
+        if cache_key is not None:
+            self.cache.set(cache_key, text, model_name=self.model_name)
         return text
 
+    def generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_output_tokens: int = 2048,
+        prefix: Optional[str] = None
+    ) -> Iterator[str]:
+        """Generate text from a prompt, yielding chunks as Gemini produces them.
+
+        Errors before the first chunk are retried like generate(); once
+        text has been yielded a failure is raised to the caller, since the
+        chunks already consumed cannot be taken back.
+
+        Args:
+            prompt: Input prompt for text generation
+            temperature: Creativity level (0.0-1.0, default: 0.7)
+            max_output_tokens: Maximum response length (default: 2048)
+            prefix: Optional static text preceding ``prompt``; see generate()
+
+        Yields:
+            Text chunks; joined they equal the text generate() would return
+
+        Raises:
+            Exception: If text generation fails
+        """
+        logger.debug(
+            f"Streaming text with temperature={temperature}, "
+            f"max_tokens={max_output_tokens}"
+        )
+        full_prompt = (prefix or '') + prompt
+        cache_key = self._cache_key(full_prompt, temperature, max_output_tokens)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Using cached Gemini response")
+                yield cached
+                return
+
+        generation_config = self._generation_config(temperature, max_output_tokens)
+        try:
+            model, contents, from_context_cache = self._resolve_prefix(prompt, prefix)
+            try:
+                first, responses = call_with_retry(
+                    self._open_stream,
+                    model,
+                    contents,
+                    generation_config,
+                    limiter=get_rate_limiter('gemini'),
+                    tokens=estimate_tokens(full_prompt)
+                )
+            except CONTEXT_CACHE_GONE_ERRORS as e:
+                if not from_context_cache:
+                    raise
+                self._drop_context_cache(prefix, e)
+                first, responses = call_with_retry(
+                    self._open_stream,
+                    self._initialize_model(),
+                    full_prompt,
+                    generation_config,
+                    limiter=get_rate_limiter('gemini'),
+                    tokens=estimate_tokens(full_prompt)
+                )
+        except Exception as e:
+            logger.error(f"Failed to generate text from Gemini: {e}")
+            raise
+
+        chunks: List[str] = []
+        last_response = first
+        try:
+            for response in itertools.chain([first], responses):
+                last_response = response
+                text = self._chunk_text(response)
+                if text:
+                    chunks.append(text)
+                    yield text
+        except Exception as e:
+            logger.error(f"Gemini stream failed after {len(chunks)} chunk(s): {e}")
+            raise
+
+        # Streamed responses report the request's token usage on the last chunk
+        self._record_usage(last_response)
+        text = ''.join(chunks)
+        logger.debug(f"Streamed {len(text)} characters in {len(chunks)} chunk(s)")
+        if cache_key is not None:
+            self.cache.set(cache_key, text, model_name=self.model_name)
+
+    @staticmethod
+    def _open_stream(model, contents, generation_config) -> Tuple[Any, Iterator[Any]]:
+        """Start a streaming request and wait for its first chunk.
+
+        Streaming errors (rate limits, unavailable model, ...) surface on
+        the first chunk, so fetching it here lets call_with_retry retry
+        them before anything has been handed to the caller.
+
+        Returns:
+            Tuple of (first response chunk, iterator over the rest)
+        """
+        responses = iter(model.generate_content(
+            contents, generation_config=generation_config, stream=True
+        ))
+        return next(responses), responses
+
+    @staticmethod
+    def _chunk_text(response) -> str:
+        """Extract the text of a streamed chunk ('' for chunks without text)."""
+        if isinstance(response, str):
+            return response
+        try:
+            return response.text or ''
+        except (AttributeError, ValueError):
+            # The SDK raises ValueError for chunks without text parts
+            return ''
+
+    def _cache_key(
+        self,
+        prompt: str,
+        temperature: float,
+        max_output_tokens: int,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Return the response cache key for a request, or None without a cache."""
+        if self.cache is None:
+            return None
+        if response_schema is None:
+            return self.cache.make_key(
+                self.model_name, prompt, temperature, max_output_tokens
+            )
+        return self.cache.make_key(
+            self.model_name, prompt, temperature, max_output_tokens,
+            response_schema=response_schema
+        )
+
+    @staticmethod
+    def _generation_config(
+        temperature: float,
+        max_output_tokens: int,
+        response_schema: Optional[Dict[str, Any]] = None
+    ):
+        """Build the generation config for a request.
+        
+        Returns:
+            A plain dict, or a GenerationConfig when a response schema is
+            set (the SDK only converts schema dicts passed that way)
+        """
+        if response_schema is None:
+            return {
+                "temperature": temperature,
+                "max_output_tokens": max_output_tokens,
+            }
+        return GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            response_mime_type='application/json',
+            response_schema=response_schema,
+        )
+
+    def _get_async_semaphore(self) -> asyncio.Semaphore:
+        """Return the in-flight request semaphore for the running event loop.
+        
+        Returns:
+            Semaphore bounding concurrent async requests
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_semaphores_lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_in_flight)
+                self._async_semaphores[loop] = semaphore
+        return semaphore
+
+    async def agenerate(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_output_tokens: int = 2048,
+        timeout: Optional[float] = None,
+        prefix: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate text from a prompt using Gemini's async API.
+        
+        Concurrent calls are bounded by ``max_in_flight``.
+        
+        Args:
+            prompt: Input prompt for text generation
+            temperature: Creativity level (0.0-1.0, default: 0.7)
+            max_output_tokens: Maximum response length (default: 2048)
+            timeout: Per-call timeout in seconds (default: request_timeout)
+            prefix: Optional static text preceding ``prompt``; see generate()
+            response_schema: Optional JSON response schema; see generate()
+            
+        Returns:
+            Generated text from the model
+            
+        Raises:
+            asyncio.TimeoutError: If the call exceeds the timeout
+            Exception: If text generation fails
+        """
+        timeout = timeout if timeout is not None else self.request_timeout
+        logger.debug(
+            f"Generating text (async) with temperature={temperature}, "
+            f"max_tokens={max_output_tokens}, timeout={timeout}"
+        )
+        full_prompt = (prefix or '') + prompt
+        cache_key = self._cache_key(full_prompt, temperature, max_output_tokens, response_schema)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Using cached Gemini response")
+                return cached
+
+        generation_config = self._generation_config(temperature, max_output_tokens, response_schema)
+        async with self._get_async_semaphore():
+            try:
+                if prefix:
+                    # Creating a context cache is a blocking network call
+                    model, contents, from_context_cache = await asyncio.to_thread(
+                        self._resolve_prefix, prompt, prefix
+                    )
+                else:
+                    model, contents, from_context_cache = self._initialize_model(), prompt, False
+                try:
+                    response = await acall_with_retry(
+                        self._generate_content_async,
+                        model,
+                        contents,
+                        generation_config,
+                        timeout,
+                        limiter=get_rate_limiter('gemini'),
+                        tokens=estimate_tokens(full_prompt)
+                    )
+                except CONTEXT_CACHE_GONE_ERRORS as e:
+                    if not from_context_cache:
+                        raise
+                    self._drop_context_cache(prefix, e)
+                    response = await acall_with_retry(
+                        self._generate_content_async,
+                        self._initialize_model(),
+                        full_prompt,
+                        generation_config,
+                        timeout,
+                        limiter=get_rate_limiter('gemini'),
+                        tokens=estimate_tokens(full_prompt)
+                    )
+                logger.debug("Async generation completed successfully")
+            except asyncio.TimeoutError:
+                logger.error(f"Gemini request timed out after {timeout}s")
+                raise
+            except Exception as e:
+                logger.error(f"Failed to generate text from Gemini: {e}")
+                raise
+
+        self._record_usage(response)
+        text = self._extract_text(response)
+        logger.debug(f"Generated {len(text)} characters")
+        if cache_key is not None:
+            self.cache.set(cache_key, text, model_name=self.model_name)
+        return text
+
+    def _resolve_prefix(self, prompt: str, prefix: Optional[str]) -> Tuple[Any, str, bool]:
+        """Pick the model and request contents for a prompt with an optional prefix.
+        
+        Returns:
+            Tuple of (model, contents, from_context_cache): a context-cached
+            model and just ``prompt`` when the prefix is cached, otherwise
+            the plain model and ``prefix + prompt``
+        """
+        if not prefix:
+            return self._initialize_model(), prompt, False
+        model = self._context_cached_model(prefix)
+        if model is None:
+            return self._initialize_model(), prefix + prompt, False
+        return model, prompt, True
+
+    @staticmethod
+    def _prefix_key(prefix: str) -> str:
+        """Return the context cache key for a prefix."""
+        return hashlib.sha256(prefix.encode('utf-8')).hexdigest()
+
+    def _context_cached_model(self, prefix: str):
+        """Return a model bound to a context cache of ``prefix``, or None.
+        
+        Creates the cache on first use and extends its TTL once less than
+        half of it remains, so it lives as long as the batch keeps using
+        it. Prefixes that are too small, or whose cache could not be
+        created, are remembered and sent inline.
+        
+        The lock is only held to claim the work: one thread creates or
+        extends a cache while the others wait for the creation or keep
+        using the current cache during an extension.
+        """
+        if not self.context_cache_ttl:
+            return None
+
+        key = self._prefix_key(prefix)
+        ttl = self.context_cache_ttl
+        while True:
+            with self._context_cache_lock:
+                if key in self._context_caches and self._context_caches[key] is None:
+                    return None
+                entry = self._context_caches.get(key)
+                if entry is not None:
+                    if entry['refreshing'] or entry['expires_at'] - time.monotonic() > ttl / 2:
+                        return entry['model']
+                    entry['refreshing'] = True
+                    break
+                pending = self._context_cache_pending.get(key)
+                if pending is None:
+                    pending = self._context_cache_pending[key] = threading.Event()
+                    break
+            pending.wait()  # Another thread is creating the cache
+
+        if entry is not None:
+            return self._extend_context_cache(key, entry, ttl)
+        try:
+            return self._create_context_cache(key, prefix, ttl)
+        finally:
+            with self._context_cache_lock:
+                self._context_cache_pending.pop(key, None)
+            pending.set()
+
+    def _extend_context_cache(self, key: str, entry: Dict[str, Any], ttl: float):
+        """Extend a context cache's TTL; keep using it if the update fails."""
+        try:
+            entry['cached_content'].update(ttl=timedelta(seconds=ttl))
+        except Exception as e:
+            # The cache is still live until its TTL runs out; an expired one
+            # is dropped when a request reports it gone
+            logger.warning(f"Failed to extend Gemini context cache {key[:12]}: {e}")
+        else:
+            entry['expires_at'] = time.monotonic() + ttl
+            logger.debug(f"Extended Gemini context cache {key[:12]} by {ttl:.0f}s")
+        finally:
+            with self._context_cache_lock:
+                entry['refreshing'] = False
+        return entry['model']
+
+    def _create_context_cache(self, key: str, prefix: str, ttl: float):
+        """Create the context cache for a claimed prefix; None if it is sent inline."""
+        if estimate_tokens(prefix) < self.context_cache_min_tokens:
+            logger.info(
+                f"Prompt prefix (~{estimate_tokens(prefix)} tokens) is below the "
+                f"context cache minimum ({self.context_cache_min_tokens}); sending it inline"
+            )
+            with self._context_cache_lock:
+                self._context_caches[key] = None
+            return None
+
+        cached_content = None
+        try:
+            self._initialize_model()  # vertexai.init()
+            cached_content = self._create_cached_content(prefix, ttl)
+            model = self._model_from_cached_content(cached_content)
+        except Exception as e:
+            logger.warning(f"Gemini context caching unavailable ({e}); sending prefix inline")
+            with self._context_cache_lock:
+                self._context_caches[key] = None
+                if cached_content is not None:
+                    self._retired_context_caches.append(cached_content)
+            return None
+
+        with self._context_cache_lock:
+            self._context_caches[key] = {
+                'cached_content': cached_content,
+                'model': model,
+                'expires_at': time.monotonic() + ttl,
+                'refreshing': False,
+            }
+        logger.info(
+            f"Created Gemini context cache for prompt prefix "
+            f"(~{estimate_tokens(prefix)} tokens, ttl {ttl:.0f}s)"
+        )
+        return model
+
+    def _create_cached_content(self, prefix: str, ttl: float):
+        """Create a Vertex AI CachedContent holding ``prefix``."""
+        from vertexai.caching import CachedContent
+
+        return call_with_retry(
+            CachedContent.create,
+            model_name=self.model_name,
+            contents=[Content(role='user', parts=[Part.from_text(prefix)])],
+            ttl=timedelta(seconds=ttl),
+            display_name='character-prompt-prefix',
+        )
+
+    @staticmethod
+    def _model_from_cached_content(cached_content):
+        """Build a model that prepends a CachedContent to every request."""
+        return GenerativeModel.from_cached_content(cached_content=cached_content)
+
+    def _drop_context_cache(self, prefix: str, error: Exception) -> None:
+        """Forget a context cache that no longer exists and send its prefix inline."""
+        logger.warning(f"Gemini context cache no longer available ({error}); sending prefix inline")
+        with self._context_cache_lock:
+            self._context_caches[self._prefix_key(prefix)] = None
+
+    def release_context_caches(self) -> int:
+        """Delete all context caches created by this client.
+        
+        Call at the end of a batch so caches stop accruing storage cost
+        before their TTL runs out.
+        
+        Returns:
+            Number of caches deleted
+        """
+        with self._context_cache_lock:
+            cached_contents = [
+                entry['cached_content'] for entry in self._context_caches.values() if entry is not None
+            ]
+            cached_contents.extend(self._retired_context_caches)
+            self._context_caches.clear()
+            self._retired_context_caches.clear()
+
+        deleted = 0
+        for cached_content in cached_contents:
+            try:
+                cached_content.delete()
+                deleted += 1
+            except Exception as e:
+                logger.warning(f"Failed to delete Gemini context cache: {e}")
+        if deleted:
+            logger.info(f"Deleted {deleted} Gemini context cache(s)")
+        return deleted
+
+    def count_tokens(self, prompt: str) -> int:
+        """Count a prompt's input tokens with the model's tokenizer.
+        
+        Uses the countTokens API, which is free and does not generate;
+        retried like generation calls but not charged to the Gemini
+        rate limiter.
+        
+        Args:
+            prompt: Prompt to count
+            
+        Returns:
+            Total input tokens for the prompt
+        """
+        model = self._initialize_model()
+        response = call_with_retry(model.count_tokens, prompt)
+        return int(response.total_tokens)
+
+    def _record_usage(self, response) -> None:
+        """Record a response's token usage in ``self.usage`` and active usage scopes."""
+        usage = TokenUsage.from_response(response)
+        if usage is not None:
+            record_usage(self.model_name, usage, self.usage)
+
+    @staticmethod
+    async def _generate_content_async(model, prompt, generation_config, timeout):
+        """Run a single async generate_content call with a timeout."""
+        return await asyncio.wait_for(
+            model.generate_content_async(prompt, generation_config=generation_config),
+            timeout=timeout
+        )
+
+    async def agenerate_many(
+        self,
+        prompts: Sequence[str],
+        temperature: float = 0.7,
+        max_output_tokens: int = 2048,
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+        prefix: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> List:
+        """Generate text for several prompts concurrently.
+        
+        Args:
+            prompts: Prompts to generate from
+            temperature: Creativity level (0.0-1.0, default: 0.7)
+            max_output_tokens: Maximum response length (default: 2048)
+            timeout: Per-call timeout in seconds (default: request_timeout)
+            return_exceptions: Return exceptions in place of results
+                instead of raising the first failure
+            prefix: Optional static text shared by all prompts; see generate()
+            response_schema: Optional JSON response schema; see generate()
+            
+        Returns:
+            Generated texts in the same order as ``prompts``
+        """
+        logger.debug(f"Generating {len(prompts)} prompts (max in flight: {self.max_in_flight})")
+        return await asyncio.gather(
+            *(
+                self.agenerate(
+                    prompt, temperature, max_output_tokens, timeout,
+                    prefix=prefix, response_schema=response_schema
+                )
+                for prompt in prompts
+            ),
+            return_exceptions=return_exceptions
+        )
+
     @staticmethod
     def _extract_text(response) -> str:
         """Extract text from Gemini response.
@@ -145,6 +726,7 @@ class GeminiClient:
         Args:
             model_name: New model name (e.g., 'gemini-2.5-flash')
         """
+        self.release_context_caches()  # Bound to the old model
         self.model_name = model_name
         self._model = None  # Reset loaded model
         logger.info(f"Model changed to: {model_name}")
@@ -155,6 +737,7 @@ class GeminiClient:
         Args:
             location: New GCP region (e.g., 'us-central1')
         """
+        self.release_context_caches()  # Bound to the old location
         self.location = location
         self._model = None  # Reset loaded model
         logger.info(f"Location changed to: {location}")
@@ -165,6 +748,7 @@ class GeminiClient:
         Args:
             project: New GCP project ID
         """
+        self.release_context_caches()  # Bound to the old project
         self.project = project
         self._model = None  # Reset loaded model
         logger.info(f"Project changed to: {project}")
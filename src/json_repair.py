@@ -0,0 +1,308 @@
+"""Repair invalid JSON responses from Gemini before falling back to text mode."""
+
+import json
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.template_parser import validate_json_output
+
+logger = logging.getLogger('character_creation')
+
+# Repair tiers in the order they are tried; 'failed' counts unrepairable responses
+LOCAL_REPAIR_TIERS: Tuple[str, ...] = (
+    'trailing_text', 'trailing_commas', 'unescaped_quotes', 'truncation'
+)
+REPAIR_TIERS: Tuple[str, ...] = LOCAL_REPAIR_TIERS + ('model', 'failed')
+
+# Generation settings for the "fix this JSON" request
+JSON_REPAIR_TEMPERATURE = 0.0
+JSON_REPAIR_MAX_OUTPUT_TOKENS = 8192
+
+_DECODER = json.JSONDecoder()
+_FENCE_RE = re.compile(r'\s*```\s*$')
+_CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    """Parse the JSON object at the start of ``text``, ignoring trailing text."""
+    try:
+        data, _ = _DECODER.raw_decode(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _remove_trailing_commas(text: str) -> str:
+    """Drop commas directly before a closing brace or bracket (outside strings)."""
+    out: List[str] = []
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch == ',':
+            rest = text[i + 1:].lstrip()
+            if rest[:1] in ('}', ']'):
+                continue
+        out.append(ch)
+    return ''.join(out)
+
+
+def _escape_string_contents(text: str) -> str:
+    """Escape stray quotes and raw control characters inside string values.
+
+    A quote inside a string only ends it when the next non-space character
+    is structural (``, : } ]``) or the text ends; any other quote (e.g. a
+    nickname in quotes) is escaped.
+    """
+    out: List[str] = []
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if not in_string:
+            out.append(ch)
+            in_string = ch == '"'
+            continue
+        if escaped:
+            out.append(ch)
+            escaped = False
+        elif ch == '\\':
+            out.append(ch)
+            escaped = True
+        elif ch == '"':
+            rest = text[i + 1:].lstrip()
+            if not rest or rest[0] in ',:}]':
+                out.append(ch)
+                in_string = False
+            else:
+                out.append('\\"')
+        else:
+            out.append(_CONTROL_ESCAPES.get(ch, ch))
+    return ''.join(out)
+
+
+def _close_truncated(text: str) -> str:
+    """Close a response cut off by ``max_output_tokens``.
+
+    Closes an open string and the open objects/arrays. If that does not
+    parse (the text ended after a key, a colon or a comma), the last
+    incomplete member is dropped instead.
+    """
+    stack: List[str] = []
+    in_string = escaped = False
+    # Latest position where the text can be cut and closed, with its stack
+    cut_at, cut_stack = 0, []
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append(ch)
+            cut_at, cut_stack = i + 1, list(stack)
+        elif ch in '}]':
+            if stack:
+                stack.pop()
+            if not stack:
+                return text[:i + 1]  # the object is complete
+        elif ch == ',':
+            cut_at, cut_stack = i, list(stack)
+
+    def closers(open_brackets: List[str]) -> str:
+        return ''.join('}' if c == '{' else ']' for c in reversed(open_brackets))
+
+    closed = text.rstrip()
+    if in_string:
+        # A dangling backslash would escape the closing quote
+        closed = (closed[:-1] if escaped else closed) + '"'
+    candidate = closed + closers(stack)
+    if _loads_object(candidate) is not None:
+        return candidate
+    return text[:cut_at] + closers(cut_stack)
+
+
+_LOCAL_REPAIRS: Tuple[Tuple[str, Callable[[str], str]], ...] = (
+    ('trailing_commas', _remove_trailing_commas),
+    ('unescaped_quotes', _escape_string_contents),
+    ('truncation', _close_truncated),
+)
+
+
+def repair_json_locally(response_text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Try cheap local fixes on an invalid JSON response.
+
+    A complete object followed by other text (e.g. a closing remark that
+    contains braces) only needs that text dropped ('trailing_text').
+    Otherwise the fixes are applied cumulatively in LOCAL_REPAIR_TIERS
+    order, and the text is parsed after each fix that changed it, so a
+    tier is only credited for damage it actually repaired.
+
+    Args:
+        response_text: Raw Gemini response that failed validation
+
+    Returns:
+        Tuple of (json_dict, tier that fixed it), or (None, None)
+    """
+    start = response_text.find('{')
+    if start < 0:
+        return None, None
+    candidate = _FENCE_RE.sub('', response_text[start:])
+    data = _loads_object(candidate)
+    if data is not None:
+        return data, 'trailing_text'
+    for tier, fix in _LOCAL_REPAIRS:
+        fixed = fix(candidate)
+        if fixed == candidate:
+            continue
+        candidate = fixed
+        data = _loads_object(candidate)
+        if data is not None:
+            return data, tier
+    return None, None
+
+
+def build_json_repair_prompt(response_text: str, error: str) -> str:
+    """Build the short "fix this JSON" prompt for the model repair tier.
+
+    Args:
+        response_text: Invalid JSON response
+        error: Parse error reported for it
+
+    Returns:
+        Prompt asking Gemini to return the corrected JSON only
+    """
+    return (
+        "The following JSON is invalid and cannot be parsed.\n"
+        f"Parse error: {error}\n\n"
+        "Return the corrected JSON only, with no other text. Keep every key and value "
+        "as written; only fix the syntax (escape quotes, remove trailing commas, close "
+        "strings and braces). If the text is cut off, close it without adding new fields.\n\n"
+        "INVALID JSON:\n"
+        f"{response_text}\n"
+    )
+
+
+class JSONRepairer:
+    """Repairs invalid JSON responses and counts which tier fixed them.
+
+    Local fixes are tried first; only if they all fail is Gemini asked to
+    fix the JSON (a short request with the parse error, instead of
+    regenerating the character). Counts are kept per tier for the run.
+    """
+
+    def __init__(self, gemini_client=None, slots: Optional[threading.Semaphore] = None) -> None:
+        """Initialize the repairer.
+
+        Args:
+            gemini_client: Optional GeminiClient for the model tier (None
+                = local fixes only)
+            slots: Optional semaphore held around the model request
+        """
+        self.gemini_client = gemini_client
+        self.slots = slots
+        self._counts: Dict[str, int] = {tier: 0 for tier in REPAIR_TIERS}
+        self._lock = threading.Lock()
+
+    def repair(
+        self,
+        response_text: str,
+        error: str,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Repair an invalid JSON response.
+
+        Args:
+            response_text: Raw response that failed validation
+            error: Validation error message
+            response_schema: Schema of a structured-output request, reused
+                for the model request so its answer is valid JSON
+
+        Returns:
+            Repaired JSON dict, or None if every tier failed
+        """
+        data, tier = repair_json_locally(response_text)
+        if data is None and self.gemini_client is not None:
+            data = self._repair_with_model(response_text, error, response_schema)
+            tier = 'model' if data is not None else None
+
+        self._count(tier or 'failed')
+        if data is None:
+            logger.warning(f"JSON repair failed ({error})")
+        else:
+            logger.info(f"JSON repaired ({tier})")
+        return data
+
+    def _repair_with_model(
+        self,
+        response_text: str,
+        error: str,
+        response_schema: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Ask Gemini to fix the JSON; return the parsed result or None."""
+        # Room for the whole JSON again (about 4 characters per token)
+        max_output_tokens = min(JSON_REPAIR_MAX_OUTPUT_TOKENS, len(response_text) // 3 + 256)
+        logger.info(f"Asking Gemini to repair invalid JSON ({len(response_text)} characters)")
+        try:
+            if self.slots is not None:
+                with self.slots:
+                    fixed = self._generate_fix(response_text, error, max_output_tokens, response_schema)
+            else:
+                fixed = self._generate_fix(response_text, error, max_output_tokens, response_schema)
+        except Exception as e:
+            logger.error(f"JSON repair request failed: {e}")
+            return None
+
+        is_valid, data, _ = validate_json_output(fixed, structured=response_schema is not None)
+        if not is_valid:
+            data, _ = repair_json_locally(fixed)
+        return data
+
+    def _generate_fix(
+        self,
+        response_text: str,
+        error: str,
+        max_output_tokens: int,
+        response_schema: Optional[Dict[str, Any]]
+    ) -> str:
+        """Send the repair request."""
+        return self.gemini_client.generate(
+            prompt=build_json_repair_prompt(response_text, error),
+            temperature=JSON_REPAIR_TEMPERATURE,
+            max_output_tokens=max_output_tokens,
+            response_schema=response_schema
+        )
+
+    def _count(self, tier: str) -> None:
+        """Count a repair outcome."""
+        with self._lock:
+            self._counts[tier] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return repair counts per tier plus the number of attempts."""
+        with self._lock:
+            counts = dict(self._counts)
+        counts['attempts'] = sum(counts.values())
+        return counts
+
+    def format_summary(self) -> str:
+        """Format the repair counts for the end-of-run report."""
+        stats = self.stats()
+        if not stats['attempts']:
+            return "   (no invalid JSON responses)"
+        parts = [f"{tier}: {stats[tier]}" for tier in REPAIR_TIERS if stats[tier]]
+        return f"   {stats['attempts']} invalid response(s) - " + ", ".join(parts)
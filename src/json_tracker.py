@@ -4,10 +4,173 @@ import json
 import os
 import logging
 from datetime import datetime
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List, Tuple
 
 logger = logging.getLogger('character_creation')
 
+# Sidecar index file suffix (characters.jsonl -> characters.jsonl.idx)
+INDEX_SUFFIX = '.idx'
+
+# Parsed indexes keyed by index path: (index file size, entries)
+_index_cache: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+
+# Name lookups keyed by index path: (entries list, entries covered, name -> entry)
+_name_cache: Dict[str, Tuple[List[Dict[str, Any]], int, Dict[str, Dict[str, Any]]]] = {}
+
+
+def index_path_for(jsonl_path: str) -> str:
+    """Return the sidecar index path for a JSONL file."""
+    return jsonl_path + INDEX_SUFFIX
+
+
+def _index_entry(record: Dict[str, Any], offset: int, length: int) -> Dict[str, Any]:
+    """Build the index entry for a record stored at ``offset``."""
+    metadata = record.get('metadata', {})
+    return {
+        'name': metadata.get('name'),
+        'offset': offset,
+        'length': length,
+        'created_at': metadata.get('created_at'),
+        'dnd': metadata.get('dnd'),
+        'doc_url': metadata.get('doc_url'),
+    }
+
+
+def rebuild_index(jsonl_path: str) -> List[Dict[str, Any]]:
+    """Rebuild the sidecar index by scanning the whole JSONL file.
+
+    Args:
+        jsonl_path: Path to JSONL file
+
+    Returns:
+        List of index entries in file order
+    """
+    entries = []
+    offset = 0
+    with open(jsonl_path, 'rb') as fh:
+        for line_num, line in enumerate(fh, 1):
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt JSONL line {line_num} in {jsonl_path}")
+                else:
+                    entries.append(_index_entry(record, offset, len(line)))
+            offset += len(line)
+
+    index_path = index_path_for(jsonl_path)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        for entry in entries:
+            fh.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    os.replace(tmp_path, index_path)
+    _index_cache.pop(index_path, None)
+
+    logger.info(f"Rebuilt JSONL index with {len(entries)} entries: {index_path}")
+    return entries
+
+
+def _read_index(index_path: str) -> Optional[List[Dict[str, Any]]]:
+    """Read an index file, or return None if it is missing or unreadable."""
+    if not os.path.exists(index_path):
+        return None
+
+    size = os.path.getsize(index_path)
+    cached = _index_cache.get(index_path)
+    if cached and cached[0] == size:
+        return cached[1]
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as fh:
+            entries = [json.loads(line) for line in fh if line.strip()]
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable JSONL index {index_path}: {e}")
+        return None
+
+    _index_cache[index_path] = (size, entries)
+    return entries
+
+
+def _indexed_end(index_path: str) -> Optional[int]:
+    """Return where the last indexed record ends, reading only the index tail.
+
+    Returns:
+        End offset of the last entry (0 for an empty index), or None if
+        the index is missing or its last line is unreadable
+    """
+    try:
+        with open(index_path, 'rb') as fh:
+            pos = fh.seek(0, os.SEEK_END)
+            tail = b''
+            # Read backwards until the whole last line is in memory
+            while pos > 0 and tail.rstrip(b'\n').count(b'\n') == 0:
+                step = min(4096, pos)
+                pos -= step
+                fh.seek(pos)
+                tail = fh.read(step) + tail
+        last_line = tail.rstrip(b'\n').rsplit(b'\n', 1)[-1]
+        if not last_line.strip():
+            return 0
+        entry = json.loads(last_line)
+        return entry['offset'] + entry['length']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def load_index(jsonl_path: str) -> List[Dict[str, Any]]:
+    """Load the sidecar index, rebuilding it when missing or stale.
+
+    The index is stale when its last entry does not end exactly where the
+    JSONL file ends (e.g. records appended by an older version, or the
+    file was edited by hand).
+
+    Args:
+        jsonl_path: Path to JSONL file
+
+    Returns:
+        List of index entries in file order
+    """
+    entries = _read_index(index_path_for(jsonl_path))
+    jsonl_size = os.path.getsize(jsonl_path)
+    indexed_end = entries[-1]['offset'] + entries[-1]['length'] if entries else 0
+
+    if entries is None or indexed_end != jsonl_size:
+        logger.debug(f"JSONL index missing or stale for {jsonl_path}; rebuilding")
+        return rebuild_index(jsonl_path)
+    return entries
+
+
+def _find_indexed(jsonl_path: str, name: str) -> Optional[Dict[str, Any]]:
+    """Return the first index entry for ``name``.
+
+    The name lookup is built once per loaded index and extended with the
+    entries appended to it since, so repeated lookups do not scan the index.
+    """
+    entries = load_index(jsonl_path)
+    index_path = index_path_for(jsonl_path)
+    cached = _name_cache.get(index_path)
+    if cached is None or cached[0] is not entries or cached[1] > len(entries):
+        cached = (entries, 0, {})
+    by_name = cached[2]
+    for entry in entries[cached[1]:]:
+        by_name.setdefault(entry.get('name'), entry)
+    _name_cache[index_path] = (entries, len(entries), by_name)
+    return by_name.get(name)
+
+
+def _read_record_at(jsonl_path: str, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Seek to an indexed record and parse it, or return None on mismatch."""
+    with open(jsonl_path, 'rb') as fh:
+        fh.seek(entry['offset'])
+        line = fh.read(entry['length'])
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if record.get('metadata', {}).get('name') != entry['name']:
+        return None
+    return record
+
 
 def append_character_json(
     json_path: str,
@@ -22,7 +185,8 @@ def append_character_json(
     character_class: Optional[str] = None,
     level: Optional[int] = None,
     subclass: Optional[str] = None,
-    dnd_enhancement: Optional[str] = None
+    dnd_enhancement: Optional[str] = None,
+    usage: Optional[Dict[str, Any]] = None
 ):
     """Append a character creation record as JSONL (one JSON object per line).
     
@@ -40,6 +204,7 @@ def append_character_json(
         level: Optional D&D level
         subclass: Optional D&D subclass
         dnd_enhancement: Optional D&D enhancement content from Gemini
+        usage: Optional Gemini token usage (UsageTracker.to_dict())
     """
     created_at = datetime.utcnow().isoformat()
     
@@ -70,10 +235,34 @@ def append_character_json(
             'level': level,
         }
     
+    if usage:
+        record['usage'] = usage
+    
     try:
-        with open(json_path, 'a', encoding='utf-8') as fh:
-            json.dump(record, fh, ensure_ascii=False)
-            fh.write('\n')
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        index_path = index_path_for(json_path)
+        if os.path.exists(json_path):
+            # Bring the index up to date before adding to it; checking only
+            # its last entry keeps appends O(1)
+            if _indexed_end(index_path) != os.path.getsize(json_path):
+                rebuild_index(json_path)
+        elif os.path.exists(index_path):
+            # Leftover index from a deleted JSONL file
+            os.remove(index_path)
+            _index_cache.pop(index_path, None)
+        with open(json_path, 'ab') as fh:
+            offset = fh.seek(0, os.SEEK_END)
+            fh.write(line)
+        entry = _index_entry(record, offset, len(line))
+        with open(index_path, 'ab') as fh:
+            index_offset = fh.seek(0, os.SEEK_END)
+            fh.write((json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8'))
+            index_size = fh.tell()
+        # Extend a cached index in place instead of re-reading it
+        cached = _index_cache.get(index_path)
+        if cached and cached[0] == index_offset:
+            cached[1].append(entry)
+            _index_cache[index_path] = (index_size, cached[1])
         logger.info(f"Character record appended to JSON: {name} (species={species}, class={character_class}, level={level})")
     except Exception as e:
         logger.error(f"Failed to append character to JSON: {e}")
@@ -110,6 +299,8 @@ def export_characters_to_json(jsonl_path: str, output_json_path: str) -> None:
 def get_character_by_name(jsonl_path: str, name: str) -> Optional[Dict[str, Any]]:
     """Retrieve a character record by name from JSONL.
     
+    Looks the name up in the sidecar index and seeks straight to the record.
+    
     Args:
         jsonl_path: Path to JSONL file
         name: Character name to search for
@@ -122,12 +313,15 @@ def get_character_by_name(jsonl_path: str, name: str) -> Optional[Dict[str, Any]
         return None
     
     try:
-        with open(jsonl_path, 'r', encoding='utf-8') as fh:
-            for line in fh:
-                if line.strip():
-                    record = json.loads(line)
-                    if record.get('metadata', {}).get('name') == name:
-                        return record
+        for _ in range(2):
+            entry = _find_indexed(jsonl_path, name)
+            if entry is None:
+                break
+            record = _read_record_at(jsonl_path, entry)
+            if record is not None:
+                return record
+            # Offsets no longer match the file; rebuild and look again
+            rebuild_index(jsonl_path)
         
         logger.debug(f"Character not found: {name}")
         return None
@@ -151,22 +345,18 @@ def list_characters(jsonl_path: str, limit: Optional[int] = None) -> list:
         return []
     
     try:
-        characters = []
-        count = 0
-        with open(jsonl_path, 'r', encoding='utf-8') as fh:
-            for line in fh:
-                if line.strip():
-                    record = json.loads(line)
-                    metadata = record.get('metadata', {})
-                    characters.append({
-                        'name': metadata.get('name'),
-                        'created_at': metadata.get('created_at'),
-                        'dnd': metadata.get('dnd'),
-                        'doc_url': metadata.get('doc_url'),
-                    })
-                    count += 1
-                    if limit and count >= limit:
-                        break
+        entries = load_index(jsonl_path)
+        if limit:
+            entries = entries[:limit]
+        characters = [
+            {
+                'name': entry.get('name'),
+                'created_at': entry.get('created_at'),
+                'dnd': entry.get('dnd'),
+                'doc_url': entry.get('doc_url'),
+            }
+            for entry in entries
+        ]
         
         logger.debug(f"Listed {len(characters)} characters from JSONL")
         return characters
@@ -0,0 +1,1095 @@
+"""Per-character generation pipeline with optional concurrent batch execution."""
+
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.batch_prediction import run_batch_job
+from src.csv_tracker import CharacterCSVTracker
+from src.dnd_enhancement import DND_GENERATION_CONFIG, DND_SUBCLASSES
+from src.doc_stream import DocStreamWriter
+from src.gdocs import create_doc_with_content, get_doc_url, replace_text
+from src.json_repair import JSONRepairer
+from src.json_tracker import append_character_json
+from src.run_journal import RunJournal
+from src.template_parser import (
+    SECTION_PROMPT_PREFIX,
+    STRUCTURED_OUTPUT_PROMPT_PREFIX,
+    TEMPLATE_CACHE_SIZE,
+    build_json_prompt_prefix,
+    build_response_schema,
+    build_section_prompt,
+    build_section_response_schema,
+    build_seed_summary_prompt,
+    flatten_json_for_text,
+    format_character_inputs,
+    merge_json_into_structure,
+    parse_template_structure,
+    save_character_json,
+    validate_json_output,
+)
+from src.timing import StageTimer
+from src.usage import usage_scope
+
+logger = logging.getLogger('character_creation')
+
+# Generation settings for the base profile
+BASE_GENERATION_CONFIG: Dict[str, Any] = {
+    'temperature': 0.7,
+    'max_output_tokens': 2048,
+}
+
+# Generation settings for section-parallel JSON generation: a short shared
+# summary first, then one request per template section
+SEED_GENERATION_CONFIG: Dict[str, Any] = {
+    'temperature': 0.7,
+    'max_output_tokens': 512,
+}
+SECTION_GENERATION_CONFIG: Dict[str, Any] = {
+    'temperature': 0.7,
+    'max_output_tokens': 1024,
+}
+
+# Character argument keys that are not optional template fields
+RESERVED_ARG_KEYS: List[str] = [
+    'name', 'sex', 'gender', 'age_range', 'ethnicity',
+    'occupation', 'species', 'character_class', 'level',
+    'subclass', 'new_doc_title', 'json_output'
+]
+
+
+def build_character_inputs(char_args: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the Gemini character inputs from extracted character arguments.
+
+    Args:
+        char_args: Character arguments (CLI or from JSON/JSONL input)
+
+    Returns:
+        Dict with the base inputs and, if present, ``optional_fields``
+    """
+    character_inputs = {
+        'name': char_args.get('name'),
+        'sex': char_args.get('sex'),
+        'gender': char_args.get('gender'),
+        'age_range': char_args.get('age_range'),
+        'ethnicity': char_args.get('ethnicity'),
+        'occupation': char_args.get('occupation'),
+    }
+
+    # Add optional template fields if present
+    optional_fields = {
+        key: value for key, value in char_args.items()
+        if key not in RESERVED_ARG_KEYS
+    }
+
+    if optional_fields:
+        character_inputs['optional_fields'] = optional_fields
+        logger.debug(f"Added {len(optional_fields)} optional fields")
+
+    return character_inputs
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def build_text_prompt_prefix(template_text: str) -> str:
+    """Build the static part of the legacy free-text prompt for a template.
+
+    Built once per template revision; the character inputs follow it at
+    the end of the prompt.
+
+    Args:
+        template_text: The Google Docs template text
+
+    Returns:
+        Prompt prefix, to be followed by the character inputs block
+    """
+    return (
+        "You are a creative character development assistant. "
+        "Fill in the following character template "
+        "by replacing all placeholder fields with realistic and interesting "
+        "details based on the character inputs at the end of this prompt. "
+        "Maintain creative consistency and make the character vivid and memorable.\n\n"
+
+        "TEMPLATE TO FILL:\n"
+        "---START TEMPLATE---\n"
+        f"{template_text}\n"
+        "---END TEMPLATE---\n\n"
+
+        "Instructions:\n"
+        "1. Replace all {{NAME}}, {{SEX}}, {{GENDER}}, {{AGE_RANGE}}, "
+        "{{OCCUPATION}} with the provided values\n"
+        "2. Fill in any other blank sections with creative and consistent "
+        "character details\n"
+        "3. Make the character's background, personality, and traits coherent\n"
+        "4. Output ONLY the completed character profile, nothing else\n\n"
+    )
+
+
+def build_text_prompt(template_text: str, character_inputs: Dict[str, Any]) -> str:
+    """Build the legacy free-text prompt for filling the template.
+
+    Args:
+        template_text: The Google Docs template text
+        character_inputs: Inputs from build_character_inputs()
+
+    Returns:
+        A formatted prompt for Gemini
+    """
+    return build_text_prompt_prefix(template_text) + format_text_inputs(character_inputs)
+
+
+def format_text_inputs(character_inputs: Dict[str, Any]) -> str:
+    """Format the per-character inputs block that ends the legacy text prompt.
+
+    Args:
+        character_inputs: Inputs from build_character_inputs()
+
+    Returns:
+        ``CHARACTER INPUTS:`` block, plus optional template fields
+    """
+    optional_fields = character_inputs.get('optional_fields') or {}
+    optional_text = ""
+    if optional_fields:
+        optional_text = (
+            "\nOPTIONAL TEMPLATE FIELDS:\n"
+            + "\n".join(
+                f"- {k}: {v}" for k, v in optional_fields.items()
+            ) + "\n"
+        )
+
+    return (
+        "CHARACTER INPUTS:\n"
+        f"- Name: {character_inputs['name']}\n"
+        f"- Sex: {character_inputs['sex']}\n"
+        f"- Gender Identity: {character_inputs['gender']}\n"
+        f"- Ethnicity: {character_inputs['ethnicity']}\n"
+        f"- Age Range: {character_inputs['age_range']}\n"
+        f"- Occupation: {character_inputs['occupation']}\n"
+        f"{optional_text}"
+    )
+
+
+class CharacterPipeline:
+    """Runs characters through generation, Google Docs and tracking stages.
+
+    A single pipeline can process characters sequentially or through a
+    bounded thread pool. Gemini and Docs calls are limited by per-stage
+    semaphores, and tracker writes are serialized so the CSV/JSONL files
+    stay consistent when several characters finish at once.
+    """
+
+    def __init__(
+        self,
+        gemini_client,
+        dnd_enhancer,
+        docs_service,
+        template_text: str,
+        csv_path: str,
+        jsonl_path: str,
+        json_dir: str,
+        docs_service_factory: Optional[Callable[[], Any]] = None,
+        gemini_concurrency: int = 1,
+        docs_concurrency: int = 1,
+        journal: Optional[RunJournal] = None,
+        tracker=None,
+        timer: Optional[StageTimer] = None,
+        compact_prompt: bool = False,
+        stream_docs: bool = False,
+        structured_output: bool = False,
+        json_repair_model: bool = True,
+        section_parallel: bool = False
+    ) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            gemini_client: Shared GeminiClient instance
+            dnd_enhancer: DNDEnhancer sharing the same Gemini client
+            docs_service: Authenticated Docs service for the calling thread
+            template_text: Template text fetched from Google Docs
+            csv_path: Path to the character tracking CSV
+            jsonl_path: Path to the character tracking JSONL
+            json_dir: Directory for individual character JSON files
+            docs_service_factory: Optional callable building a new Docs
+                service; used to give each worker thread its own client
+            gemini_concurrency: Max concurrent Gemini calls
+            docs_concurrency: Max concurrent Google Docs calls
+            journal: Optional RunJournal used to checkpoint stages and
+                skip the ones already finished in a resumed run
+            tracker: Optional tracker with the CharacterCSVTracker interface
+                (e.g. CharacterSQLiteTracker); defaults to the CSV at csv_path
+            timer: Optional StageTimer collecting per-stage durations
+                (default: a new timer, available as ``self.timer``)
+            compact_prompt: In JSON mode, send only the schema and inputs
+                instead of embedding the full template text
+            stream_docs: Stream the generation that produces the document
+                text (D&D enhancement, or the text-mode base profile) and
+                append it to the Google Doc while it is being generated
+            structured_output: In JSON mode, constrain Gemini to a response
+                schema built from the template instead of describing the
+                JSON structure in the prompt
+            json_repair_model: When local fixes cannot repair an invalid
+                JSON response, ask Gemini to fix it before falling back
+                to text mode
+            section_parallel: In JSON mode, generate a short character
+                summary and then every template section concurrently,
+                instead of the whole profile in one request
+        """
+        self.gemini_client = gemini_client
+        self.dnd_enhancer = dnd_enhancer
+        self.docs_service = docs_service
+        self.docs_service_factory = docs_service_factory
+        self.template_text: str = template_text
+        self.csv_path: str = csv_path
+        self.jsonl_path: str = jsonl_path
+        self.json_dir: str = json_dir
+        self.journal: Optional[RunJournal] = journal
+        self.tracker = tracker
+        self.timer: StageTimer = timer if timer is not None else StageTimer()
+        self.compact_prompt: bool = compact_prompt
+        self.stream_docs: bool = stream_docs
+        self.structured_output: bool = structured_output
+        self.section_parallel: bool = section_parallel
+
+        self._gemini_slots = threading.BoundedSemaphore(max(1, gemini_concurrency))
+        self._docs_slots = threading.BoundedSemaphore(max(1, docs_concurrency))
+        self._tracker_lock = threading.Lock()
+        self._local = threading.local()
+        self.json_repairer = JSONRepairer(
+            gemini_client if json_repair_model else None,
+            slots=self._gemini_slots
+        )
+
+        logger.debug(
+            f"CharacterPipeline initialized (gemini_concurrency={gemini_concurrency}, "
+            f"docs_concurrency={docs_concurrency})"
+        )
+
+    def _get_docs_service(self):
+        """Return the Docs service for the current thread.
+
+        googleapiclient service objects are not thread-safe, so worker
+        threads get their own instance when a factory is configured.
+        """
+        if self.docs_service_factory is None:
+            return self.docs_service
+
+        service = getattr(self._local, 'docs_service', None)
+        if service is None:
+            service = self.docs_service_factory()
+            self._local.docs_service = service
+            logger.debug(
+                f"Created Docs service for thread {threading.current_thread().name}"
+            )
+        return service
+
+    def process_character(
+        self,
+        char_idx: int,
+        total: int,
+        char_args: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Generate, publish and track a single character.
+
+        Args:
+            char_idx: 1-based index of the character in the batch
+            total: Total number of characters in the batch
+            char_args: Character arguments
+
+        Returns:
+            Dict with name, doc_url and the D&D info actually used
+        """
+        print(f"\n{'='*60}")
+        print(f"📝 Character {char_idx}/{total}: {char_args['name']}")
+        print(f"{'='*60}\n")
+
+        char_key = RunJournal.character_key(char_idx, char_args)
+        tracked = self._journal_get(char_key, 'tracked')
+        if tracked is not None:
+            print(f"⏭️  Already completed in this run: {tracked.get('doc_url')}")
+            logger.info(f"Skipping completed character (journal): {char_args['name']}")
+            return tracked
+
+        logger.info(
+            f"Processing character {char_idx}: name={char_args.get('name')}, "
+            f"ethnicity={char_args.get('ethnicity')}, "
+            f"sex/gender={char_args.get('sex')}/{char_args.get('gender')}, "
+            f"age={char_args.get('age_range')}, "
+            f"occupation={char_args.get('occupation')}"
+        )
+
+        json_output_mode = char_args.get('json_output', False)
+        species = char_args.get('species')
+        character_class = char_args.get('character_class')
+        level = char_args.get('level')
+
+        docs_service = self._get_docs_service()
+        doc_created = self._journal_get(char_key, 'doc_created')
+        doc_writer = None
+        if self.stream_docs and doc_created is None:
+            doc_writer = DocStreamWriter(
+                docs_service,
+                self._doc_title(char_args),
+                on_created=lambda doc_id: self._journal_record(
+                    char_key, 'doc_created', doc_id=doc_id, streamed=True
+                ),
+                slots=self._docs_slots,
+                timer=self.timer
+            )
+
+        with usage_scope() as char_usage:
+            try:
+                filled_content, character_json, enhanced_content, subclass = (
+                    self._generate_content(char_key, char_args, json_output_mode, doc_writer)
+                )
+            except Exception:
+                if doc_writer is not None:
+                    doc_writer.abort()
+                raise
+
+        final_content = enhanced_content or filled_content
+
+        if doc_writer is not None and doc_writer.started:
+            print("📄 Finishing streamed Google Doc...")
+            doc_id = doc_writer.close()
+            self._journal_record(char_key, 'content_inserted')
+        elif doc_created is not None:
+            doc_id = doc_created['doc_id']
+            print(f"⏭️  Reusing Google Doc from journal: {doc_id}")
+            if not self._journal_done(char_key, 'content_inserted'):
+                print("✍️  Inserting generated content...")
+                logger.info("Inserting generated content into existing document")
+                # The doc may already hold partial streamed text, or all of
+                # it if only the journal write was lost; diff against it
+                with self._docs_slots, self.timer.span('doc_insert'):
+                    replace_text(docs_service, doc_id, final_content)
+                self._journal_record(char_key, 'content_inserted')
+        else:
+            # Create new Google Doc with its final content
+            print("📄 Creating Google Doc...")
+            doc_title = self._doc_title(char_args)
+            logger.info(f"Creating new Google Doc with content: {doc_title}")
+            with self._docs_slots:
+                doc_id = create_doc_with_content(
+                    docs_service,
+                    doc_title,
+                    final_content,
+                    on_created=lambda doc_id: self._journal_record(
+                        char_key, 'doc_created', doc_id=doc_id
+                    ),
+                    timer=self.timer
+                )
+            self._journal_record(char_key, 'content_inserted')
+
+        # Get the document URL
+        doc_url = get_doc_url(doc_id)
+        logger.debug(f"Document created: {doc_url}")
+
+        with self._tracker_lock, self.timer.span('tracker_write'):
+            self._track_character(
+                char_args, doc_url, filled_content, enhanced_content,
+                subclass, character_json if json_output_mode else None,
+                usage=char_usage.to_dict() if char_usage.total().calls else None
+            )
+
+        result = {
+            'name': char_args['name'],
+            'doc_url': doc_url,
+            'species': species,
+            'character_class': character_class,
+            'level': level,
+            'subclass': subclass,
+        }
+        self._journal_record(char_key, 'tracked', **result)
+
+        # Success output
+        print("\n✅ Character created successfully!\n")
+        print(f"📎 Document URL: {doc_url}")
+        logger.info("Character Creation Completed Successfully")
+
+        if species:
+            subclass_info = f" ({subclass})" if subclass else ""
+            print(
+                f"🐉 D&D Profile: {species} {character_class} "
+                f"(Level {level}){subclass_info}"
+            )
+            logger.info(
+                f"D&D Profile: {species} {character_class} "
+                f"(Level {level}){subclass_info}"
+            )
+
+        print(f"📊 Tracked in: {self._tracker_location()} & {self.jsonl_path}")
+        if json_output_mode:
+            print(f"💾 JSON saved to: {self.json_dir}/")
+
+        return result
+
+    @staticmethod
+    def _doc_title(char_args: Dict[str, Any]) -> str:
+        """Return the Google Doc title for a character."""
+        return (
+            char_args.get('new_doc_title') or
+            f"Character - {char_args['name']} - {datetime.utcnow().date()}"
+        )
+
+    def _generate_content(
+        self,
+        char_key: str,
+        char_args: Dict[str, Any],
+        json_output_mode: bool,
+        doc_writer: Optional[DocStreamWriter] = None
+    ) -> Tuple[str, Optional[Dict[str, Any]], Optional[str], Optional[str]]:
+        """Run (or replay from the journal) the Gemini stages for a character.
+
+        Args:
+            char_key: Run journal key of the character
+            char_args: Character arguments
+            json_output_mode: Whether to request structured JSON
+            doc_writer: Optional DocStreamWriter receiving the chunks of the
+                stage that produces the document text (the D&D enhancement
+                if requested, else a text-mode base profile)
+
+        Returns:
+            Tuple of (filled_content, character_json, enhanced_content,
+            subclass); enhanced_content is None without D&D enhancement
+        """
+        species = char_args.get('species')
+        character_class = char_args.get('character_class')
+        level = char_args.get('level')
+        subclass = char_args.get('subclass')
+        dnd_requested = bool(species and character_class and level)
+
+        generated = self._journal_get(char_key, 'generated')
+        if generated is not None:
+            print("⏭️  Reusing generated content from journal")
+            filled_content = generated['filled_content']
+            character_json = generated.get('character_json')
+        else:
+            stream_base = doc_writer is not None and not json_output_mode and not dnd_requested
+            filled_content, character_json = self._generate_base(
+                char_args, json_output_mode,
+                on_chunk=doc_writer.write if stream_base else None
+            )
+            self._journal_record(
+                char_key, 'generated',
+                filled_content=filled_content,
+                character_json=character_json
+            )
+
+        # Check if D&D enhancement is requested (before anything is written,
+        # so the doc is created with its final content in one pass)
+        enhanced_content = None
+
+        dnd_enhanced = self._journal_get(char_key, 'dnd_enhanced')
+        if dnd_enhanced is not None:
+            print("⏭️  Reusing D&D enhancement from journal")
+            enhanced_content = dnd_enhanced.get('enhanced_content')
+            subclass = dnd_enhanced.get('subclass')
+        elif dnd_requested:
+            subclass = self._validate_dnd_args(character_class, level, subclass)
+
+            with self._gemini_slots, self.timer.span('dnd_enhance'):
+                if doc_writer is None:
+                    enhanced_content = self.dnd_enhancer.enhance_character(
+                        base_character=filled_content,
+                        species=species,
+                        character_class=character_class,
+                        level=level,
+                        subclass=subclass
+                    )
+                else:
+                    print("   → Streaming into Google Doc")
+                    enhanced_content = self._consume_stream(
+                        self.dnd_enhancer.stream_enhance_character(
+                            base_character=filled_content,
+                            species=species,
+                            character_class=character_class,
+                            level=level,
+                            subclass=subclass
+                        ),
+                        doc_writer.write
+                    )
+            self._journal_record(
+                char_key, 'dnd_enhanced',
+                enhanced_content=enhanced_content,
+                subclass=subclass
+            )
+
+        return filled_content, character_json, enhanced_content, subclass
+
+    def _generate_base(
+        self,
+        char_args: Dict[str, Any],
+        json_output_mode: bool,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Generate the base character profile with Gemini.
+
+        Args:
+            char_args: Character arguments
+            json_output_mode: Whether to request structured JSON
+            on_chunk: Optional callback receiving the response as it
+                streams in (the full response is still returned)
+
+        Returns:
+            Tuple of (filled_content, character_json); character_json is
+            None unless JSON mode produced valid JSON
+        """
+        # Build prompt and call Gemini
+        print("🤖 Generating character with Gemini AI...")
+        structured = json_output_mode and self.structured_output
+        if json_output_mode:
+            print("   → Using structured JSON output")
+            if self.section_parallel and on_chunk is None:
+                character_json = self._generate_by_section(char_args, structured)
+                if character_json is not None:
+                    return flatten_json_for_text(character_json), character_json
+                print("⚠️  Section generation failed, generating the full profile instead")
+        with self.timer.span('prompt_build'):
+            prefix, inputs = self.build_base_prompt_parts(char_args, structured)
+            response_schema = build_response_schema(self.template_text) if structured else None
+
+        logger.info("Calling Gemini to generate base character profile")
+        with self._gemini_slots, self.timer.span('base_generation'):
+            if on_chunk is None:
+                gemini_response = self.gemini_client.generate(
+                    prompt=inputs,
+                    prefix=prefix,
+                    response_schema=response_schema,
+                    **BASE_GENERATION_CONFIG
+                )
+            else:
+                print("   → Streaming into Google Doc")
+                gemini_response = self._consume_stream(
+                    self.gemini_client.generate_stream(
+                        prompt=inputs,
+                        prefix=prefix,
+                        **BASE_GENERATION_CONFIG
+                    ),
+                    on_chunk
+                )
+
+        return self._parse_base_response(gemini_response, json_output_mode, structured)
+
+    def _generate_by_section(
+        self,
+        char_args: Dict[str, Any],
+        structured: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Generate a JSON profile one template section per request.
+
+        A short character summary is generated first and shared by every
+        section prompt, so the concurrently generated sections describe
+        the same character; the sections are then merged into the
+        template structure. Each request only produces one section, so it
+        stays far below the output token limit, and with enough Gemini
+        slots the run takes about as long as the slowest section.
+
+        Args:
+            char_args: Character arguments
+            structured: Constrain each section with its response schema
+
+        Returns:
+            Merged character JSON, or None if the summary or any section
+            failed (the caller then generates the whole profile at once)
+        """
+        structure = parse_template_structure(self.template_text)
+        if not structure:
+            return None
+        sections = list(structure)
+        character_inputs = build_character_inputs(char_args)
+        print(f"   → Generating {len(sections)} sections in parallel")
+
+        try:
+            with self._gemini_slots, self.timer.span('seed_summary'):
+                seed_summary = self.gemini_client.generate(
+                    prompt=build_seed_summary_prompt(character_inputs),
+                    **SEED_GENERATION_CONFIG
+                )
+            with self.timer.span('prompt_build'):
+                prompts = [
+                    build_section_prompt(
+                        self.template_text, section, seed_summary, character_inputs, structured
+                    )
+                    for section in sections
+                ]
+                schemas = [
+                    build_section_response_schema(self.template_text, section) if structured else None
+                    for section in sections
+                ]
+            with self.timer.span('section_generation'):
+                responses = self._generate_sections(prompts, schemas)
+        except Exception as e:
+            logger.warning(f"Section-parallel generation failed: {e}")
+            return None
+
+        filled: Dict[str, Any] = {}
+        for section, response, schema in zip(sections, responses, schemas, strict=True):
+            if isinstance(response, Exception):
+                logger.warning(f"Generating section '{section}' failed: {response}")
+                return None
+            is_valid, section_json, error_msg = validate_json_output(response, structured=structured)
+            if not is_valid:
+                logger.warning(f"Section '{section}' JSON validation failed: {error_msg}")
+                with self.timer.span('json_repair'):
+                    section_json = self.json_repairer.repair(response, error_msg, schema)
+                if section_json is None:
+                    return None
+            filled[section] = section_json.get(section, section_json)
+
+        logger.info(f"Generated {len(filled)} sections in parallel")
+        return merge_json_into_structure(structure, filled)
+
+    def _generate_sections(
+        self,
+        prompts: List[str],
+        schemas: List[Optional[Dict[str, Any]]]
+    ) -> List[Any]:
+        """Send the section requests concurrently (exceptions are returned).
+
+        Each request takes its own Gemini slot, so sections of all
+        characters together stay within ``gemini_concurrency``.
+        """
+        def generate_section(prompt: str, schema: Optional[Dict[str, Any]]) -> str:
+            with self._gemini_slots:
+                return self.gemini_client.generate(
+                    prompt=prompt,
+                    prefix=SECTION_PROMPT_PREFIX,
+                    response_schema=schema,
+                    **SECTION_GENERATION_CONFIG
+                )
+
+        with ThreadPoolExecutor(
+            max_workers=len(prompts), thread_name_prefix='section'
+        ) as executor:
+            # Copy the context per request so usage_scope() sees the calls
+            futures = [
+                executor.submit(contextvars.copy_context().run, generate_section, prompt, schema)
+                for prompt, schema in zip(prompts, schemas, strict=True)
+            ]
+        responses: List[Any] = []
+        for future in futures:
+            error = future.exception()
+            responses.append(error if error is not None else future.result())
+        return responses
+
+    @staticmethod
+    def _consume_stream(chunks: Iterable[str], on_chunk: Callable[[str], None]) -> str:
+        """Pass each streamed chunk to ``on_chunk`` and return the joined text."""
+        parts: List[str] = []
+        for chunk in chunks:
+            on_chunk(chunk)
+            parts.append(chunk)
+        return ''.join(parts)
+
+    def build_base_prompt(self, char_args: Dict[str, Any], structured: bool = False) -> str:
+        """Build the base generation prompt for a character.
+
+        Args:
+            char_args: Character arguments
+            structured: Build the JSON-mode prompt for a request that
+                carries a response schema
+
+        Returns:
+            JSON-mode or legacy text prompt, depending on ``json_output``
+        """
+        prefix, inputs = self.build_base_prompt_parts(char_args, structured)
+        return prefix + inputs
+
+    def build_base_prompt_parts(
+        self,
+        char_args: Dict[str, Any],
+        structured: bool = False
+    ) -> Tuple[str, str]:
+        """Build the base generation prompt as (static prefix, character inputs).
+
+        The prefix depends only on the template and prompt mode, so it is
+        shared by every character (and can be served from a Gemini
+        context cache).
+
+        Args:
+            char_args: Character arguments
+            structured: Build the JSON-mode prompt for a request that
+                carries a response schema (the structure is not repeated)
+
+        Returns:
+            Tuple of (prefix, inputs); the full prompt is prefix + inputs
+        """
+        character_inputs = build_character_inputs(char_args)
+        logger.info("Building character generation prompt")
+
+        if char_args.get('json_output', False):
+            logger.info("JSON output mode: requesting JSON from Gemini")
+            if structured:
+                return STRUCTURED_OUTPUT_PROMPT_PREFIX, format_character_inputs(character_inputs)
+            return (
+                build_json_prompt_prefix(self.template_text, self.compact_prompt),
+                format_character_inputs(character_inputs),
+            )
+
+        # Use legacy text-based approach
+        return (
+            build_text_prompt_prefix(self.template_text),
+            format_text_inputs(character_inputs),
+        )
+
+    def _parse_base_response(
+        self,
+        gemini_response: str,
+        json_output_mode: bool,
+        structured: bool = False
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Turn a base generation response into document text (and JSON).
+
+        Args:
+            gemini_response: Raw base generation response
+            json_output_mode: Whether JSON was requested
+            structured: The response was constrained by a response schema
+
+        Returns:
+            Tuple of (filled_content, character_json)
+        """
+        character_json = None
+        if json_output_mode:
+            print("✓ Validating JSON structure...")
+            with self.timer.span('json_validation'):
+                is_valid, character_json, error_msg = validate_json_output(
+                    gemini_response, structured=structured
+                )
+            if not is_valid:
+                logger.warning(f"JSON validation failed: {error_msg}. Attempting repair.")
+                print("🩹 JSON validation failed, attempting repair...")
+                response_schema = build_response_schema(self.template_text) if structured else None
+                with self.timer.span('json_repair'):
+                    character_json = self.json_repairer.repair(
+                        gemini_response, error_msg, response_schema
+                    )
+                is_valid = character_json is not None
+            if not is_valid:
+                logger.warning("JSON repair failed. Falling back to text mode.")
+                print("⚠️  JSON repair failed, using text output instead")
+                filled_content = gemini_response
+            else:
+                logger.info("JSON validation successful")
+                filled_content = flatten_json_for_text(character_json)
+        else:
+            filled_content = gemini_response
+
+        return filled_content, character_json
+
+    def _validate_dnd_args(
+        self,
+        character_class: str,
+        level: int,
+        subclass: Optional[str]
+    ) -> Optional[str]:
+        """Announce the D&D enhancement and validate level/subclass.
+
+        Returns:
+            The subclass, or None if it is not valid for the class
+        """
+        print("🐉 Generating D&D 5e 2024 enhancements...")
+        logger.info("D&D enhancement requested")
+
+        if level < 1 or level > 20:
+            print("⚠️  Warning: Level should be between 1-20")
+            logger.warning(f"Invalid level: {level}")
+
+        # Validate subclass if provided
+        if subclass:
+            valid_subclasses = DND_SUBCLASSES.get(character_class, [])
+            if subclass not in valid_subclasses:
+                print(
+                    f"⚠️  Warning: '{subclass}' is not a valid subclass "
+                    f"for {character_class}"
+                )
+                logger.warning(
+                    f"Invalid subclass: {subclass} for {character_class}"
+                )
+                print(f"Valid options: {', '.join(valid_subclasses)}")
+                subclass = None
+            else:
+                print(f"   Subclass: {subclass}")
+                logger.debug(f"Subclass validated: {subclass}")
+
+        return subclass
+
+    def _journal_get(self, char_key: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Return journal data for a finished stage, if journaling is enabled."""
+        if self.journal is None:
+            return None
+        return self.journal.get(char_key, stage)
+
+    def _journal_done(self, char_key: str, stage: str) -> bool:
+        """Check whether a stage already finished according to the journal."""
+        return self._journal_get(char_key, stage) is not None
+
+    def _journal_record(self, char_key: str, stage: str, **data: Any) -> None:
+        """Record a finished stage, if journaling is enabled."""
+        if self.journal is not None:
+            self.journal.record(char_key, stage, **data)
+
+    def _tracker_location(self) -> str:
+        """Return the path of the file backing the character tracker."""
+        if self.tracker is None:
+            return self.csv_path
+        return getattr(self.tracker, 'db_path', None) or getattr(self.tracker, 'csv_path', '')
+
+    def _track_character(
+        self,
+        char_args: Dict[str, Any],
+        doc_url: str,
+        filled_content: str,
+        enhanced_content: Optional[str],
+        subclass: Optional[str],
+        character_json: Optional[Dict[str, Any]],
+        usage: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Write the CSV, JSONL and optional JSON records for a character.
+
+        Callers must hold the tracker lock. ``usage`` (Gemini token counts
+        spent on the character in this run) is stored in the JSONL record.
+        """
+        species = char_args.get('species')
+        character_class = char_args.get('character_class')
+        level = char_args.get('level')
+
+        # Save to CSV (or the configured tracker)
+        print("💾 Saving to character tracker...")
+        logger.info(f"Saving character record to tracker: {self._tracker_location()}")
+        tracker = self.tracker or CharacterCSVTracker(self.csv_path)
+        tracker.append_record(
+            name=char_args['name'],
+            sex=char_args.get('sex'),
+            gender=char_args.get('gender'),
+            age_range=char_args.get('age_range'),
+            occupation=char_args.get('occupation'),
+            doc_url=doc_url,
+            species=species,
+            character_class=character_class,
+            level=level,
+            subclass=subclass
+        )
+
+        # Save to JSONL with full AI output
+        print("📄 Saving to character tracking JSONL...")
+        logger.info(f"Saving character record to JSONL: {self.jsonl_path}")
+        append_character_json(
+            json_path=self.jsonl_path,
+            name=char_args['name'],
+            sex=char_args.get('sex'),
+            gender=char_args.get('gender'),
+            age_range=char_args.get('age_range'),
+            occupation=char_args.get('occupation'),
+            doc_url=doc_url,
+            filled_content=filled_content,
+            species=species,
+            character_class=character_class,
+            level=level,
+            subclass=subclass,
+            dnd_enhancement=enhanced_content,
+            usage=usage
+        )
+
+        # Save individual character JSON if requested
+        if character_json:
+            os.makedirs(self.json_dir, exist_ok=True)
+            json_filename = (
+                f"{char_args['name'].lower().replace(' ', '_')}_"
+                f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            json_file_path = os.path.join(self.json_dir, json_filename)
+            print("💾 Saving structured character JSON...")
+            logger.info(f"Saving structured character JSON: {json_file_path}")
+            save_character_json(json_file_path, character_json, char_args['name'])
+            print(f"   → {json_filename}")
+
+    def prefetch_with_batch(
+        self,
+        character_args_list: List[Dict[str, Any]],
+        backend,
+        work_dir: str,
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None
+    ) -> Dict[str, int]:
+        """Generate base profiles (and D&D enhancements) via batch prediction.
+
+        Results are recorded in the run journal as finished 'generated' /
+        'dnd_enhanced' stages, so run() then only performs the Docs and
+        tracker stages. Requests that fail in the batch are left
+        unrecorded and fall back to online generation in run().
+
+        Args:
+            character_args_list: Characters to process
+            backend: LocalBatchBackend or VertexBatchBackend
+            work_dir: Directory for batch input/output files
+            poll_interval: Seconds between job status checks
+            timeout: Max seconds to wait per batch job
+
+        Returns:
+            Dict with counts of prefetched base and D&D generations
+        """
+        if self.journal is None:
+            raise ValueError("Batch prediction requires a run journal")
+
+        run_id = self.journal.run_id
+        keyed = [
+            (RunJournal.character_key(char_idx, char_args), char_args)
+            for char_idx, char_args in enumerate(character_args_list, 1)
+        ]
+        counts = {'generated': 0, 'dnd_enhanced': 0}
+
+        # Round 1: base profiles
+        pending = [
+            (key, char_args) for key, char_args in keyed
+            if not self._journal_done(key, 'tracked')
+            and not self._journal_done(key, 'generated')
+        ]
+        if pending:
+            print(f"📦 Submitting {len(pending)} base generation(s) as a batch job...")
+            # One generation config covers the whole job, so JSON characters
+            # get the schema in the prompt even with structured output, and
+            # the whole profile in one request even with section_parallel
+            results = run_batch_job(
+                backend,
+                [(key, self.build_base_prompt(char_args)) for key, char_args in pending],
+                BASE_GENERATION_CONFIG,
+                work_dir,
+                f"{run_id}-base",
+                poll_interval=poll_interval,
+                timeout=timeout,
+            )
+            for key, char_args in pending:
+                response = results.get(key)
+                if isinstance(response, str):
+                    filled_content, character_json = self._parse_base_response(
+                        response, char_args.get('json_output', False)
+                    )
+                    self._journal_record(
+                        key, 'generated',
+                        filled_content=filled_content,
+                        character_json=character_json
+                    )
+                    counts['generated'] += 1
+                else:
+                    logger.warning(
+                        f"Batch generation failed for {char_args.get('name')}: {response}. "
+                        "Will generate online."
+                    )
+
+        # Round 2: D&D enhancements of the generated base profiles
+        dnd_requests = []
+        dnd_subclasses = {}
+        for key, char_args in keyed:
+            generated = self._journal_get(key, 'generated')
+            species = char_args.get('species')
+            character_class = char_args.get('character_class')
+            level = char_args.get('level')
+            if (generated is None or not (species and character_class and level)
+                    or self._journal_done(key, 'dnd_enhanced')
+                    or self._journal_done(key, 'tracked')):
+                continue
+            if not (self.dnd_enhancer.is_valid_species(species)
+                    and self.dnd_enhancer.is_valid_class(character_class)):
+                continue  # run() reports the invalid D&D arguments
+            subclass = char_args.get('subclass')
+            if subclass and subclass not in DND_SUBCLASSES.get(character_class, []):
+                subclass = None
+            dnd_subclasses[key] = subclass
+            dnd_requests.append((
+                key,
+                self.dnd_enhancer.build_enhancement_prompt(
+                    generated['filled_content'], species, character_class, level, subclass
+                )
+            ))
+
+        if dnd_requests:
+            print(f"📦 Submitting {len(dnd_requests)} D&D enhancement(s) as a batch job...")
+            results = run_batch_job(
+                backend,
+                dnd_requests,
+                DND_GENERATION_CONFIG,
+                work_dir,
+                f"{run_id}-dnd",
+                poll_interval=poll_interval,
+                timeout=timeout,
+            )
+            for key, _ in dnd_requests:
+                response = results.get(key)
+                if isinstance(response, str):
+                    self._journal_record(
+                        key, 'dnd_enhanced',
+                        enhanced_content=response,
+                        subclass=dnd_subclasses[key]
+                    )
+                    counts['dnd_enhanced'] += 1
+                else:
+                    logger.warning(f"Batch D&D enhancement failed for {key}: {response}")
+
+        logger.info(
+            f"Batch prefetch complete: {counts['generated']} base, "
+            f"{counts['dnd_enhanced']} D&D generation(s)"
+        )
+        return counts
+
+    def run(
+        self,
+        character_args_list: List[Dict[str, Any]],
+        workers: int = 1
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[str, Exception]]]:
+        """Process a batch of characters.
+
+        With ``workers`` greater than 1 the characters are processed through
+        a bounded thread pool. A failing character is logged and reported
+        instead of aborting the rest of the batch.
+
+        Args:
+            character_args_list: Characters to process
+            workers: Number of worker threads (1 = sequential)
+
+        Returns:
+            Tuple of (results, failures) where failures is a list of
+            (character_name, exception)
+        """
+        total = len(character_args_list)
+        results: List[Dict[str, Any]] = []
+        failures: List[Tuple[str, Exception]] = []
+
+        if workers <= 1:
+            for char_idx, char_args in enumerate(character_args_list, 1):
+                try:
+                    results.append(self.process_character(char_idx, total, char_args))
+                except Exception as e:
+                    self._record_failure(failures, char_args, e)
+            return results, failures
+
+        logger.info(f"Processing {total} character(s) with {workers} worker(s)")
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='character'
+        ) as executor:
+            futures = {
+                executor.submit(self.process_character, char_idx, total, char_args): char_args
+                for char_idx, char_args in enumerate(character_args_list, 1)
+            }
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    self._record_failure(failures, futures[future], e)
+
+        return results, failures
+
+    @staticmethod
+    def _record_failure(
+        failures: List[Tuple[str, Exception]],
+        char_args: Dict[str, Any],
+        error: Exception
+    ) -> None:
+        """Log and collect a failed character."""
+        name = char_args.get('name', 'Unknown')
+        logger.error(f"Character '{name}' failed: {error}", exc_info=True)
+        print(f"❌ Character '{name}' failed: {error}")
+        failures.append((name, error))
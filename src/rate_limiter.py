@@ -0,0 +1,367 @@
+"""Shared rate limiting and retry with backoff for Gemini and Google API calls."""
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger('character_creation')
+
+# HTTP status codes worth retrying
+RATE_LIMIT_STATUSES = {429}
+TRANSIENT_STATUSES = {500, 502, 503, 504}
+
+# Google API error reasons that indicate a quota/rate limit
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'RESOURCE_EXHAUSTED'}
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate_per_minute``; callers reserve
+    tokens and sleep for the returned delay when the bucket is empty.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None) -> None:
+        """Initialize the bucket.
+
+        Args:
+            rate_per_minute: Refill rate in tokens per minute
+            burst: Bucket capacity (default: one second's worth, at least 1)
+        """
+        self.rate_per_minute: float = rate_per_minute
+        self.capacity: float = burst if burst is not None else max(1.0, rate_per_minute / 60.0)
+        self._tokens: float = self.capacity
+        self._updated: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Reserve tokens, returning how long the caller must wait.
+
+        The bucket may go negative; later callers then queue behind the
+        reservation, which keeps ordering fair between threads.
+
+        Args:
+            amount: Number of tokens to take
+
+        Returns:
+            Seconds to wait before proceeding (0 if tokens were available)
+        """
+        with self._lock:
+            now = time.monotonic()
+            rate_per_second = self.rate_per_minute / 60.0
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * rate_per_second
+            )
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / rate_per_second
+
+    def set_rate(self, rate_per_minute: float) -> None:
+        """Change the refill rate."""
+        with self._lock:
+            self.rate_per_minute = rate_per_minute
+
+
+class RateLimiter:
+    """Request (QPM) and token (TPM) limits for one API.
+
+    The request rate adapts AIMD-style: it is halved whenever the API
+    reports a rate limit and creeps back towards the configured ceiling on
+    each success, so a batch settles just under the real quota.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        min_requests_per_minute: float = 1.0
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            name: API name used in log messages
+            requests_per_minute: Max requests per minute (None = unlimited)
+            tokens_per_minute: Max tokens per minute (None = unlimited)
+            min_requests_per_minute: Floor for the adaptive request rate
+        """
+        self.name: str = name
+        self.max_requests_per_minute: Optional[float] = requests_per_minute
+        self.min_requests_per_minute: float = min_requests_per_minute
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = (
+            TokenBucket(tokens_per_minute, burst=tokens_per_minute / 6.0)
+            if tokens_per_minute else None
+        )
+
+    def reserve(self, tokens: float = 0) -> float:
+        """Reserve one request (and ``tokens`` tokens).
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        delay = 0.0
+        if self._requests is not None:
+            delay = max(delay, self._requests.reserve(1))
+        if self._tokens is not None and tokens:
+            delay = max(delay, self._tokens.reserve(min(tokens, self._tokens.capacity)))
+        return delay
+
+    def acquire(self, tokens: float = 0) -> None:
+        """Block until a request may be sent."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            logger.debug(f"Rate limiter '{self.name}': waiting {delay:.2f}s")
+            time.sleep(delay)
+
+    async def aacquire(self, tokens: float = 0) -> None:
+        """Async variant of acquire()."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            logger.debug(f"Rate limiter '{self.name}': waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def on_rate_limited(self) -> None:
+        """Halve the request rate after the API reported a rate limit."""
+        if self._requests is None:
+            return
+        new_rate = max(self.min_requests_per_minute, self._requests.rate_per_minute / 2)
+        self._requests.set_rate(new_rate)
+        logger.warning(f"Rate limiter '{self.name}': reduced to {new_rate:.1f} requests/min")
+
+    def on_success(self) -> None:
+        """Recover the request rate towards its configured ceiling."""
+        if self._requests is None or self.max_requests_per_minute is None:
+            return
+        current = self._requests.rate_per_minute
+        if current < self.max_requests_per_minute:
+            self._requests.set_rate(
+                min(self.max_requests_per_minute, current + self.max_requests_per_minute / 20)
+            )
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def configure_rate_limiter(
+    name: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None
+) -> RateLimiter:
+    """Create (or replace) the shared limiter for an API.
+
+    Args:
+        name: API name ('gemini', 'docs', 'drive')
+        requests_per_minute: Max requests per minute (None = unlimited)
+        tokens_per_minute: Max tokens per minute (None = unlimited)
+
+    Returns:
+        The configured RateLimiter
+    """
+    limiter = RateLimiter(name, requests_per_minute, tokens_per_minute)
+    with _LIMITERS_LOCK:
+        _LIMITERS[name] = limiter
+    logger.debug(
+        f"Rate limiter '{name}' configured: qpm={requests_per_minute}, "
+        f"tpm={tokens_per_minute}"
+    )
+    return limiter
+
+
+def get_rate_limiter(name: str) -> RateLimiter:
+    """Return the shared limiter for an API, creating an unlimited one if needed."""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None:
+            limiter = RateLimiter(name)
+            _LIMITERS[name] = limiter
+        return limiter
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """Extract an HTTP status code from Google API / api_core exceptions."""
+    # googleapiclient.errors.HttpError
+    resp = getattr(exc, 'resp', None)
+    if resp is not None and getattr(resp, 'status', None) is not None:
+        try:
+            return int(resp.status)
+        except (TypeError, ValueError):
+            return None
+
+    # google.api_core.exceptions.GoogleAPICallError
+    code = getattr(exc, 'code', None)
+    if isinstance(code, int):
+        return code
+    return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Check whether an exception is a quota/rate-limit error."""
+    if _status_code(exc) in RATE_LIMIT_STATUSES:
+        return True
+    reason = getattr(exc, 'reason', None) or ''
+    if isinstance(reason, str) and reason in RATE_LIMIT_REASONS:
+        return True
+    message = str(exc)
+    return any(r in message for r in RATE_LIMIT_REASONS)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Check whether an exception is a transient server or network error."""
+    if _status_code(exc) in TRANSIENT_STATUSES:
+        return True
+    # asyncio.TimeoutError is only an alias of TimeoutError from Python 3.11
+    return isinstance(exc, (ConnectionError, TimeoutError, asyncio.TimeoutError))
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Read a Retry-After hint from an exception's HTTP response, if any.
+
+    Returns:
+        Seconds to wait, or None if the response carried no hint
+    """
+    headers = getattr(exc, 'resp', None)
+    if headers is None:
+        response = getattr(exc, 'response', None)
+        headers = getattr(response, 'headers', None)
+    if not headers or not hasattr(headers, 'get'):
+        return None
+
+    value = headers.get('retry-after') or headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(
+    exc: BaseException,
+    attempt: int,
+    base_delay: float,
+    max_delay: float
+) -> float:
+    """Compute the delay before the next attempt (full jitter, Retry-After aware)."""
+    hinted = retry_after_seconds(exc)
+    if hinted is not None:
+        return min(max_delay, hinted)
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def _should_retry(exc: BaseException, idempotent: bool) -> bool:
+    """Decide whether an exception is worth retrying."""
+    if is_rate_limit_error(exc):
+        return True
+    return idempotent and is_transient_error(exc)
+
+
+def call_with_retry(
+    fn: Callable[..., Any],
+    *args: Any,
+    limiter: Optional[RateLimiter] = None,
+    tokens: float = 0,
+    max_attempts: int = 6,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    idempotent: bool = True,
+    **kwargs: Any
+) -> Any:
+    """Call ``fn`` under a rate limiter, retrying rate-limit and transient errors.
+
+    Args:
+        fn: Callable to invoke
+        *args: Positional arguments for fn
+        limiter: Optional RateLimiter to acquire before each attempt
+        tokens: Estimated tokens consumed by the call (for TPM limits)
+        max_attempts: Maximum number of attempts
+        base_delay: Initial backoff delay in seconds
+        max_delay: Maximum delay between attempts in seconds
+        idempotent: Retry transient server errors too; when False only
+            rate-limit errors (which were not executed) are retried
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        Result of fn
+
+    Raises:
+        Exception: The last error once retries are exhausted or the error
+            is not retryable
+    """
+    for attempt in range(max_attempts):
+        if limiter is not None:
+            limiter.acquire(tokens)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if attempt + 1 >= max_attempts or not _should_retry(e, idempotent):
+                raise
+            if limiter is not None and is_rate_limit_error(e):
+                limiter.on_rate_limited()
+            delay = _backoff_delay(e, attempt, base_delay, max_delay)
+            logger.warning(
+                f"Retryable error (attempt {attempt + 1}/{max_attempts}): {e}. "
+                f"Retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            continue
+
+        if limiter is not None:
+            limiter.on_success()
+        return result
+
+    raise RuntimeError("call_with_retry: max_attempts must be at least 1")
+
+
+async def acall_with_retry(
+    fn: Callable[..., Any],
+    *args: Any,
+    limiter: Optional[RateLimiter] = None,
+    tokens: float = 0,
+    max_attempts: int = 6,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    idempotent: bool = True,
+    **kwargs: Any
+) -> Any:
+    """Async variant of call_with_retry() for coroutine functions."""
+    for attempt in range(max_attempts):
+        if limiter is not None:
+            await limiter.aacquire(tokens)
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt + 1 >= max_attempts or not _should_retry(e, idempotent):
+                raise
+            if limiter is not None and is_rate_limit_error(e):
+                limiter.on_rate_limited()
+            delay = _backoff_delay(e, attempt, base_delay, max_delay)
+            logger.warning(
+                f"Retryable error (attempt {attempt + 1}/{max_attempts}): {e}. "
+                f"Retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        if limiter is not None:
+            limiter.on_success()
+        return result
+
+    raise RuntimeError("acall_with_retry: max_attempts must be at least 1")
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text (~4 characters per token)."""
+    return max(1, len(text) // 4)
@@ -0,0 +1,222 @@
+"""On-disk, content-addressed cache for Gemini responses."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('character_creation')
+
+
+class ResponseCache:
+    """SQLite-backed cache of Gemini responses.
+
+    Entries are keyed on a hash of the request parameters, expire after
+    a configurable TTL, and are evicted least-recently-used first once the
+    stored responses exceed the size limit.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        max_size_bytes: Optional[int] = 512 * 1024 * 1024
+    ) -> None:
+        """Initialize the response cache.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_seconds: Entry lifetime in seconds (None = never expire)
+            max_size_bytes: Max total size of cached responses
+                (None = unbounded)
+        """
+        self.db_path: str = db_path
+        self.ttl_seconds: Optional[float] = ttl_seconds
+        self.max_size_bytes: Optional[int] = max_size_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' model_name TEXT,'
+            ' response TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' last_access REAL NOT NULL'
+            ')'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_responses_last_access '
+            'ON responses (last_access)'
+        )
+        self._conn.commit()
+        logger.debug(
+            f"Response cache opened: {db_path} (ttl={ttl_seconds}s, "
+            f"max_size={max_size_bytes} bytes)"
+        )
+
+    @staticmethod
+    def make_key(
+        model_name: str,
+        prompt: str,
+        temperature: float,
+        max_output_tokens: int,
+        **extra: Any
+    ) -> str:
+        """Build the cache key for a generation request.
+
+        Args:
+            model_name: Gemini model name
+            prompt: Full prompt text
+            temperature: Sampling temperature
+            max_output_tokens: Maximum response length
+            **extra: Any other parameters that change the response
+
+        Returns:
+            Hex SHA-256 digest of the request parameters
+        """
+        payload = json.dumps(
+            {
+                'model_name': model_name,
+                'prompt': prompt,
+                'temperature': temperature,
+                'max_output_tokens': max_output_tokens,
+                **extra,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                self.misses += 1
+                logger.debug(f"Cache entry expired: {key[:12]}")
+                return None
+
+            self._conn.execute(
+                'UPDATE responses SET last_access = ? WHERE key = ?', (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        logger.debug(f"Cache hit: {key[:12]}")
+        return response
+
+    def set(self, key: str, response: str, model_name: Optional[str] = None) -> None:
+        """Store a response and evict old entries if over the size limit.
+
+        Args:
+            key: Cache key from make_key()
+            response: Response text to cache
+            model_name: Optional model name (informational)
+        """
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, model_name, response, size, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, model_name, response, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+        logger.debug(f"Cached response: {key[:12]} ({size} bytes)")
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least-recently-used ones over the size limit.
+
+        Callers must hold the lock.
+        """
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                'DELETE FROM responses WHERE created_at < ?', (now - self.ttl_seconds,)
+            )
+
+        if self.max_size_bytes is None:
+            return
+
+        total = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        cursor = self._conn.execute(
+            'SELECT key, size FROM responses ORDER BY last_access ASC'
+        )
+        stale_keys = []
+        for key, size in cursor:
+            if total <= self.max_size_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+            evicted += 1
+
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', stale_keys)
+        logger.debug(f"Evicted {evicted} cache entries (LRU)")
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current cache contents.
+
+        Returns:
+            Dict with hits, misses, entries and size_bytes
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'size_bytes': size,
+        }
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+        logger.warning(f"Response cache cleared: {self.db_path}")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,174 @@
+"""Run journal for resumable, checkpointed batch runs."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('character_creation')
+
+# Pipeline stages recorded per character, in order
+STAGES = (
+    'generated',
+    'dnd_enhanced',
+    'doc_created',
+    'content_inserted',
+    'tracked',
+)
+
+
+class RunJournal:
+    """Append-only JSONL journal of completed pipeline stages.
+
+    Each line records one stage finishing for one character together with
+    the data needed to skip it on a later run (generated text, doc ID, ...).
+    Re-opening the journal for the same run ID replays those records so a
+    resumed run only repeats the work that had not finished.
+    """
+
+    def __init__(self, run_id: str, journal_dir: str = 'runs') -> None:
+        """Open (or create) the journal for a run.
+
+        Args:
+            run_id: Identifier of the run
+            journal_dir: Directory holding run journals
+        """
+        self.run_id: str = run_id
+        self.path: str = os.path.join(journal_dir, f"{run_id}.jsonl")
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.header: Optional[Dict[str, Any]] = None
+
+        os.makedirs(journal_dir, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def new_run_id() -> str:
+        """Generate a new, sortable run ID.
+
+        Returns:
+            Run ID like ``20250101T120000-1a2b3c``
+        """
+        return f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    @staticmethod
+    def character_key(char_idx: int, char_args: Dict[str, Any]) -> str:
+        """Build a stable key for a character within a run.
+
+        The key combines the position in the batch with a hash of the
+        character arguments, so an edited input file does not reuse
+        results recorded for a different character.
+
+        Args:
+            char_idx: 1-based index of the character in the batch
+            char_args: Character arguments
+
+        Returns:
+            Character key string
+        """
+        digest = hashlib.sha1(
+            json.dumps(char_args, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()[:12]
+        return f"{char_idx}:{digest}"
+
+    def _load(self) -> None:
+        """Replay an existing journal file into memory."""
+        if not os.path.exists(self.path):
+            return
+
+        count = 0
+        with open(self.path, 'r', encoding='utf-8') as fh:
+            for line_num, line in enumerate(fh, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a partially written last line
+                    logger.warning(
+                        f"Ignoring corrupt journal line {line_num} in {self.path}"
+                    )
+                    continue
+
+                if entry.get('type') == 'run':
+                    self.header = entry
+                    continue
+
+                stages = self._state.setdefault(entry['character'], {})
+                stages[entry['stage']] = entry.get('data') or {}
+                count += 1
+
+        logger.info(f"Loaded {count} journal record(s) for run {self.run_id}")
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Append and flush a journal line. Callers must hold the lock."""
+        with open(self.path, 'a', encoding='utf-8') as fh:
+            fh.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def start(self, **info: Any) -> None:
+        """Record the run header if this is a new journal.
+
+        Args:
+            **info: Run details to store (e.g. input file, total characters)
+        """
+        with self._lock:
+            if self.header is not None:
+                return
+            self.header = {
+                'type': 'run',
+                'run_id': self.run_id,
+                'started_at': datetime.utcnow().isoformat(),
+                **info,
+            }
+            self._append(self.header)
+
+    def record(self, char_key: str, stage: str, **data: Any) -> None:
+        """Record that a stage finished for a character.
+
+        Args:
+            char_key: Key from character_key()
+            stage: One of STAGES
+            **data: Data needed to skip the stage when resuming
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown journal stage: {stage}")
+
+        entry = {
+            'type': 'stage',
+            'character': char_key,
+            'stage': stage,
+            'at': datetime.utcnow().isoformat(),
+            'data': data,
+        }
+        with self._lock:
+            self._append(entry)
+            self._state.setdefault(char_key, {})[stage] = data
+        logger.debug(f"Journal: {char_key} -> {stage}")
+
+    def get(self, char_key: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Return the recorded data for a finished stage.
+
+        Args:
+            char_key: Key from character_key()
+            stage: One of STAGES
+
+        Returns:
+            Recorded data dict, or None if the stage has not finished
+        """
+        with self._lock:
+            return self._state.get(char_key, {}).get(stage)
+
+    def is_done(self, char_key: str, stage: str) -> bool:
+        """Check whether a stage finished for a character."""
+        return self.get(char_key, stage) is not None
+
+    def completed_count(self) -> int:
+        """Return the number of fully tracked characters."""
+        with self._lock:
+            return sum(1 for stages in self._state.values() if 'tracked' in stages)
@@ -0,0 +1,280 @@
+"""SQLite tracking for character creation history with indexed lookups."""
+
+import csv
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.csv_tracker import CharacterCSVTracker
+
+logger = logging.getLogger('character_creation')
+
+
+class CharacterSQLiteTracker:
+    """SQLite tracker for character creation records.
+
+    Drop-in replacement for CharacterCSVTracker: same methods and the same
+    record dicts (string values keyed by HEADERS), but lookups by name,
+    species and class use indexes instead of re-reading the whole file.
+    """
+
+    HEADERS: List[str] = CharacterCSVTracker.HEADERS
+
+    def __init__(self, db_path: str) -> None:
+        """Initialize the SQLite tracker.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path: str = db_path
+        self._lock = threading.Lock()
+
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """Create the characters table and indexes if they don't exist."""
+        with self._lock:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS characters ('
+                ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+                ' name TEXT NOT NULL,'
+                ' sex TEXT, gender TEXT, age_range TEXT, occupation TEXT,'
+                ' species TEXT, class TEXT, subclass TEXT, level TEXT,'
+                ' doc_url TEXT, created_at TEXT'
+                ')'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_characters_name '
+                'ON characters (name COLLATE NOCASE)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_characters_species '
+                'ON characters (species COLLATE NOCASE)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_characters_class '
+                'ON characters (class COLLATE NOCASE)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_characters_created_at '
+                'ON characters (created_at)'
+            )
+            self._conn.commit()
+        logger.debug(f"SQLite tracker ready: {self.db_path}")
+
+    def _row_to_record(self, row: sqlite3.Row) -> Dict[str, str]:
+        """Convert a database row to a CSV-style record dict."""
+        return {header: row[header] or '' for header in self.HEADERS}
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, str]]:
+        """Run a SELECT over the characters table and return record dicts."""
+        columns = ', '.join(self.HEADERS)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT {columns} FROM characters {sql}', params
+            ).fetchall()
+        return [self._row_to_record(row) for row in rows]
+
+    def append_record(
+        self,
+        name: str,
+        sex: str,
+        gender: str,
+        age_range: str,
+        occupation: str,
+        doc_url: str,
+        species: Optional[str] = None,
+        character_class: Optional[str] = None,
+        level: Optional[int] = None,
+        subclass: Optional[str] = None,
+        created_at: Optional[str] = None
+    ) -> None:
+        """Append a character creation record.
+
+        Args:
+            name: Character name
+            sex: male/female
+            gender: he/him, she/her, they/them
+            age_range: child, teen, adult, middle-age, elderly
+            occupation: Character occupation
+            doc_url: URL to the created Google Doc
+            species: Optional D&D species
+            character_class: Optional D&D class
+            level: Optional D&D level
+            subclass: Optional D&D subclass
+            created_at: Optional ISO timestamp (default: now, UTC)
+        """
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO characters (name, sex, gender, age_range, occupation, '
+                'species, class, subclass, level, doc_url, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    name, sex, gender, age_range, occupation,
+                    species or '', character_class or '', subclass or '',
+                    str(level) if level else '', doc_url,
+                    created_at or datetime.utcnow().isoformat(),
+                )
+            )
+            self._conn.commit()
+
+        class_desc = (
+            f"{species} {character_class}" if character_class
+            else "generic"
+        )
+        logger.info(f"Character record added to SQLite: {name} ({class_desc})")
+
+    def get_all_records(self) -> List[Dict[str, str]]:
+        """Retrieve all character records in insertion order.
+
+        Returns:
+            List of character records as dictionaries
+        """
+        records = self._query('ORDER BY id')
+        logger.debug(f"Retrieved {len(records)} records from SQLite")
+        return records
+
+    def get_character_by_name(self, name: str) -> Optional[Dict[str, str]]:
+        """Find a character by name (case-insensitive).
+
+        Args:
+            name: Character name to search for
+
+        Returns:
+            Character record dict or None if not found
+        """
+        records = self._query(
+            'WHERE name = ? COLLATE NOCASE ORDER BY id LIMIT 1', (name,)
+        )
+        if records:
+            logger.debug(f"Found character: {name}")
+            return records[0]
+
+        logger.warning(f"Character not found: {name}")
+        return None
+
+    def get_records_by_species(
+        self, species: str
+    ) -> List[Dict[str, str]]:
+        """Find all characters of a specific species.
+
+        Args:
+            species: Species name to filter by
+
+        Returns:
+            List of character records matching the species
+        """
+        matching = self._query(
+            'WHERE species = ? COLLATE NOCASE ORDER BY id', (species,)
+        )
+        logger.debug(f"Found {len(matching)} characters of species: {species}")
+        return matching
+
+    def get_records_by_class(
+        self, character_class: str
+    ) -> List[Dict[str, str]]:
+        """Find all characters of a specific class.
+
+        Args:
+            character_class: Class name to filter by
+
+        Returns:
+            List of character records matching the class
+        """
+        matching = self._query(
+            'WHERE class = ? COLLATE NOCASE ORDER BY id', (character_class,)
+        )
+        logger.debug(
+            f"Found {len(matching)} characters of class: {character_class}"
+        )
+        return matching
+
+    def get_records_created_between(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Find characters created in a time range.
+
+        Args:
+            start: Inclusive ISO timestamp lower bound (None = unbounded)
+            end: Exclusive ISO timestamp upper bound (None = unbounded)
+
+        Returns:
+            List of character records ordered by creation time
+        """
+        clauses = []
+        params = []
+        if start:
+            clauses.append('created_at >= ?')
+            params.append(start)
+        if end:
+            clauses.append('created_at < ?')
+            params.append(end)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ''
+        return self._query(f'{where}ORDER BY created_at, id', tuple(params))
+
+    def get_record_count(self) -> int:
+        """Get total number of character records.
+
+        Returns:
+            Number of characters tracked
+        """
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM characters').fetchone()[0]
+
+    def clear_all_records(self) -> None:
+        """Delete all records.
+
+        Warning: This action is irreversible!
+        """
+        with self._lock:
+            self._conn.execute('DELETE FROM characters')
+            self._conn.commit()
+        logger.warning(f"All records cleared from SQLite: {self.db_path}")
+
+    def import_from_csv(self, csv_path: str) -> int:
+        """Import all records from a CharacterCSVTracker CSV file.
+
+        Args:
+            csv_path: Path to the tracking CSV
+
+        Returns:
+            Number of records imported
+        """
+        if not os.path.exists(csv_path):
+            logger.warning(f"CSV file not found: {csv_path}")
+            return 0
+
+        with open(csv_path, 'r', newline='', encoding='utf-8') as fh:
+            reader = csv.DictReader(fh)
+            rows = (
+                tuple(row.get(header) or '' for header in self.HEADERS)
+                for row in reader
+            )
+            with self._lock:
+                cursor = self._conn.executemany(
+                    'INSERT INTO characters (name, sex, gender, age_range, occupation, '
+                    'species, class, subclass, level, doc_url, created_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    rows
+                )
+                self._conn.commit()
+                imported = cursor.rowcount
+
+        logger.info(f"Imported {imported} records from CSV: {csv_path}")
+        return imported
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,129 @@
+"""Local cache of exported Google Docs templates keyed on their Drive revision."""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.gdocs import get_file_revision, get_template_text
+
+logger = logging.getLogger('character_creation')
+
+
+def revision_key(metadata: Dict[str, Any]) -> str:
+    """Build a revision identifier from Drive file metadata.
+
+    Prefers ``headRevisionId``; native Google Docs do not report one, so
+    ``modifiedTime`` and ``version`` are used instead.
+
+    Args:
+        metadata: Result of gdocs.get_file_revision()
+
+    Returns:
+        String that changes whenever the file content changes
+    """
+    if metadata.get('headRevisionId'):
+        return str(metadata['headRevisionId'])
+    return f"{metadata.get('modifiedTime', '')}#{metadata.get('version', '')}"
+
+
+class TemplateCache:
+    """Exported template texts stored as one JSON file per template.
+
+    Each run only asks Drive for the template's revision metadata and
+    re-exports the text when the revision differs from the cached one.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        """Initialize the template cache.
+
+        Args:
+            cache_dir: Directory holding ``<template_id>.json`` entries
+        """
+        self.cache_dir: str = cache_dir
+
+    def path_for(self, template_id: str) -> str:
+        """Return the cache file path for a template."""
+        safe_id = ''.join(c if c.isalnum() or c in '-_' else '_' for c in template_id)
+        return os.path.join(self.cache_dir, f"{safe_id}.json")
+
+    def load(self, template_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a template, or None if missing or unreadable."""
+        path = self.path_for(template_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as fh:
+                entry = json.load(fh)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable template cache entry {path}: {e}")
+            return None
+        if entry.get('template_id') != template_id or not isinstance(entry.get('text'), str):
+            return None
+        return entry
+
+    def save(self, template_id: str, revision: str, text: str) -> None:
+        """Store a template's text and revision (atomically replacing the old entry)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path_for(template_id)
+        entry = {
+            'template_id': template_id,
+            'revision': revision,
+            'fetched_at': datetime.utcnow().isoformat(),
+            'text': text,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(entry, fh, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        logger.debug(f"Cached template {template_id} at revision {revision}")
+
+    def get_template_text(
+        self,
+        drive_service,
+        template_id: str,
+        offline: bool = False
+    ) -> str:
+        """Return the template text, exporting it only when the revision changed.
+
+        Args:
+            drive_service: Authenticated Drive service (unused when offline)
+            template_id: Google Docs file ID
+            offline: Use the cached text without contacting Drive
+
+        Returns:
+            Template text
+
+        Raises:
+            FileNotFoundError: If offline and the template is not cached
+        """
+        entry = self.load(template_id)
+
+        if offline:
+            if entry is None:
+                raise FileNotFoundError(
+                    f"Template {template_id} is not cached in {self.cache_dir}; "
+                    "run once without --offline-template"
+                )
+            logger.info(f"Using cached template {template_id} (offline, revision {entry['revision']})")
+            return entry['text']
+
+        try:
+            revision = revision_key(get_file_revision(drive_service, template_id))
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(
+                f"Could not check template revision ({e}); using cached revision {entry['revision']}"
+            )
+            return entry['text']
+
+        if entry is not None and entry.get('revision') == revision:
+            logger.info(f"Template {template_id} unchanged (revision {revision}); using cached text")
+            return entry['text']
+
+        logger.info(f"Template {template_id} changed or not cached (revision {revision}); exporting")
+        text = get_template_text(drive_service, template_id)
+        self.save(template_id, revision, text)
+        return text
@@ -1,12 +1,41 @@
 """Parse Google Docs templates into structured JSON schemas and build JSON outputs."""
 
 import re
+import copy
 import json
 import logging
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple, Optional
 
 logger = logging.getLogger('character_creation')
 
+# Distinct template revisions kept in the parse/schema/prompt caches. The
+# caches are keyed on the template text itself, so an edited template is
+# simply a new entry and stale revisions age out.
+TEMPLATE_CACHE_SIZE = 8
+
+# JSON-mode prompt used with a response schema: the schema already names
+# every section and field, so neither the template nor the schema is repeated
+STRUCTURED_OUTPUT_PROMPT_PREFIX = (
+    "You are a creative character development assistant. Create a vivid, memorable and "
+    "internally consistent character from the character inputs at the end of this prompt.\n\n"
+    "Instructions:\n"
+    "1. Use the character inputs for the matching fields of the response schema\n"
+    "2. Fill every other field with creative details coherent with the rest of the character\n\n"
+)
+
+# Static part of every section prompt in section-parallel generation; the
+# character summary, inputs and section schema follow it
+SECTION_PROMPT_PREFIX = (
+    "You are a creative character development assistant writing one section of a character "
+    "profile. The other sections are written separately from the same character summary, so "
+    "stay consistent with the summary and the character inputs and never contradict them.\n\n"
+    "Instructions:\n"
+    "1. Use the character inputs for the matching fields\n"
+    "2. Fill every field of the section with creative details consistent with the summary\n"
+    "3. Output ONLY valid JSON with exactly this section and its fields, nothing else\n\n"
+)
+
 
 def parse_template_structure(template_text: str) -> Dict[str, Any]:
     """Parse a template into a hierarchical JSON structure.
@@ -42,7 +71,19 @@ def parse_template_structure(template_text: str) -> Dict[str, Any]:
                 "Dexterity": None
             }
         }
+    
+    Results are cached per template text; each call returns a fresh copy
+    that callers may modify.
     """
+    return {
+        section: dict(fields)
+        for section, fields in _parse_template_cached(template_text).items()
+    }
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _parse_template_cached(template_text: str) -> Dict[str, Any]:
+    """Parse a template (see parse_template_structure); shared, do not modify."""
     structure = {}
     current_section = None
     lines = template_text.split('\n')
@@ -93,16 +134,67 @@ def parse_template_structure(template_text: str) -> Dict[str, Any]:
     return structure
 
 
-def extract_template_schema(template_text: str) -> str:
+def clear_template_cache() -> None:
+    """Drop the template parses, schemas and prompt prefixes cached by this module.
+    
+    The caches are keyed on the template text, so this is never needed
+    for correctness; it lets benchmarks time the uncached path.
+    """
+    _parse_template_cached.cache_clear()
+    extract_template_schema.cache_clear()
+    _build_response_schema_cached.cache_clear()
+    build_json_prompt_prefix.cache_clear()
+
+
+def render_template_text(structure: Dict[str, Any]) -> str:
+    """Render a section/field structure as template text in the Google Docs layout.
+    
+    The inverse of parse_template_structure(); used to build a template
+    from character_template_structure.json when the Drive copy is not
+    available (load tests, token comparisons).
+    
+    Args:
+        structure: Dict of section -> fields (dict or list of field names);
+            a 'metadata' section is skipped
+        
+    Returns:
+        Template text with ``### Section`` headings and ``- Field: [blank]`` lines
+    """
+    lines = []
+    for section, fields in structure.items():
+        if section == 'metadata':
+            continue
+        lines.append(f"### {section}")
+        lines.extend(f"- {field}: [blank]" for field in fields)
+        lines.append('')
+    return '\n'.join(lines)
+
+
+@lru_cache(maxsize=2 * TEMPLATE_CACHE_SIZE)
+def extract_template_schema(template_text: str, compact: bool = False) -> str:
     """Extract template structure and convert to JSON schema instructions for Gemini.
     
+    Results are cached per template text.
+    
     Args:
         template_text: Plain text template content
+        compact: Emit single-line JSON with empty values instead of the
+            indented ``"[value]"`` layout (far fewer prompt tokens)
         
     Returns:
         String description of expected JSON output structure
     """
-    structure = parse_template_structure(template_text)
+    structure = _parse_template_cached(template_text)
+    
+    if compact:
+        return json.dumps(
+            {
+                section: {field: "" for field in fields}
+                for section, fields in structure.items()
+            },
+            ensure_ascii=False,
+            separators=(',', ':')
+        )
     
     schema_description = "Output the character as a JSON object with this structure:\n{\n"
     
@@ -117,29 +209,123 @@ def extract_template_schema(template_text: str) -> str:
     return schema_description
 
 
-def build_json_character_prompt(template_text: str, character_inputs: dict) -> str:
-    """Build a prompt for Gemini to fill template and output structured JSON.
+def build_response_schema(template_text: str) -> Dict[str, Any]:
+    """Build a Gemini response schema for a template's sections and fields.
+    
+    Used with ``response_mime_type='application/json'`` so Gemini can only
+    return JSON with exactly the template's structure. Every field is a
+    required string; sections without fields are free-text strings (an
+    OBJECT schema must declare properties). ``property_ordering`` keeps
+    the template's order in the output.
+    
+    Results are cached per template text; each call returns a fresh copy.
     
     Args:
-        template_text: The Google Docs template text
-        character_inputs: Dict with name, sex, gender, age_range, occupation
+        template_text: Plain text template content
         
     Returns:
-        A formatted prompt for Gemini to output JSON
+        OpenAPI-style schema dict accepted by ``GenerationConfig``
     """
-    schema = extract_template_schema(template_text)
+    return copy.deepcopy(_build_response_schema_cached(template_text))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _build_response_schema_cached(template_text: str) -> Dict[str, Any]:
+    """Build the response schema (see build_response_schema); shared, do not modify."""
+    properties: Dict[str, Any] = {}
+    for section, fields in _parse_template_cached(template_text).items():
+        if fields:
+            properties[section] = {
+                'type': 'OBJECT',
+                'properties': {field: {'type': 'STRING'} for field in fields},
+                'required': list(fields),
+                'property_ordering': list(fields),
+            }
+        else:
+            properties[section] = {'type': 'STRING'}
+    return {
+        'type': 'OBJECT',
+        'properties': properties,
+        'required': list(properties),
+        'property_ordering': list(properties),
+    }
+
+
+def build_section_response_schema(template_text: str, section: str) -> Dict[str, Any]:
+    """Build the response schema for a single template section.
     
-    prompt = (
-        "You are a creative character development assistant. Fill in the following character template "
-        "by replacing all placeholder fields with realistic and interesting details based on the provided inputs. "
-        "Maintain creative consistency and make the character vivid and memorable.\n\n"
+    The result is an object with the section as its only key, so a section
+    response has the same shape as the matching part of a full profile.
+    
+    Args:
+        template_text: Plain text template content
+        section: Section name from parse_template_structure()
         
+    Returns:
+        OpenAPI-style schema dict accepted by ``GenerationConfig``
+    """
+    section_schema = _build_response_schema_cached(template_text)['properties'][section]
+    return {
+        'type': 'OBJECT',
+        'properties': {section: copy.deepcopy(section_schema)},
+        'required': [section],
+    }
+
+
+def format_character_inputs(character_inputs: dict) -> str:
+    """Format the per-character inputs block that ends every JSON-mode prompt.
+    
+    Args:
+        character_inputs: Dict with name, sex, gender, age_range, occupation
+        
+    Returns:
+        ``CHARACTER INPUTS:`` block
+    """
+    return (
         "CHARACTER INPUTS:\n"
         f"- Name: {character_inputs['name']}\n"
         f"- Sex: {character_inputs['sex']}\n"
         f"- Gender Identity: {character_inputs['gender']}\n"
         f"- Age Range: {character_inputs['age_range']}\n"
-        f"- Occupation: {character_inputs['occupation']}\n\n"
+        f"- Occupation: {character_inputs['occupation']}\n"
+    )
+
+
+@lru_cache(maxsize=2 * TEMPLATE_CACHE_SIZE)
+def build_json_prompt_prefix(template_text: str, compact: bool = False) -> str:
+    """Build the static part of the JSON-mode prompt for a template.
+    
+    Everything except the character inputs depends only on the template,
+    so it is built once per template revision and shared by every
+    character; the inputs follow it at the end of the prompt.
+    
+    Args:
+        template_text: The Google Docs template text
+        compact: Build the compact (schema only) prefix
+        
+    Returns:
+        Prompt prefix, to be followed by format_character_inputs()
+    """
+    if compact:
+        schema = extract_template_schema(template_text, compact=True)
+        return (
+            "You are a creative character development assistant. Create a vivid, memorable and "
+            "internally consistent character from the character inputs at the end of this prompt.\n\n"
+            
+            f"REQUIRED JSON OUTPUT STRUCTURE:\n{schema}\n\n"
+            
+            "Instructions:\n"
+            "1. Use the character inputs for the matching fields\n"
+            "2. Fill every other field with creative details coherent with the rest of the character\n"
+            "3. Output ONLY valid JSON with exactly these sections and fields, nothing else\n\n"
+        )
+    
+    schema = extract_template_schema(template_text)
+    return (
+        "You are a creative character development assistant. Fill in the following character template "
+        "by replacing all placeholder fields with realistic and interesting details based on the "
+        "character inputs at the end of this prompt. "
+        "Maintain creative consistency and make the character vivid and memorable.\n\n"
         
         "TEMPLATE TO FILL:\n"
         "---START TEMPLATE---\n"
@@ -153,21 +339,113 @@ def build_json_character_prompt(template_text: str, character_inputs: dict) -> s
         "2. Fill in all empty sections with creative and consistent character details\n"
         "3. Make the character's background, personality, and traits coherent\n"
         "4. Output ONLY valid JSON matching the structure above, nothing else\n"
-        "5. Ensure all strings are properly escaped and the JSON is valid\n"
+        "5. Ensure all strings are properly escaped and the JSON is valid\n\n"
     )
+
+
+def build_seed_summary_prompt(character_inputs: dict) -> str:
+    """Build the prompt for the character summary shared by all section prompts.
     
-    return prompt
+    Args:
+        character_inputs: Dict with name, sex, gender, age_range, occupation
+        
+    Returns:
+        Prompt asking for a short plain-text summary of the character
+    """
+    return (
+        "You are a creative character development assistant. Write a concise summary "
+        "(at most 150 words, plain text) of a vivid, memorable character based on the "
+        "character inputs below. Separate writers will each fill one section of the "
+        "character's profile from this summary, so settle the concrete facts they must "
+        "agree on: age, appearance, home, family, personality and key life events.\n\n"
+        + format_character_inputs(character_inputs)
+    )
 
 
-def validate_json_output(response_text: str) -> Tuple[bool, Optional[Dict[str, Any]], str]:
+def build_section_prompt(
+    template_text: str,
+    section: str,
+    seed_summary: str,
+    character_inputs: dict,
+    structured: bool = False
+) -> str:
+    """Build the per-character part of a section prompt.
+    
+    Sent after SECTION_PROMPT_PREFIX.
+    
+    Args:
+        template_text: The Google Docs template text
+        section: Section to generate
+        seed_summary: Character summary shared by every section
+        character_inputs: Dict with name, sex, gender, age_range, occupation
+        structured: The request carries build_section_response_schema(),
+            so the structure is not repeated in the prompt
+        
+    Returns:
+        Prompt naming the section (and its JSON structure)
+    """
+    prompt = (
+        f"CHARACTER SUMMARY:\n{seed_summary.strip()}\n\n"
+        + format_character_inputs(character_inputs)
+        + f"\nSECTION TO WRITE: {section}\n"
+    )
+    if structured:
+        return prompt
+    fields = _parse_template_cached(template_text)[section]
+    schema = json.dumps(
+        {section: {field: "" for field in fields} if fields else ""},
+        ensure_ascii=False,
+        separators=(',', ':')
+    )
+    return prompt + f"REQUIRED JSON OUTPUT STRUCTURE:\n{schema}\n\n"
+
+
+def build_json_character_prompt(
+    template_text: str,
+    character_inputs: dict,
+    compact: bool = False
+) -> str:
+    """Build a prompt for Gemini to fill template and output structured JSON.
+    
+    Args:
+        template_text: The Google Docs template text
+        character_inputs: Dict with name, sex, gender, age_range, occupation
+        compact: Send only the compact schema and the inputs, without
+            embedding the full template text
+        
+    Returns:
+        A formatted prompt for Gemini to output JSON
+    """
+    return build_json_prompt_prefix(template_text, compact) + format_character_inputs(character_inputs)
+
+
+def validate_json_output(
+    response_text: str,
+    structured: bool = False
+) -> Tuple[bool, Optional[Dict[str, Any]], str]:
     """Validate and extract JSON from Gemini response.
     
     Args:
         response_text: Raw text response from Gemini
+        structured: The response was generated with a response schema and
+            is plain JSON; parse it directly instead of searching for a
+            JSON object in surrounding text
         
     Returns:
         Tuple of (is_valid, json_dict, error_message)
     """
+    if structured:
+        try:
+            data = json.loads(response_text)
+        except json.JSONDecodeError as e:
+            # e.g. truncated at max_output_tokens
+            logger.error(f"Invalid JSON in structured response: {e}")
+            return False, None, f"JSON decode error: {e}"
+        if not isinstance(data, dict):
+            return False, None, "Structured response is not a JSON object"
+        logger.info(f"Valid JSON parsed with {len(data)} top-level keys")
+        return True, data, ""
+
     try:
         # Try to extract JSON from response (in case there's extra text)
         json_match = re.search(r'\{[\s\S]*\}', response_text)
@@ -0,0 +1,194 @@
+"""Lightweight per-stage timing spans and run summary reports."""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger('character_creation')
+
+# Percentiles reported in summaries (0-100)
+SUMMARY_PERCENTILES = (50, 95, 99)
+
+# Metric name used for the Prometheus textfile output
+PROMETHEUS_METRIC = 'character_stage_duration_seconds'
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the ``pct`` percentile (0-100) using linear interpolation.
+
+    Args:
+        values: Samples (need not be sorted)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Interpolated percentile, or 0.0 for no samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class StageTimer:
+    """Thread-safe collector of per-stage durations.
+
+    Wrap each unit of work in ``with timer.span('stage'):``; spans from all
+    worker threads are aggregated per stage name. Spans that raise are
+    still timed and additionally counted as errors.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty timer."""
+        self._samples: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one sample of ``stage``.
+
+        Args:
+            stage: Stage name (e.g. 'base_generation')
+        """
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - started, failed=failed)
+
+    def record(self, stage: str, seconds: float, failed: bool = False) -> None:
+        """Record one duration sample for a stage.
+
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+            failed: Whether the timed work raised
+        """
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+            if failed:
+                self._errors[stage] = self._errors.get(stage, 0) + 1
+
+    def reset(self) -> None:
+        """Discard all recorded samples."""
+        with self._lock:
+            self._samples.clear()
+            self._errors.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Summarize the recorded spans per stage.
+
+        Returns:
+            Dict of stage -> {count, errors, total_s, mean_s, max_s and
+            p50_s/p95_s/p99_s}, in the order stages were first seen
+        """
+        with self._lock:
+            samples = {stage: list(values) for stage, values in self._samples.items()}
+            errors = dict(self._errors)
+
+        summary = {}
+        for stage, values in samples.items():
+            total = sum(values)
+            stats = {
+                'count': len(values),
+                'errors': errors.get(stage, 0),
+                'total_s': total,
+                'mean_s': total / len(values),
+                'max_s': max(values),
+            }
+            for pct in SUMMARY_PERCENTILES:
+                stats[f"p{pct}_s"] = percentile(values, pct)
+            summary[stage] = stats
+        return summary
+
+    def format_summary(self) -> str:
+        """Format the summary as an aligned text table."""
+        summary = self.summary()
+        if not summary:
+            return "   (no stages timed)"
+
+        pct_headers = ''.join(f"{f'p{pct} s':>9}" for pct in SUMMARY_PERCENTILES)
+        lines = [f"   {'stage':<18} {'count':>6} {'total s':>9}{pct_headers} {'errors':>6}"]
+        for stage, stats in summary.items():
+            pct_values = ''.join(f"{stats[f'p{pct}_s']:>9.3f}" for pct in SUMMARY_PERCENTILES)
+            lines.append(
+                f"   {stage:<18} {stats['count']:>6} {stats['total_s']:>9.3f}"
+                f"{pct_values} {stats['errors']:>6}"
+            )
+        return '\n'.join(lines)
+
+    def write_json(self, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Write the summary as JSON.
+
+        Args:
+            path: Output file path
+            extra: Optional additional top-level fields (e.g. run_id)
+        """
+        payload = dict(extra or {})
+        payload['stages'] = self.summary()
+        _write_atomic(path, json.dumps(payload, indent=2) + '\n')
+        logger.info(f"Stage timings written to JSON: {path}")
+
+    def write_prometheus(self, path: str, labels: Optional[Dict[str, str]] = None) -> None:
+        """Write the summary in the Prometheus textfile collector format.
+
+        The file is replaced atomically so node_exporter never reads a
+        partial file.
+
+        Args:
+            path: Output file path (conventionally ``*.prom``)
+            labels: Optional extra labels added to every sample
+        """
+        base_labels = ''.join(
+            f',{key}="{_escape_label(value)}"' for key, value in (labels or {}).items()
+        )
+        summary = self.summary()
+        lines = [
+            f"# HELP {PROMETHEUS_METRIC} Character pipeline stage durations.",
+            f"# TYPE {PROMETHEUS_METRIC} summary",
+        ]
+        for stage, stats in summary.items():
+            stage_labels = f'stage="{_escape_label(stage)}"{base_labels}'
+            for pct in SUMMARY_PERCENTILES:
+                lines.append(
+                    f'{PROMETHEUS_METRIC}{{{stage_labels},quantile="{pct / 100:g}"}} '
+                    f"{stats[f'p{pct}_s']:.6f}"
+                )
+            lines.append(f"{PROMETHEUS_METRIC}_sum{{{stage_labels}}} {stats['total_s']:.6f}")
+            lines.append(f"{PROMETHEUS_METRIC}_count{{{stage_labels}}} {stats['count']}")
+        lines.append("# HELP character_stage_errors_total Timed stage calls that raised.")
+        lines.append("# TYPE character_stage_errors_total counter")
+        for stage, stats in summary.items():
+            stage_labels = f'stage="{_escape_label(stage)}"{base_labels}'
+            lines.append(f"character_stage_errors_total{{{stage_labels}}} {stats['errors']}")
+
+        _write_atomic(path, '\n'.join(lines) + '\n')
+        logger.info(f"Stage timings written to Prometheus textfile: {path}")
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(path: str, content: str) -> None:
+    """Write a file via a temporary file and rename."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        fh.write(content)
+    os.replace(tmp_path, path)
+
@@ -0,0 +1,214 @@
+"""Gemini token usage accounting and cost estimates."""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger('character_creation')
+
+# Estimated list prices in USD per 1M tokens: (input, output).
+# Matched by longest model-name prefix; override with GEMINI_PRICE_INPUT_PER_M
+# and GEMINI_PRICE_OUTPUT_PER_M when your contract or model differs.
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    'gemini-2.5-pro': (1.25, 10.00),
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-2.5-flash-lite': (0.10, 0.40),
+    'gemini-2.0-flash': (0.15, 0.60),
+    'gemini-2.0-flash-lite': (0.075, 0.30),
+}
+
+
+class TokenUsage:
+    """Token counts for one or more Gemini calls."""
+
+    FIELDS = ('calls', 'prompt_tokens', 'candidates_tokens', 'total_tokens', 'cached_tokens')
+
+    def __init__(
+        self,
+        calls: int = 0,
+        prompt_tokens: int = 0,
+        candidates_tokens: int = 0,
+        total_tokens: int = 0,
+        cached_tokens: int = 0
+    ) -> None:
+        """Initialize the counts.
+
+        Args:
+            calls: Number of model calls
+            prompt_tokens: Input tokens (including cached tokens)
+            candidates_tokens: Output tokens
+            total_tokens: Total tokens as reported by the API
+            cached_tokens: Input tokens served from a context cache
+        """
+        self.calls: int = calls
+        self.prompt_tokens: int = prompt_tokens
+        self.candidates_tokens: int = candidates_tokens
+        self.total_tokens: int = total_tokens
+        self.cached_tokens: int = cached_tokens
+
+    @classmethod
+    def from_response(cls, response: Any) -> Optional['TokenUsage']:
+        """Read ``usage_metadata`` from a Gemini response.
+
+        Args:
+            response: GenerationResponse (or anything with usage_metadata)
+
+        Returns:
+            TokenUsage for one call, or None if the response has no usage
+        """
+        metadata = getattr(response, 'usage_metadata', None)
+        if metadata is None:
+            return None
+        prompt = int(getattr(metadata, 'prompt_token_count', 0) or 0)
+        candidates = int(getattr(metadata, 'candidates_token_count', 0) or 0)
+        total = int(getattr(metadata, 'total_token_count', 0) or 0) or prompt + candidates
+        cached = int(getattr(metadata, 'cached_content_token_count', 0) or 0)
+        return cls(1, prompt, candidates, total, cached)
+
+    def add(self, other: 'TokenUsage') -> None:
+        """Add another usage's counts to this one."""
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def to_dict(self) -> Dict[str, int]:
+        """Return the counts as a plain dict."""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+def get_model_pricing(model_name: str) -> Optional[Tuple[float, float]]:
+    """Return (input, output) USD per 1M tokens for a model, if known.
+
+    Args:
+        model_name: Gemini model name (e.g. 'gemini-2.5-flash-001')
+
+    Returns:
+        Price tuple, or None when the model has no known price
+    """
+    input_override = os.getenv('GEMINI_PRICE_INPUT_PER_M')
+    output_override = os.getenv('GEMINI_PRICE_OUTPUT_PER_M')
+    if input_override and output_override:
+        return float(input_override), float(output_override)
+
+    matches = [prefix for prefix in MODEL_PRICING if model_name.startswith(prefix)]
+    if not matches:
+        return None
+    return MODEL_PRICING[max(matches, key=len)]
+
+
+def estimate_cost(model_name: str, usage: TokenUsage) -> Optional[float]:
+    """Estimate the USD cost of some usage on a model.
+
+    Cached input tokens are priced as regular input, so the estimate is an
+    upper bound when context caching is used.
+
+    Args:
+        model_name: Gemini model name
+        usage: Token counts
+
+    Returns:
+        Estimated cost in USD, or None for unpriced models
+    """
+    pricing = get_model_pricing(model_name)
+    if pricing is None:
+        return None
+    input_price, output_price = pricing
+    return (usage.prompt_tokens * input_price + usage.candidates_tokens * output_price) / 1_000_000
+
+
+class UsageTracker:
+    """Thread-safe token usage totals per model."""
+
+    def __init__(self) -> None:
+        """Initialize an empty tracker."""
+        self._by_model: Dict[str, TokenUsage] = {}
+        self._lock = threading.Lock()
+
+    def add(self, model_name: str, usage: TokenUsage) -> None:
+        """Add one call's (or several calls') usage for a model."""
+        with self._lock:
+            self._by_model.setdefault(model_name, TokenUsage()).add(usage)
+
+    def by_model(self) -> Dict[str, TokenUsage]:
+        """Return a copy of the usage per model."""
+        with self._lock:
+            return {model: TokenUsage(**usage.to_dict()) for model, usage in self._by_model.items()}
+
+    def total(self) -> TokenUsage:
+        """Return the usage summed over all models."""
+        total = TokenUsage()
+        for usage in self.by_model().values():
+            total.add(usage)
+        return total
+
+    def estimated_cost(self) -> Optional[float]:
+        """Return the estimated USD cost over all priced models (None if none are priced)."""
+        costs = [estimate_cost(model, usage) for model, usage in self.by_model().items()]
+        priced = [cost for cost in costs if cost is not None]
+        return sum(priced) if priced else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return totals and the cost estimate, e.g. for a tracker record."""
+        result: Dict[str, Any] = self.total().to_dict()
+        result['models'] = sorted(self.by_model())
+        result['estimated_cost_usd'] = self.estimated_cost()
+        return result
+
+    def format_summary(self) -> str:
+        """Format the usage per model as text lines."""
+        by_model = self.by_model()
+        if not by_model:
+            return "   (no Gemini calls)"
+
+        lines = []
+        for model, usage in sorted(by_model.items()):
+            cost = estimate_cost(model, usage)
+            cost_text = f"~${cost:.4f}" if cost is not None else "cost unknown"
+            cached_text = f" ({usage.cached_tokens:,} cached)" if usage.cached_tokens else ""
+            lines.append(
+                f"   {model}: {usage.calls} call(s), {usage.prompt_tokens:,} prompt{cached_text} + "
+                f"{usage.candidates_tokens:,} output = {usage.total_tokens:,} tokens, {cost_text}"
+            )
+        return '\n'.join(lines)
+
+
+# Usage scopes active in the current thread / asyncio task
+_active_scopes: ContextVar[Tuple[UsageTracker, ...]] = ContextVar('usage_scopes', default=())
+
+
+@contextmanager
+def usage_scope() -> Iterator[UsageTracker]:
+    """Collect the usage of every Gemini call made inside the block.
+
+    Scopes follow the current thread (and asyncio tasks created inside
+    it) and may be nested; each call is added to every active scope.
+
+    Yields:
+        UsageTracker with the usage recorded while the scope was active
+    """
+    scope = UsageTracker()
+    token = _active_scopes.set(_active_scopes.get() + (scope,))
+    try:
+        yield scope
+    finally:
+        _active_scopes.reset(token)
+
+
+def record_usage(model_name: str, usage: TokenUsage, tracker: Optional[UsageTracker] = None) -> None:
+    """Record a call's usage in ``tracker`` and in all active usage scopes.
+
+    Args:
+        model_name: Model that served the call
+        usage: Token counts of the call
+        tracker: Optional long-lived tracker (e.g. the client's run totals)
+    """
+    if tracker is not None:
+        tracker.add(model_name, usage)
+    for scope in _active_scopes.get():
+        scope.add(model_name, usage)
+    logger.debug(
+        f"Gemini usage ({model_name}): prompt={usage.prompt_tokens}, "
+        f"output={usage.candidates_tokens}, total={usage.total_tokens}"
+    )
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Test batch prediction file handling with the local stand-in backend."""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.batch_prediction import LocalBatchBackend, run_batch_job
+
+
+def test_local_batch_round_trip():
+    """Test that results are matched back to their request IDs."""
+    print("\n[TEST] Local batch round trip...")
+
+    def responder(prompt, generation_config):
+        if 'fail' in prompt:
+            raise RuntimeError('simulated failure')
+        return f"{prompt.upper()} @ {generation_config['temperature']}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = LocalBatchBackend(responder, work_dir=tmp)
+        results = run_batch_job(
+            backend,
+            [('a', 'astra'), ('b', 'bram'), ('c', 'please fail'), ('d', 'astra')],
+            {'temperature': 0.7, 'max_output_tokens': 2048},
+            work_dir=tmp,
+            display_name='test-run',
+            poll_interval=0,
+        )
+
+    assert results['a'] == 'ASTRA @ 0.7'
+    assert results['b'] == 'BRAM @ 0.7'
+    assert results['d'] == 'ASTRA @ 0.7'  # duplicate prompts both answered
+    assert isinstance(results['c'], Exception)
+    print("[OK] 3 results matched, 1 failure reported")
+
+
+def main():
+    print("=" * 60)
+    print("Batch Prediction Tests")
+    print("=" * 60)
+
+    tests = {
+        "Local round trip": test_local_batch_round_trip,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Test Gemini context caching of shared prompt prefixes."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from google.api_core import exceptions as api_exceptions
+
+from fake_services import FakeGeminiClient, FakeLatencyModel
+from src.template_parser import build_json_prompt_prefix, format_character_inputs, render_template_text
+
+TEMPLATE_STRUCTURE_PATH = Path(__file__).parent.parent / 'character_template_structure.json'
+
+SAMPLE_INPUTS = {
+    'name': 'Astra Moon', 'sex': 'female', 'gender': 'she/her',
+    'age_range': 'adult', 'occupation': 'Starship Pilot',
+}
+
+
+def _prefix():
+    with open(TEMPLATE_STRUCTURE_PATH, 'r', encoding='utf-8') as fh:
+        return build_json_prompt_prefix(render_template_text(json.load(fh)))
+
+
+def _client(**kwargs):
+    latency = FakeLatencyModel(latency_median=0.0, latency_sigma=0.0, time_scale=0.001)
+    return FakeGeminiClient(latency=latency, output_tokens=100, **kwargs)
+
+
+def test_prefix_cached_once():
+    """Test that one context cache serves every request with the same prefix."""
+    print("\n[TEST] Prefix cached once...")
+    client = _client(context_cache_ttl=600)
+    prefix = _prefix()
+
+    first = client.generate(format_character_inputs(SAMPLE_INPUTS), prefix=prefix)
+    asyncio.run(client.agenerate_many(['- Name: Bram\n', '- Name: Cass\n'], prefix=prefix))
+
+    entries = [entry for entry in client._context_caches.values() if entry is not None]
+    assert len(entries) == 1
+    assert 'Demographics' in json.loads(first)  # schema came from the cached prefix
+    usage = client.usage.total()
+    assert usage.calls == 3 and usage.cached_tokens >= 3 * (len(prefix) // 4)
+
+    cached_content = entries[0]['cached_content']
+    assert client.release_context_caches() == 1
+    assert cached_content.deleted
+    print(f"[OK] 3 requests, 1 context cache, {usage.cached_tokens} cached tokens")
+
+
+def test_small_prefix_and_disabled():
+    """Test that small prefixes and disabled caching send the prefix inline."""
+    print("\n[TEST] Inline prefixes...")
+    disabled = _client()
+    disabled.generate('inputs', prefix=_prefix())
+    assert not disabled._context_caches
+
+    small = _client(context_cache_ttl=600, context_cache_min_tokens=100000)
+    small.generate('inputs', prefix=_prefix())
+    small.generate('inputs', prefix=_prefix())
+    assert list(small._context_caches.values()) == [None]
+    assert small.usage.total().cached_tokens == 0
+    print("[OK] No context cache below the size minimum or when disabled")
+
+
+def test_ttl_extension_and_expiry():
+    """Test TTL extension while in use and fallback once a cache is gone."""
+    print("\n[TEST] TTL extension and expiry...")
+    client = _client(context_cache_ttl=600)
+    prefix = _prefix()
+    client.generate('first', prefix=prefix)
+
+    entry = next(iter(client._context_caches.values()))
+    entry['expires_at'] -= 500  # less than half the TTL left
+    client.generate('second', prefix=prefix)
+    assert entry['cached_content'].updates == 1
+
+    def expired(*args, **kwargs):
+        raise api_exceptions.NotFound('CachedContent not found')
+
+    entry['model'].generate_content = expired
+    assert client.generate('third', prefix=prefix)
+    assert list(client._context_caches.values()) == [None]
+    print("[OK] TTL extended at half-life, expired cache falls back inline")
+
+
+def test_failed_extension_keeps_cache():
+    """Test that a failed TTL extension keeps the cache in use and deletable."""
+    print("\n[TEST] Failed TTL extension...")
+    client = _client(context_cache_ttl=600)
+    prefix = _prefix()
+    client.generate('first', prefix=prefix)
+
+    entry = next(iter(client._context_caches.values()))
+    cached_content = entry['cached_content']
+
+    def unavailable(*args, **kwargs):
+        raise api_exceptions.ServiceUnavailable('try again')
+
+    cached_content.update = unavailable
+    entry['expires_at'] -= 500
+    client.generate('second', prefix=prefix)
+    assert client._context_caches[client._prefix_key(prefix)] is entry
+    assert not entry['refreshing']
+    assert client.usage.total().cached_tokens >= 2 * (len(prefix) // 4)
+
+    assert client.release_context_caches() == 1
+    assert cached_content.deleted
+    print("[OK] Cache kept after a failed extension and deleted on release")
+
+
+def main():
+    print("=" * 60)
+    print("Context Cache Tests")
+    print("=" * 60)
+
+    tests = {
+        "Prefix cached once": test_prefix_cached_once,
+        "Inline prefixes": test_small_prefix_and_disabled,
+        "TTL extension and expiry": test_ttl_extension_and_expiry,
+        "Failed TTL extension": test_failed_extension_keeps_cache,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 """Test CSV converter functionality."""
 
+import json
+import os
+import tempfile
+from pathlib import Path
+
 from src.csv_converter import (
     csv_to_json_dict,
+    csv_to_jsonl_stream,
+    csv_to_jsonl_parallel,
+    find_row_boundaries,
+    build_column_plan,
+    plan_row_to_character,
     validate_csv_columns,
     normalize_field_name,
     find_matching_field,
 )
 
+EXAMPLE_CSV = str(Path(__file__).parent / 'example_characters.csv')
+
 
 def test_normalize_field_name():
     """Test field name normalization."""
@@ -56,7 +68,7 @@ def test_validate_csv():
     
     try:
         all_valid, matched, unmatched = validate_csv_columns(
-            'example_characters.csv'
+            EXAMPLE_CSV
         )
         
         print(f"  CSV file: example_characters.csv")
@@ -83,7 +95,7 @@ def test_csv_conversion():
     print("\nTesting CSV conversion...")
     
     try:
-        is_valid, error, data = csv_to_json_dict('example_characters.csv')
+        is_valid, error, data = csv_to_json_dict(EXAMPLE_CSV)
         
         if not is_valid:
             print(f"  ✗ Error: {error}")
@@ -103,6 +115,85 @@ def test_csv_conversion():
         print(f"  ✗ Error: {e}")
 
 
+def test_column_plan():
+    """Test that a header is resolved once into a reusable column plan."""
+    print("\nTesting column plan...")
+    
+    header = ['Name', 'Eye Color', 'Favourite Snack', 'json_output']
+    plan, unmatched = build_column_plan(header)
+    
+    assert unmatched == ['Favourite Snack']
+    assert plan == [
+        (0, 'Demographics', 'name'),
+        (1, 'Physical Appearance', 'eye color'),
+        (3, 'metadata', 'json_output'),
+    ]
+    
+    character = plan_row_to_character(['Astra', ' green ', 'crisps', 'yes'], plan)
+    assert character == {
+        'Demographics': {'name': 'Astra'},
+        'Physical Appearance': {'eye color': 'green'},
+        'metadata': {'json_output': True},
+    }
+    assert plan_row_to_character(['Bram'], plan) == {'Demographics': {'name': 'Bram'}}
+    
+    print(f"  ✓ {len(plan)} columns planned, {len(unmatched)} unmatched")
+
+
+def test_jsonl_streaming():
+    """Test that streaming JSONL output matches the in-memory conversion."""
+    print("\nTesting streaming JSONL conversion...")
+    
+    _, _, expected = csv_to_json_dict(EXAMPLE_CSV)
+    if isinstance(expected, dict):
+        expected = [expected]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, 'out.jsonl')
+        is_valid, error, written = csv_to_jsonl_stream(EXAMPLE_CSV, jsonl_path)
+        assert is_valid, error
+        
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            streamed = [json.loads(line) for line in f]
+        
+        assert written == len(expected)
+        assert streamed == expected
+        assert not os.path.exists(jsonl_path + '.tmp')
+    
+    print(f"  ✓ Streamed {written} character(s)")
+
+
+def test_parallel_conversion():
+    """Test that multi-process output matches streaming output in order."""
+    print("\nTesting parallel JSONL conversion...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'quoted.csv')
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write('Name,Secrets,Eye Color\n')
+            for i in range(50):
+                f.write(f'Char {i},"line one\nline ""two"" {i}",green\n')
+        
+        # Chunks must never split the quoted multi-line cells
+        _, ranges = find_row_boundaries(csv_path, chunk_bytes=10)
+        assert len(ranges) == 50
+        
+        stream_path = os.path.join(tmp, 'stream.jsonl')
+        parallel_path = os.path.join(tmp, 'parallel.jsonl')
+        csv_to_jsonl_stream(csv_path, stream_path)
+        is_valid, error, written = csv_to_jsonl_parallel(
+            csv_path, parallel_path, processes=2, chunk_bytes=200
+        )
+        assert is_valid, error
+        assert written == 50
+        
+        with open(stream_path, 'r', encoding='utf-8') as a, \
+                open(parallel_path, 'r', encoding='utf-8') as b:
+            assert a.read() == b.read()
+    
+    print(f"  ✓ {written} characters converted in original order")
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("CSV Converter Tests")
@@ -112,6 +203,9 @@ if __name__ == '__main__':
     test_find_matching_field()
     test_validate_csv()
     test_csv_conversion()
+    test_column_plan()
+    test_jsonl_streaming()
+    test_parallel_conversion()
     
     print("\n" + "=" * 60)
     print("✅ All tests completed!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test D&D enhancement generation (sync, streaming and async paths)."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_services import FakeGeminiClient, FakeLatencyModel
+from src.dnd_enhancement import DND_GENERATION_CONFIG, DNDEnhancer
+
+BASE_PROFILE = "### Basic Info\n- Name: Bram Stone\n- Occupation: Smith\n"
+
+
+class _RecordingClient(FakeGeminiClient):
+    """Fake client recording the generation settings of every call."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.configs = []
+
+    def _record(self, kwargs):
+        self.configs.append({key: kwargs[key] for key in DND_GENERATION_CONFIG})
+
+    def generate(self, *args, **kwargs):
+        self._record(kwargs)
+        return super().generate(*args, **kwargs)
+
+    def generate_stream(self, *args, **kwargs):
+        self._record(kwargs)
+        return super().generate_stream(*args, **kwargs)
+
+    async def agenerate(self, *args, **kwargs):
+        self._record(kwargs)
+        return await super().agenerate(*args, **kwargs)
+
+
+def _enhancer():
+    latency = FakeLatencyModel(latency_median=0.0, latency_sigma=0.0, time_scale=0.001)
+    client = _RecordingClient(latency=latency, output_tokens=200)
+    return DNDEnhancer('fake-project', 'fake-location', 'fake-gemini', client), client
+
+
+def test_async_enhancement():
+    """Test that aenhance_character() generates through GeminiClient.agenerate()."""
+    print("\n[TEST] Async enhancement...")
+    enhancer, client = _enhancer()
+
+    enhanced = asyncio.run(
+        enhancer.aenhance_character(BASE_PROFILE, 'Dwarf', 'Fighter', 3, 'Champion')
+    )
+    assert enhanced and client.usage.total().calls == 1
+
+    try:
+        asyncio.run(enhancer.aenhance_character(BASE_PROFILE, 'Robot', 'Fighter', 3))
+        raise AssertionError("Expected ValueError")
+    except ValueError:
+        pass
+    assert client.usage.total().calls == 1  # validated before calling Gemini
+    print(f"[OK] {len(enhanced)} characters generated, invalid species rejected")
+
+
+def test_paths_share_settings():
+    """Test that the sync, streaming and async paths use DND_GENERATION_CONFIG."""
+    print("\n[TEST] Shared generation settings...")
+    enhancer, client = _enhancer()
+    args = (BASE_PROFILE, 'Dwarf', 'Fighter', 3)
+
+    enhancer.enhance_character(*args)
+    ''.join(enhancer.stream_enhance_character(*args))
+    asyncio.run(enhancer.aenhance_character(*args))
+
+    assert client.configs == [DND_GENERATION_CONFIG] * 3
+    print(f"[OK] All paths use {DND_GENERATION_CONFIG}")
+
+
+def main():
+    print("=" * 60)
+    print("D&D Enhancement Tests")
+    print("=" * 60)
+
+    tests = {
+        "Async enhancement": test_async_enhancement,
+        "Shared generation settings": test_paths_share_settings,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
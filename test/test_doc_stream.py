@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test streamed Gemini generation written incrementally to Google Docs."""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_services import FakeDocsService, FakeGeminiClient, FakeLatencyModel
+from src.dnd_enhancement import DNDEnhancer
+from src.doc_stream import DocStreamWriter
+from src.gdocs import create_doc, replace_text
+from src.pipeline import CharacterPipeline
+from src.run_journal import RunJournal
+
+
+def _latency():
+    return FakeLatencyModel(latency_median=0.0, latency_sigma=0.0, time_scale=0.001)
+
+
+def test_generate_stream():
+    """Test that streamed chunks join to a normal response with one usage record."""
+    print("\n[TEST] generate_stream...")
+    client = FakeGeminiClient(latency=_latency(), output_tokens=400)
+
+    chunks = list(client.generate_stream('Describe a lighthouse keeper.'))
+    assert len(chunks) > 1
+    usage = client.usage.total()
+    assert usage.calls == 1 and usage.candidates_tokens == len(''.join(chunks)) // 4
+    print(f"[OK] {len(chunks)} chunks, {usage.candidates_tokens} output tokens")
+
+
+def test_writer_coalesces():
+    """Test that buffered chunks are appended in fewer batchUpdates."""
+    print("\n[TEST] DocStreamWriter coalescing...")
+    docs = FakeDocsService(latency=FakeLatencyModel(latency_median=0.0, latency_sigma=0.0))
+    created = []
+    writer = DocStreamWriter(docs, 'Astra', on_created=created.append, min_interval=0.05)
+
+    chunks = [f"line {i}\n" for i in range(200)]
+    for chunk in chunks:
+        writer.write(chunk)
+    doc_id = writer.close()
+
+    assert created == [doc_id]
+    assert docs.documents_by_id[doc_id]['text'] == ''.join(chunks)
+    assert 1 <= writer.writes < len(chunks)
+    print(f"[OK] {len(chunks)} chunks in {writer.writes} write(s)")
+
+
+def test_replace_text():
+    """Test replacing a partially written doc in one batchUpdate."""
+    print("\n[TEST] replace_text...")
+    docs = FakeDocsService(latency=FakeLatencyModel(latency_median=0.0, latency_sigma=0.0))
+    doc_id = create_doc(docs, 'Astra')
+    replace_text(docs, doc_id, 'first')
+    replace_text(docs, doc_id, 'Astra Moon, pilot')
+    assert docs.documents_by_id[doc_id]['text'] == 'Astra Moon, pilot'
+    print("[OK] Body replaced")
+
+
+def test_pipeline_streams_docs():
+    """Test that --stream-docs writes the final content for text and D&D characters."""
+    print("\n[TEST] Pipeline streaming...")
+    client = FakeGeminiClient(latency=_latency(), output_tokens=300)
+    docs = FakeDocsService(latency=FakeLatencyModel(latency_median=0.0, latency_sigma=0.0))
+    characters = [
+        {'name': 'Astra', 'sex': 'female', 'gender': 'she/her', 'age_range': 'adult',
+         'occupation': 'Pilot'},
+        {'name': 'Bram', 'sex': 'male', 'gender': 'he/him', 'age_range': 'adult',
+         'occupation': 'Smith', 'species': 'Dwarf', 'character_class': 'Fighter', 'level': 3},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = CharacterPipeline(
+            gemini_client=client,
+            dnd_enhancer=DNDEnhancer('fake-project', 'fake-location', 'fake-gemini', client),
+            docs_service=docs,
+            template_text='### Basic Info\n- Name: [blank]',
+            csv_path=os.path.join(tmp, 'characters.csv'),
+            jsonl_path=os.path.join(tmp, 'characters.jsonl'),
+            json_dir=os.path.join(tmp, 'characters'),
+            journal=RunJournal('stream-run', os.path.join(tmp, 'runs')),
+            stream_docs=True,
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, failures = pipeline.run(characters)
+        assert not failures and len(results) == 2
+
+        with open(os.path.join(tmp, 'characters.jsonl'), 'r', encoding='utf-8') as fh:
+            records = {r['metadata']['name']: r['ai_output'] for r in map(json.loads, fh)}
+
+    texts = {doc['title'].split(' - ')[1]: doc['text'] for doc in docs.documents_by_id.values()}
+    assert texts['Astra'] == records['Astra']['base_character']
+    assert texts['Bram'] == records['Bram']['dnd_enhancement']
+    assert len(docs.latency.calls['docs.create']) == 2
+    print(f"[OK] 2 docs streamed in {len(docs.latency.calls['docs.batchUpdate'])} write(s)")
+
+
+def main():
+    print("=" * 60)
+    print("Doc Streaming Tests")
+    print("=" * 60)
+
+    tests = {
+        "generate_stream": test_generate_stream,
+        "DocStreamWriter coalescing": test_writer_coalesces,
+        "replace_text": test_replace_text,
+        "Pipeline streaming": test_pipeline_streams_docs,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
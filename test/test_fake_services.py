@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Test the fake Gemini/Docs services and their injection into main()."""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_services import (
+    FakeDocsService,
+    FakeDriveService,
+    FakeGeminiClient,
+    FakeLatencyModel,
+)
+from src.gdocs import create_doc_with_content, get_template_text
+
+
+def test_fake_gemini_retries_rate_limits():
+    """Test that simulated 429s go through the real retry path."""
+    print("\n[TEST] Fake Gemini retries...")
+    latency = FakeLatencyModel(latency_median=0.01, rate_limit_rate=0.3, time_scale=0.01, seed=3)
+    client = FakeGeminiClient(latency=latency, output_tokens=50)
+
+    texts = [client.generate(f"prompt {i}") for i in range(10)]
+    assert all(texts)
+    assert latency.errors.get('gemini.generate:rate_limited', 0) > 0
+    assert len(latency.calls['gemini.generate']) == 10 + latency.errors['gemini.generate:rate_limited']
+    print(f"[OK] 10 responses after {latency.errors['gemini.generate:rate_limited']} simulated 429(s)")
+
+
+def test_fake_docs_round_trip():
+    """Test that the fake Drive/Docs services answer the gdocs helpers."""
+    print("\n[TEST] Fake Docs round trip...")
+    latency = FakeLatencyModel(latency_median=0.0, latency_sigma=0.0)
+    drive = FakeDriveService('### Basic Info\n- Name: [blank]', latency=latency)
+    docs = FakeDocsService(latency=latency)
+
+    assert get_template_text(drive, 'any-id').startswith('### Basic Info')
+    doc_id = create_doc_with_content(docs, 'Astra', 'Hello Astra')
+    assert docs.documents_by_id[doc_id] == {'title': 'Astra', 'text': 'Hello Astra'}
+    print("[OK] Template exported and doc created with content")
+
+
+def _run_main(tmp, extra_args, gemini_client, services):
+    """Run main() on three characters inside ``tmp`` with injected fakes."""
+    import main as character_main
+
+    input_path = os.path.join(tmp, 'input.jsonl')
+    with open(input_path, 'w', encoding='utf-8') as fh:
+        for name in ('Astra', 'Bram', 'Cass'):
+            fh.write(json.dumps({'Demographics': {
+                'name': name, 'age': 'adult', 'sex/gender': 'female|she/her',
+                'ethnicity': 'Human', 'occupation': 'Pilot',
+            }}) + '\n')
+    saved_env = dict(os.environ)
+    os.environ.update({
+        'TEMPLATE_DOC_ID': 'fake-template',
+        'CHARACTERS_CSV': os.path.join(tmp, 'characters.csv'),
+        'CHARACTERS_JSONL': os.path.join(tmp, 'characters.jsonl'),
+        'CHARACTERS_JSON_DIR': os.path.join(tmp, 'characters'),
+        'CHARACTERS_RUNS_DIR': os.path.join(tmp, 'runs'),
+        'CHARACTERS_DB': '',
+    })
+
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            character_main.main(
+                ['--jsonl', input_path] + extra_args,
+                gemini_client=gemini_client,
+                services=services,
+            )
+    finally:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def test_main_with_fakes():
+    """Test a full main() run with injected fakes."""
+    print("\n[TEST] main() with fakes...")
+    latency = FakeLatencyModel(latency_median=0.0, latency_sigma=0.0)
+    docs = FakeDocsService(latency=latency)
+    services = (FakeDriveService('### Basic Info\n- Name: [blank]', latency=latency), docs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _run_main(
+            tmp, ['--workers', '3'],
+            FakeGeminiClient(latency=latency, output_tokens=20), services
+        )
+
+        with open(os.path.join(tmp, 'characters.csv'), 'r', encoding='utf-8') as fh:
+            assert len(fh.readlines()) == 4  # header + 3 characters
+        with open(os.path.join(tmp, 'characters.jsonl'), 'r', encoding='utf-8') as fh:
+            records = [json.loads(line) for line in fh]
+        assert all(record['usage']['calls'] == 1 for record in records)
+
+    assert len(docs.documents_by_id) == 3
+    print("[OK] 3 characters created without Google credentials")
+
+
+def test_main_batch_failure_falls_back():
+    """Test that a failed batch job falls back to online generation."""
+    print("\n[TEST] main() with a failing batch job...")
+    import main as character_main
+
+    class FailingBatchBackend:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def submit(self, input_path, display_name):
+            raise RuntimeError("Batch job ended in state JOB_STATE_FAILED")
+
+    latency = FakeLatencyModel(latency_median=0.0, latency_sigma=0.0)
+    docs = FakeDocsService(latency=latency)
+    services = (FakeDriveService('### Basic Info\n- Name: [blank]', latency=latency), docs)
+    client = FakeGeminiClient(latency=latency, output_tokens=20)
+    releases = []
+    client.release_context_caches = lambda: releases.append(True)
+
+    saved_backend = character_main.LocalBatchBackend
+    character_main.LocalBatchBackend = FailingBatchBackend
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            _run_main(tmp, ['--gemini-batch', 'local'], client, services)
+    finally:
+        character_main.LocalBatchBackend = saved_backend
+
+    assert len(docs.documents_by_id) == 3
+    assert client.usage.total().calls == 3 and releases
+    print("[OK] 3 characters generated online after the batch failed")
+
+
+def main():
+    print("=" * 60)
+    print("Fake Services Tests")
+    print("=" * 60)
+
+    tests = {
+        "Fake Gemini retries": test_fake_gemini_retries_rate_limits,
+        "Fake Docs round trip": test_fake_docs_round_trip,
+        "main() with fakes": test_main_with_fakes,
+        "Batch failure fallback": test_main_batch_failure_falls_back,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
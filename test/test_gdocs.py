@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Test diff-based Google Docs patches."""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from googleapiclient.errors import HttpError
+
+from fake_services import FakeDocsService, FakeLatencyModel
+from src.gdocs import (
+    apply_text_diff,
+    build_text_diff_requests,
+    create_doc_with_content,
+    get_doc_text,
+    insert_text,
+)
+
+BASE_PROFILE = (
+    "### Basic Info\n- Name: Bram Stone\n- Occupation: Smith\n\n"
+    "### Personality\n- Traits: stubborn, loyal\n"
+)
+
+
+def _docs():
+    return FakeDocsService(latency=FakeLatencyModel(latency_median=0.0, latency_sigma=0.0))
+
+
+def test_appended_section_is_one_insert():
+    """Test that a profile with an added D&D section only inserts that section."""
+    print("\n[TEST] Appended section...")
+    enhanced = BASE_PROFILE + "\n### D&D Profile\n- Species: Dwarf\n- Class: Fighter\n"
+    requests = build_text_diff_requests(BASE_PROFILE, enhanced)
+
+    assert len(requests) == 1
+    insert = requests[0]['insertText']
+    assert insert['text'] == enhanced[len(BASE_PROFILE):]
+    assert insert['location']['index'] == 1 + len(BASE_PROFILE)
+    assert build_text_diff_requests(enhanced, enhanced) == []
+    print(f"[OK] 1 request, {len(insert['text'])} of {len(enhanced)} characters sent")
+
+
+def test_append_without_trailing_newline():
+    """Test that appending to a body without a trailing newline keeps its last paragraph."""
+    print("\n[TEST] Append without trailing newline...")
+    docs = _docs()
+    old = "### Basic Info\n- Name: Bram"
+    new = old + "\n- Occupation: Smith\n"
+    doc_id = create_doc_with_content(docs, 'Bram', old)
+
+    requests = build_text_diff_requests(old, new)
+    assert requests == [{
+        'insertText': {'location': {'index': 1 + len(old)}, 'text': new[len(old):]}
+    }]
+    apply_text_diff(docs, doc_id, old, new)
+    assert get_doc_text(docs, doc_id)[0] == new
+
+    # Dropping the trailing newline again only deletes the appended text
+    requests = build_text_diff_requests(new, old)
+    assert requests == [{
+        'deleteContentRange': {'range': {'startIndex': 1 + len(old), 'endIndex': 1 + len(new)}}
+    }]
+    print("[OK] Append sent as one insert, last paragraph untouched")
+
+
+def test_utf16_indexes():
+    """Test that indexes count UTF-16 code units (emoji take two)."""
+    print("\n[TEST] UTF-16 indexes...")
+    docs = _docs()
+    old = "🐉 Dragonborn\nLevel 3\nNotes\n"
+    new = "🐉 Dragonborn\nLevel 4 🗡️\nNotes\n"
+    doc_id = create_doc_with_content(docs, 'Bram', old)
+
+    requests = build_text_diff_requests(old, new)
+    assert requests[0]['deleteContentRange']['range'] == {'startIndex': 15, 'endIndex': 23}
+    apply_text_diff(docs, doc_id, old, new)
+    assert get_doc_text(docs, doc_id)[0] == new
+    print("[OK] Emoji-safe patch applied")
+
+
+def test_random_round_trips():
+    """Test that patches always reproduce the new text exactly."""
+    print("\n[TEST] Random round trips...")
+    rng = random.Random(7)
+    lines = ["- Name: Bram", "", "### Notes", "- Élan: 🎲", "- Level: 3", "text without newline"]
+    docs = _docs()
+    for _ in range(50):
+        old = '\n'.join(rng.choice(lines) for _ in range(rng.randint(0, 8)))
+        new = '\n'.join(rng.choice(lines) for _ in range(rng.randint(0, 8)))
+        if not old:
+            continue  # Docs rejects empty inserts
+        doc_id = create_doc_with_content(docs, 'Doc', old)
+        apply_text_diff(docs, doc_id, old, new)
+        assert get_doc_text(docs, doc_id)[0] == new, (old, new)
+    print("[OK] 50 random patches round-tripped")
+
+
+def test_required_revision():
+    """Test that a patch based on a stale read is rejected."""
+    print("\n[TEST] Required revision...")
+    docs = _docs()
+    doc_id = create_doc_with_content(docs, 'Bram', BASE_PROFILE)
+    text, revision_id = get_doc_text(docs, doc_id)
+    assert text == BASE_PROFILE
+
+    apply_text_diff(docs, doc_id, text, text + "Edited elsewhere\n")
+    try:
+        apply_text_diff(docs, doc_id, text, "Stale patch\n", revision_id=revision_id)
+        raise AssertionError("Expected HttpError")
+    except HttpError:
+        pass
+    assert get_doc_text(docs, doc_id)[0].endswith("Edited elsewhere\n")
+    print("[OK] Stale patch rejected")
+
+
+def test_insert_not_replayed():
+    """Test that a failed insert is not retried on server errors."""
+    print("\n[TEST] Insert not replayed...")
+    docs = _docs()
+    doc_id = create_doc_with_content(docs, 'Bram', BASE_PROFILE)
+    docs.latency.error_rate = 1.0
+    try:
+        insert_text(docs, doc_id, BASE_PROFILE)
+        raise AssertionError("Expected HttpError")
+    except HttpError:
+        pass
+    assert len(docs.latency.calls['docs.batchUpdate']) == 2  # initial content + one attempt
+    print("[OK] 503 surfaced after a single attempt")
+
+
+def main():
+    print("=" * 60)
+    print("Google Docs Patch Tests")
+    print("=" * 60)
+
+    tests = {
+        "Appended section": test_appended_section_is_one_insert,
+        "Append without trailing newline": test_append_without_trailing_newline,
+        "UTF-16 indexes": test_utf16_indexes,
+        "Random round trips": test_random_round_trips,
+        "Required revision": test_required_revision,
+        "Insert not replayed": test_insert_not_replayed,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
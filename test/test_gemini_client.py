@@ -114,6 +114,82 @@ def test_extract_text():
         return False
 
 
+def test_agenerate_many():
+    """Test async generation with a bounded number of in-flight requests."""
+    print("\n[TEST] Testing agenerate_many()...")
+    import asyncio
+
+    class MockModel:
+        in_flight = 0
+        peak = 0
+
+        async def generate_content_async(self, prompt, generation_config):
+            MockModel.in_flight += 1
+            MockModel.peak = max(MockModel.peak, MockModel.in_flight)
+            await asyncio.sleep(0.01)
+            MockModel.in_flight -= 1
+            return f"out:{prompt}"
+
+    client = GeminiClient("proj", "us-central1", "gemini-1.5-flash", max_in_flight=2)
+    client._model = MockModel()
+
+    results = asyncio.run(client.agenerate_many([f"p{i}" for i in range(5)]))
+    assert results == [f"out:p{i}" for i in range(5)]
+    assert MockModel.peak <= 2
+    print("[OK] Results returned in order with at most 2 requests in flight")
+
+
+def test_agenerate_many_threads():
+    """Test async generation from event loops in several threads."""
+    print("\n[TEST] Testing agenerate_many() from several threads...")
+    import asyncio
+    import threading
+
+    class MockModel:
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        async def generate_content_async(self, prompt, generation_config):
+            with MockModel.lock:
+                MockModel.in_flight += 1
+                MockModel.peak = max(MockModel.peak, MockModel.in_flight)
+            await asyncio.sleep(0.01)
+            with MockModel.lock:
+                MockModel.in_flight -= 1
+            return f"out:{prompt}"
+
+    client = GeminiClient("proj", "us-central1", "gemini-1.5-flash", max_in_flight=2)
+    client._model = MockModel()
+    results = {}
+
+    def run(thread_id):
+        prompts = [f"t{thread_id}-p{i}" for i in range(5)]
+        results[thread_id] = asyncio.run(client.agenerate_many(prompts))
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for thread_id in range(3):
+        assert results[thread_id] == [f"out:t{thread_id}-p{i}" for i in range(5)]
+    # Each loop has its own semaphore of max_in_flight
+    assert MockModel.peak <= 3 * 2
+    print(f"[OK] 3 event loops, peak {MockModel.peak} requests in flight")
+
+
+def _passed(test):
+    """Run a plain-assert test for the results summary."""
+    try:
+        test()
+    except Exception as e:
+        print(f"[ERROR] {test.__name__} failed: {e!r}")
+        return False
+    return True
+
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -126,6 +202,8 @@ def main():
         "Setter Methods": test_set_methods(),
         "Backward Compatibility": test_backward_compatibility(),
         "Extract Text": test_extract_text(),
+        "Async Generate Many": _passed(test_agenerate_many),
+        "Async Generate Many (threads)": _passed(test_agenerate_many_threads),
     }
     
     print("\n" + "=" * 60)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test the tiered repair of invalid JSON responses."""
+
+import contextlib
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_services import FakeGeminiClient
+from src.json_repair import JSONRepairer, repair_json_locally
+from src.pipeline import CharacterPipeline
+
+PROFILE = {
+    "Basic Info": {"Name": "Bram Stone", "Occupation": "Smith"},
+    "Personality": {"Traits": "stubborn, loyal", "Quirks": "hums while working"},
+}
+
+
+class _ScriptedClient:
+    """Minimal client answering every generate() call with a fixed response."""
+
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def generate(self, prompt, temperature, max_output_tokens, response_schema=None):
+        self.prompts.append(prompt)
+        return self.response
+
+
+def test_local_tiers():
+    """Test that each local fix repairs its kind of damage."""
+    print("\n[TEST] Local repair tiers...")
+    text = json.dumps(PROFILE, indent=2)
+    cases = {
+        'trailing_text': text + "\n```\nLet me know if {you} want changes.",
+        'trailing_commas': text.replace('"Smith"', '"Smith",').replace('}\n}', '},\n}'),
+        'unescaped_quotes': text.replace('hums while', 'hums "Old Forge" while'),
+        'truncation': text[:text.index('while') + 5],
+    }
+    for expected_tier, broken in cases.items():
+        data, tier = repair_json_locally("Here is the profile:\n```json\n" + broken)
+        assert tier == expected_tier, (expected_tier, tier)
+        assert data["Basic Info"] == PROFILE["Basic Info"]
+        print(f"[OK] {tier}: {data['Personality']}")
+
+    # Cut off right after a key: the incomplete member is dropped
+    data, tier = repair_json_locally(text[:text.index('"Quirks"') + 8])
+    assert tier == 'truncation' and data["Personality"] == {"Traits": "stubborn, loyal"}
+    assert repair_json_locally("no json here") == (None, None)
+
+    # A fix that leaves the text unchanged is not credited
+    broken = text.replace('hums while', 'hums "Old Forge" while') + "\nHope this helps {:}"
+    data, tier = repair_json_locally(broken)
+    assert tier == 'unescaped_quotes' and data["Basic Info"] == PROFILE["Basic Info"]
+
+
+def test_model_tier_and_stats():
+    """Test the model fallback and the per-tier counts."""
+    print("\n[TEST] Model tier and stats...")
+    unfixable = '{"Basic Info": {"Name" "Bram"}}'
+    client = _ScriptedClient(json.dumps(PROFILE))
+    repairer = JSONRepairer(client)
+
+    assert repairer.repair(unfixable, "Expecting ':' delimiter") == PROFILE
+    assert "Expecting ':' delimiter" in client.prompts[0] and unfixable in client.prompts[0]
+    assert repairer.repair('{"a": 1,}', "Expecting property name") == {"a": 1}
+    assert len(client.prompts) == 1  # local fixes never call the model
+
+    client.response = "Sorry, I can't help with that."
+    assert repairer.repair(unfixable, "Expecting ':' delimiter") is None
+    assert JSONRepairer().repair(unfixable, "Expecting ':' delimiter") is None
+
+    stats = repairer.stats()
+    assert stats['model'] == 1 and stats['trailing_commas'] == 1
+    assert stats['failed'] == 1 and stats['attempts'] == 3
+    print(f"[OK] {repairer.format_summary().strip()}")
+
+
+def test_pipeline_uses_repair():
+    """Test that the pipeline repairs a truncated response instead of using text output."""
+    print("\n[TEST] Pipeline repair...")
+    pipeline = CharacterPipeline(
+        gemini_client=FakeGeminiClient(),
+        dnd_enhancer=None,
+        docs_service=None,
+        template_text='### Basic Info\n- Name: [blank]',
+        csv_path='unused.csv',
+        jsonl_path='unused.jsonl',
+        json_dir='unused',
+        json_repair_model=False,
+    )
+    truncated = json.dumps(PROFILE)[:-20]
+    with contextlib.redirect_stdout(io.StringIO()):
+        filled_content, character_json = pipeline._parse_base_response(truncated, True)
+    assert character_json["Basic Info"] == PROFILE["Basic Info"]
+    assert "Bram Stone" in filled_content and not filled_content.startswith('{')
+    assert pipeline.json_repairer.stats()['truncation'] == 1
+    assert pipeline.timer.summary()['json_repair']['count'] == 1
+    print("[OK] Truncated response repaired")
+
+
+def main():
+    print("=" * 60)
+    print("JSON Repair Tests")
+    print("=" * 60)
+
+    tests = {
+        "Local repair tiers": test_local_tiers,
+        "Model tier and stats": test_model_tier_and_stats,
+        "Pipeline repair": test_pipeline_uses_repair,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test JSONL tracking and its byte-offset index."""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.json_tracker import (
+    _index_cache,
+    _name_cache,
+    append_character_json,
+    get_character_by_name,
+    index_path_for,
+    list_characters,
+)
+
+
+def _append(path, name, **kwargs):
+    append_character_json(path, name, 'female', 'she/her', 'adult', 'Pilot',
+                          f'https://docs/{name}', f'Profile for {name} ✨', **kwargs)
+
+
+def test_indexed_lookup():
+    """Test that lookups and listings are served from the index."""
+    print("\n[TEST] Indexed lookup...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'characters.jsonl')
+        _append(path, 'Astra')
+        _append(path, 'Bram', species='Dwarf', character_class='Fighter', level=5)
+
+        assert os.path.exists(index_path_for(path))
+        record = get_character_by_name(path, 'Bram')
+        assert record['ai_output']['base_character'] == 'Profile for Bram ✨'
+        listed = list_characters(path)
+        assert [c['name'] for c in listed] == ['Astra', 'Bram']
+        assert listed[1]['dnd']['class'] == 'Fighter'
+        assert get_character_by_name(path, 'Nobody') is None
+    print("[OK] Record found by seeking to its offset")
+
+
+def test_stale_index_rebuilt():
+    """Test that records written without the index are still found."""
+    print("\n[TEST] Stale index rebuilt...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'characters.jsonl')
+        _append(path, 'Astra')
+        with open(path, 'a', encoding='utf-8') as fh:
+            fh.write(json.dumps({'metadata': {'name': 'Legacy'}}) + '\n')
+
+        assert get_character_by_name(path, 'Legacy') is not None
+        os.remove(index_path_for(path))
+        assert len(list_characters(path)) == 2
+        _append(path, 'Cass')
+        assert get_character_by_name(path, 'Cass')['metadata']['name'] == 'Cass'
+    print("[OK] Index rebuilt from the JSONL when stale or missing")
+
+
+def test_append_extends_cached_index():
+    """Test that appends extend the cached index instead of re-reading it."""
+    print("\n[TEST] Cached index on append...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'characters.jsonl')
+        _append(path, 'Astra')
+        list_characters(path)
+        index_path = index_path_for(path)
+        entries = _index_cache[index_path][1]
+
+        for name in ('Bram', 'Cass'):
+            _append(path, name)
+        assert _index_cache[index_path][1] is entries
+        assert [e['name'] for e in entries] == ['Astra', 'Bram', 'Cass']
+        assert _index_cache[index_path][0] == os.path.getsize(index_path)
+        assert get_character_by_name(path, 'Cass')['metadata']['name'] == 'Cass'
+
+        # The name lookup is extended with new entries, not rebuilt
+        by_name = _name_cache[index_path][2]
+        _append(path, 'Dane')
+        assert get_character_by_name(path, 'Dane')['metadata']['name'] == 'Dane'
+        assert _name_cache[index_path][2] is by_name
+        assert get_character_by_name(path, 'Astra')['metadata']['name'] == 'Astra'
+    print("[OK] Cached index and name lookup extended in place")
+
+
+def main():
+    print("=" * 60)
+    print("JSON Tracker Tests")
+    print("=" * 60)
+
+    tests = {
+        "Indexed lookup": test_indexed_lookup,
+        "Stale index rebuilt": test_stale_index_rebuilt,
+        "Cached index on append": test_append_extends_cached_index,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Test rate limiting and retry with backoff."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    call_with_retry,
+    is_rate_limit_error,
+    is_transient_error,
+    retry_after_seconds,
+)
+
+
+class FakeHttpError(Exception):
+    """Mimics googleapiclient.errors.HttpError (status + headers on .resp)."""
+
+    class _Resp(dict):
+        def __init__(self, status, headers):
+            super().__init__(headers)
+            self.status = status
+
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.resp = self._Resp(status, headers or {})
+
+
+def test_token_bucket():
+    """Test that an empty bucket asks callers to wait."""
+    print("\n[TEST] Token bucket...")
+    bucket = TokenBucket(rate_per_minute=60, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    delay = bucket.reserve()
+    assert 0.9 < delay <= 1.0, delay
+    print(f"[OK] Third request waits {delay:.2f}s at 60 QPM")
+
+
+def test_retry_honors_retry_after():
+    """Test that 429s are retried using the Retry-After hint."""
+    print("\n[TEST] Retry with Retry-After...")
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeHttpError(429, {'retry-after': '0'})
+        return 'ok'
+
+    error = FakeHttpError(429, {'retry-after': '7'})
+    assert is_rate_limit_error(error)
+    assert retry_after_seconds(error) == 7.0
+
+    limiter = RateLimiter('test', requests_per_minute=6000)
+    assert call_with_retry(flaky, limiter=limiter) == 'ok'
+    assert len(attempts) == 3
+    print("[OK] Succeeded after 2 rate-limited attempts")
+
+
+def test_non_retryable_errors():
+    """Test that client errors and non-idempotent 5xx are not retried."""
+    print("\n[TEST] Non-retryable errors...")
+    for status, idempotent in ((400, True), (503, False)):
+        attempts = []
+
+        def failing(attempts=attempts, status=status):
+            attempts.append(1)
+            raise FakeHttpError(status)
+
+        try:
+            call_with_retry(failing, idempotent=idempotent, base_delay=0)
+        except FakeHttpError:
+            pass
+        assert len(attempts) == 1, (status, len(attempts))
+    assert not is_transient_error(FakeHttpError(400))
+    assert is_transient_error(asyncio.TimeoutError())
+    print("[OK] Errors propagated without retry")
+
+
+def test_adaptive_rate():
+    """Test that rate limits halve the rate and successes recover it."""
+    print("\n[TEST] Adaptive rate...")
+    limiter = RateLimiter('test', requests_per_minute=100)
+    limiter.on_rate_limited()
+    assert limiter._requests.rate_per_minute == 50
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter._requests.rate_per_minute == 100
+    print("[OK] Rate halves on 429 and recovers to the ceiling")
+
+
+def main():
+    print("=" * 60)
+    print("Rate Limiter Tests")
+    print("=" * 60)
+
+    tests = {
+        "Token bucket": test_token_bucket,
+        "Retry-After": test_retry_honors_retry_after,
+        "Non-retryable errors": test_non_retryable_errors,
+        "Adaptive rate": test_adaptive_rate,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test the Gemini response cache."""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.response_cache import ResponseCache
+
+
+def test_hit_and_miss():
+    """Test basic get/set with hit and miss counting."""
+    print("\n[TEST] Cache hit/miss...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, 'cache.sqlite3'))
+        key = ResponseCache.make_key('gemini-2.5-flash', 'prompt', 0.7, 2048)
+
+        assert cache.get(key) is None
+        cache.set(key, 'response text')
+        assert cache.get(key) == 'response text'
+
+        other = ResponseCache.make_key('gemini-2.5-flash', 'prompt', 0.8, 2048)
+        assert other != key
+        assert cache.get(other) is None
+
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 2
+        assert stats['entries'] == 1
+        cache.close()
+    print("[OK] Hits and misses counted")
+
+
+def test_ttl_expiry():
+    """Test that expired entries are treated as misses."""
+    print("\n[TEST] Cache TTL expiry...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, 'cache.sqlite3'), ttl_seconds=0.05)
+        cache.set('k', 'v')
+        time.sleep(0.1)
+        assert cache.get('k') is None
+        assert cache.stats()['entries'] == 0
+        cache.close()
+    print("[OK] Expired entries are dropped")
+
+
+def test_lru_eviction():
+    """Test size-based least-recently-used eviction."""
+    print("\n[TEST] Cache LRU eviction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, 'cache.sqlite3'), max_size_bytes=25)
+        cache.set('a', 'x' * 10)
+        time.sleep(0.01)
+        cache.set('b', 'y' * 10)
+        time.sleep(0.01)
+        assert cache.get('a') == 'x' * 10  # 'a' is now most recently used
+        time.sleep(0.01)
+        cache.set('c', 'z' * 10)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 'x' * 10
+        assert cache.get('c') == 'z' * 10
+        cache.close()
+    print("[OK] Least recently used entry evicted")
+
+
+def main():
+    print("=" * 60)
+    print("Response Cache Tests")
+    print("=" * 60)
+
+    tests = {
+        "Hit and miss": test_hit_and_miss,
+        "TTL expiry": test_ttl_expiry,
+        "LRU eviction": test_lru_eviction,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
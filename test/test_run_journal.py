@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Test the run journal used for resumable batch runs."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_services import FakeDocsService, FakeLatencyModel
+from src.gdocs import create_doc, insert_text
+from src.pipeline import CharacterPipeline
+from src.run_journal import RunJournal
+
+
+def test_record_and_replay():
+    """Test that recorded stages survive re-opening the journal."""
+    print("\n[TEST] Journal record and replay...")
+    with tempfile.TemporaryDirectory() as tmp:
+        char_args = {'name': 'Astra Moon', 'occupation': 'Starship Pilot'}
+        key = RunJournal.character_key(1, char_args)
+
+        journal = RunJournal('run-1', tmp)
+        journal.start(input='characters.jsonl', characters=1)
+        journal.record(key, 'generated', filled_content='profile')
+        journal.record(key, 'doc_created', doc_id='DOC123')
+
+        resumed = RunJournal('run-1', tmp)
+        assert resumed.header['input'] == 'characters.jsonl'
+        assert resumed.get(key, 'generated') == {'filled_content': 'profile'}
+        assert resumed.get(key, 'doc_created')['doc_id'] == 'DOC123'
+        assert not resumed.is_done(key, 'content_inserted')
+        assert resumed.completed_count() == 0
+    print("[OK] Finished stages replayed from disk")
+
+
+def test_character_key_changes_with_input():
+    """Test that edited character inputs get a different key."""
+    print("\n[TEST] Character key stability...")
+    key_a = RunJournal.character_key(1, {'name': 'Bram', 'level': 5})
+    key_b = RunJournal.character_key(1, {'level': 5, 'name': 'Bram'})
+    key_c = RunJournal.character_key(1, {'name': 'Bram', 'level': 6})
+    assert key_a == key_b
+    assert key_a != key_c
+    print("[OK] Keys are order-independent and input-sensitive")
+
+
+def test_corrupt_last_line_ignored():
+    """Test that a partially written last line does not break replay."""
+    print("\n[TEST] Corrupt journal line...")
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = RunJournal('run-2', tmp)
+        journal.record('1:abc', 'tracked', doc_url='https://example')
+        with open(journal.path, 'a', encoding='utf-8') as fh:
+            fh.write('{"type": "stage", "charac')
+
+        resumed = RunJournal('run-2', tmp)
+        assert resumed.completed_count() == 1
+    print("[OK] Truncated line skipped")
+
+
+def test_resume_does_not_duplicate_content():
+    """Test that resuming after a lost content_inserted record keeps one copy."""
+    print("\n[TEST] Idempotent resume...")
+    docs = FakeDocsService(latency=FakeLatencyModel(latency_median=0.0, latency_sigma=0.0))
+    char_args = {'name': 'Astra', 'sex': 'female', 'gender': 'she/her',
+                 'age_range': 'adult', 'occupation': 'Pilot'}
+    key = RunJournal.character_key(1, char_args)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Crash after the insert succeeded but before it was journaled
+        journal = RunJournal('run-3', tmp)
+        journal.record(key, 'generated', filled_content='Astra Moon, pilot\n')
+        doc_id = create_doc(docs, 'Astra')
+        insert_text(docs, doc_id, 'Astra Moon, pilot\n')
+        journal.record(key, 'doc_created', doc_id=doc_id)
+
+        pipeline = CharacterPipeline(
+            gemini_client=None,
+            dnd_enhancer=None,
+            docs_service=docs,
+            template_text='### Basic Info\n- Name: [blank]',
+            csv_path=os.path.join(tmp, 'characters.csv'),
+            jsonl_path=os.path.join(tmp, 'characters.jsonl'),
+            json_dir=os.path.join(tmp, 'characters'),
+            journal=RunJournal('run-3', tmp),
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, failures = pipeline.run([char_args])
+        assert not failures and len(results) == 1
+    assert docs.documents_by_id[doc_id]['text'] == 'Astra Moon, pilot\n'
+    print("[OK] Document content written once")
+
+
+def main():
+    print("=" * 60)
+    print("Run Journal Tests")
+    print("=" * 60)
+
+    tests = {
+        "Record and replay": test_record_and_replay,
+        "Character key": test_character_key_changes_with_input,
+        "Corrupt last line": test_corrupt_last_line_ignored,
+        "Idempotent resume": test_resume_does_not_duplicate_content,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
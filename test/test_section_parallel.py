@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Test section-parallel generation of JSON-mode characters."""
+
+import contextlib
+import io
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_services import FakeGeminiClient, FakeLatencyModel
+from src.pipeline import CharacterPipeline
+from src.template_parser import (
+    build_section_prompt,
+    build_section_response_schema,
+    parse_template_structure,
+    render_template_text,
+)
+
+TEMPLATE_STRUCTURE_PATH = Path(__file__).parent.parent / 'character_template_structure.json'
+
+CHAR_ARGS = {
+    'name': 'Astra Moon',
+    'sex': 'female',
+    'gender': 'she/her',
+    'age_range': 'adult',
+    'occupation': 'Starship Pilot',
+    'json_output': True,
+}
+
+
+def _template_text():
+    with open(TEMPLATE_STRUCTURE_PATH, 'r', encoding='utf-8') as fh:
+        return render_template_text(json.load(fh)) + "### Secrets\n"
+
+
+class _InFlightClient(FakeGeminiClient):
+    """Fake client recording the peak number of concurrent generate() calls."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.peak = 0
+        self._in_flight_lock = threading.Lock()
+
+    def generate(self, *args, **kwargs):
+        with self._in_flight_lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return super().generate(*args, **kwargs)
+        finally:
+            with self._in_flight_lock:
+                self.in_flight -= 1
+
+
+def _pipeline(template_text, latency, **kwargs):
+    return CharacterPipeline(
+        gemini_client=_InFlightClient(latency=latency, output_tokens=300),
+        dnd_enhancer=None,
+        docs_service=None,
+        template_text=template_text,
+        csv_path='unused.csv',
+        jsonl_path='unused.jsonl',
+        json_dir='unused',
+        **kwargs
+    )
+
+
+def test_section_prompts():
+    """Test that section prompts and schemas cover exactly one section."""
+    print("\n[TEST] Section prompts...")
+    template_text = _template_text()
+    fields = parse_template_structure(template_text)['Demographics']
+
+    prompt = build_section_prompt(template_text, 'Demographics', 'A calm pilot.', CHAR_ARGS)
+    schema = json.loads(prompt.split('REQUIRED JSON OUTPUT STRUCTURE:\n')[1])
+    assert list(schema) == ['Demographics'] and list(schema['Demographics']) == list(fields)
+    assert 'A calm pilot.' in prompt and 'Astra Moon' in prompt
+    assert 'REQUIRED JSON' not in build_section_prompt(
+        template_text, 'Demographics', 'A calm pilot.', CHAR_ARGS, structured=True
+    )
+
+    response_schema = build_section_response_schema(template_text, 'Demographics')
+    assert response_schema['required'] == ['Demographics']
+    assert response_schema['properties']['Demographics']['required'] == list(fields)
+    assert build_section_response_schema(template_text, 'Secrets')['properties']['Secrets'] == {
+        'type': 'STRING'
+    }
+    print(f"[OK] Demographics prompt carries {len(fields)} fields")
+
+
+def test_pipeline_generates_sections():
+    """Test that sections run concurrently and merge into the template structure."""
+    print("\n[TEST] Section-parallel pipeline...")
+    template_text = _template_text()
+    structure = parse_template_structure(template_text)
+    for structured in (False, True):
+        latency = FakeLatencyModel(latency_median=1.0, latency_sigma=0.0, time_scale=0.01)
+        pipeline = _pipeline(
+            template_text, latency, section_parallel=True, structured_output=structured,
+            gemini_concurrency=len(structure)
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            filled_content, character_json = pipeline._generate_base(CHAR_ARGS, True)
+
+        assert list(character_json) == list(structure)
+        assert list(character_json['Demographics']) == list(structure['Demographics'])
+        assert all(isinstance(v, str) and v for v in character_json['Demographics'].values())
+        assert isinstance(character_json['Secrets'], str)
+        assert 'Demographics' in filled_content
+        assert pipeline.gemini_client.usage.total().calls == len(structure) + 1
+        stages = pipeline.timer.summary()
+        assert stages['section_generation']['count'] == 1
+        # The sections overlap instead of adding up (first call is the summary)
+        sequential_s = sum(latency.calls['gemini.generate'][1:]) * latency.time_scale
+        assert stages['section_generation']['total_s'] < sequential_s / 2
+    print(f"[OK] {len(structure)} sections generated and merged (prompt and schema modes)")
+
+
+def test_concurrency_limit():
+    """Test that section requests of all workers stay within gemini_concurrency."""
+    print("\n[TEST] Concurrency limit...")
+    template_text = _template_text()
+    latency = FakeLatencyModel(latency_median=1.0, latency_sigma=0.0, time_scale=0.005)
+    pipeline = _pipeline(
+        template_text, latency, section_parallel=True, gemini_concurrency=2
+    )
+    characters = [dict(CHAR_ARGS, name=f"Pilot {i}") for i in range(4)]
+
+    workers = [
+        threading.Thread(target=pipeline._generate_base, args=(c, True)) for c in characters
+    ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    client = pipeline.gemini_client
+    assert client.usage.total().calls == 4 * (len(parse_template_structure(template_text)) + 1)
+    assert client.peak == 2, client.peak
+    print(f"[OK] Peak of {client.peak} requests in flight with 4 workers")
+
+
+def main():
+    print("=" * 60)
+    print("Section-Parallel Generation Tests")
+    print("=" * 60)
+
+    tests = {
+        "Section prompts": test_section_prompts,
+        "Section-parallel pipeline": test_pipeline_generates_sections,
+        "Concurrency limit": test_concurrency_limit,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
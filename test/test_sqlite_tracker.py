@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Test the SQLite character tracker against the CSV tracker interface."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.csv_tracker import CharacterCSVTracker
+from src.sqlite_tracker import CharacterSQLiteTracker
+
+
+def test_lookups_match_csv_tracker():
+    """Test that both trackers return the same records."""
+    print("\n[TEST] SQLite lookups match CSV tracker...")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_tracker = CharacterCSVTracker(os.path.join(tmp, 'characters.csv'))
+        db_tracker = CharacterSQLiteTracker(os.path.join(tmp, 'characters.db'))
+
+        for tracker in (csv_tracker, db_tracker):
+            tracker.append_record('Astra Moon', 'female', 'she/her', 'adult',
+                                  'Pilot', 'https://docs/a')
+            tracker.append_record('Bram Ironforge', 'male', 'he/him', 'adult',
+                                  'Warrior', 'https://docs/b', species='Dwarf',
+                                  character_class='Fighter', level=5)
+
+        assert db_tracker.get_record_count() == csv_tracker.get_record_count() == 2
+        bram = db_tracker.get_character_by_name('bram ironforge')
+        assert bram['level'] == '5' and bram['class'] == 'Fighter'
+        assert bram.keys() == csv_tracker.get_character_by_name('Bram Ironforge').keys()
+        assert [r['name'] for r in db_tracker.get_records_by_species('dwarf')] == ['Bram Ironforge']
+        assert len(db_tracker.get_records_by_class('FIGHTER')) == 1
+        assert db_tracker.get_character_by_name('Nobody') is None
+        db_tracker.close()
+    print("[OK] Name/species/class lookups are case-insensitive and consistent")
+
+
+def test_import_from_csv():
+    """Test the one-shot CSV import."""
+    print("\n[TEST] Import from CSV...")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'characters.csv')
+        csv_tracker = CharacterCSVTracker(csv_path)
+        csv_tracker.append_record('Eldra', 'female', 'she/her', 'adult', 'Assassin',
+                                  'https://docs/e', species='Half-Elf',
+                                  character_class='Rogue', level=7,
+                                  subclass='Arcane Trickster')
+
+        db_tracker = CharacterSQLiteTracker(os.path.join(tmp, 'characters.db'))
+        assert db_tracker.import_from_csv(csv_path) == 1
+        assert db_tracker.get_all_records() == csv_tracker.get_all_records()
+        assert len(db_tracker.get_records_created_between(start='2000-01-01')) == 1
+        db_tracker.close()
+    print("[OK] Imported records are identical to the CSV")
+
+
+def main():
+    print("=" * 60)
+    print("SQLite Tracker Tests")
+    print("=" * 60)
+
+    tests = {
+        "Lookups match CSV": test_lookups_match_csv_tracker,
+        "Import from CSV": test_import_from_csv,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
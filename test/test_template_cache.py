@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Test the revision-keyed local template cache."""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_services import FakeDriveService, FakeLatencyModel
+from src.template_cache import TemplateCache, revision_key
+
+
+def _drive(text):
+    return FakeDriveService(text, latency=FakeLatencyModel(latency_median=0.0, latency_sigma=0.0))
+
+
+def test_revision_key():
+    """Test revision identifiers for binary files and native Docs."""
+    print("\n[TEST] Revision key...")
+    assert revision_key({'headRevisionId': 'abc', 'modifiedTime': 't'}) == 'abc'
+    assert revision_key({'modifiedTime': '2025-01-01T00:00:00Z', 'version': '7'}) == '2025-01-01T00:00:00Z#7'
+    print("[OK] headRevisionId preferred, modifiedTime#version otherwise")
+
+
+def test_export_only_on_new_revision():
+    """Test that the text is exported once per revision."""
+    print("\n[TEST] Export only on new revision...")
+    drive = _drive('### Basic Info\n- Name: [blank]')
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TemplateCache(tmp)
+        assert cache.get_template_text(drive, 'tmpl-1').startswith('### Basic Info')
+        assert cache.get_template_text(drive, 'tmpl-1').startswith('### Basic Info')
+        assert len(drive.latency.calls['drive.export']) == 1
+        assert len(drive.latency.calls['drive.get']) == 2
+
+        drive.update_template('### Abilities\n- Strength: [blank]')
+        assert cache.get_template_text(drive, 'tmpl-1').startswith('### Abilities')
+        assert len(drive.latency.calls['drive.export']) == 2
+    print("[OK] Unchanged revision served from cache, edit re-exported")
+
+
+def test_offline():
+    """Test --offline-template behaviour with and without a cached copy."""
+    print("\n[TEST] Offline template...")
+    drive = _drive('### Basic Info\n- Name: [blank]')
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TemplateCache(tmp)
+        try:
+            cache.get_template_text(None, 'tmpl-1', offline=True)
+            raise AssertionError("Expected FileNotFoundError")
+        except FileNotFoundError:
+            pass
+
+        cache.get_template_text(drive, 'tmpl-1')
+        drive.update_template('### Changed\n- Field: [blank]')
+        assert cache.get_template_text(None, 'tmpl-1', offline=True).startswith('### Basic Info')
+    print("[OK] Offline mode never contacts Drive")
+
+
+def main():
+    print("=" * 60)
+    print("Template Cache Tests")
+    print("=" * 60)
+
+    tests = {
+        "Revision key": test_revision_key,
+        "Export only on new revision": test_export_only_on_new_revision,
+        "Offline template": test_offline,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Test template parsing and JSON-mode prompt building."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_services import FakeGeminiClient, FakeLatencyModel
+from src.gemini_client import GeminiClient
+from src.template_parser import (
+    STRUCTURED_OUTPUT_PROMPT_PREFIX,
+    build_json_character_prompt,
+    build_json_prompt_prefix,
+    build_response_schema,
+    extract_template_schema,
+    format_character_inputs,
+    parse_template_structure,
+    render_template_text,
+    validate_json_output,
+)
+
+TEMPLATE_STRUCTURE_PATH = Path(__file__).parent.parent / 'character_template_structure.json'
+
+SAMPLE_INPUTS = {
+    'name': 'Astra Moon',
+    'sex': 'female',
+    'gender': 'she/her',
+    'age_range': 'adult',
+    'occupation': 'Starship Pilot',
+}
+
+
+def _template_text():
+    with open(TEMPLATE_STRUCTURE_PATH, 'r', encoding='utf-8') as fh:
+        return render_template_text(json.load(fh))
+
+
+def test_render_round_trip():
+    """Test that rendered template text parses back to the same fields."""
+    print("\n[TEST] Render/parse round trip...")
+    with open(TEMPLATE_STRUCTURE_PATH, 'r', encoding='utf-8') as fh:
+        structure = json.load(fh)
+    parsed = parse_template_structure(render_template_text(structure))
+
+    expected = {s: list(f) for s, f in structure.items() if s != 'metadata'}
+    assert {s: list(f) for s, f in parsed.items()} == expected
+    print(f"[OK] {len(parsed)} sections round-tripped")
+
+
+def test_compact_schema():
+    """Test that the compact schema is valid JSON with every template field."""
+    print("\n[TEST] Compact schema...")
+    template_text = _template_text()
+    schema = json.loads(extract_template_schema(template_text, compact=True))
+    structure = parse_template_structure(template_text)
+
+    assert list(schema) == list(structure)
+    for section, fields in structure.items():
+        assert list(schema[section]) == list(fields)
+    assert '\n' not in extract_template_schema(template_text, compact=True)
+    print(f"[OK] {sum(len(f) for f in schema.values())} fields in one line")
+
+
+def test_compact_prompt():
+    """Test that the compact prompt drops the template and still yields JSON."""
+    print("\n[TEST] Compact prompt...")
+    template_text = _template_text()
+    full = build_json_character_prompt(template_text, SAMPLE_INPUTS)
+    compact = build_json_character_prompt(template_text, SAMPLE_INPUTS, compact=True)
+
+    assert '---START TEMPLATE---' in full
+    assert '---START TEMPLATE---' not in compact
+    assert 'Astra Moon' in compact and 'Starship Pilot' in compact
+
+    latency = FakeLatencyModel(latency_median=0.0, latency_sigma=0.0, time_scale=0.001)
+    client = FakeGeminiClient(latency=latency, output_tokens=200)
+    full_tokens, compact_tokens = client.count_tokens(full), client.count_tokens(compact)
+    assert compact_tokens < full_tokens / 2
+    response = json.loads(client.generate(compact))
+    assert list(response) == list(parse_template_structure(template_text))
+    print(f"[OK] {full_tokens} -> {compact_tokens} prompt tokens")
+
+
+def test_template_caching():
+    """Test that parses and prompt prefixes are cached per template text."""
+    print("\n[TEST] Template caching...")
+    template_text = _template_text()
+    first = parse_template_structure(template_text)
+    first['Demographics']['Injected'] = 'x'
+    assert 'Injected' not in parse_template_structure(template_text)['Demographics']
+
+    edited = template_text + "\n### Secrets\n- Hidden Motive: [blank]\n"
+    assert 'Secrets' in parse_template_structure(edited)
+    assert 'Secrets' not in parse_template_structure(template_text)
+
+    prefix = build_json_prompt_prefix(template_text, compact=True)
+    assert build_json_prompt_prefix(template_text, compact=True) is prefix
+    prompt = build_json_character_prompt(template_text, SAMPLE_INPUTS, compact=True)
+    assert prompt.startswith(prefix)
+    assert prompt.endswith(f"- Occupation: {SAMPLE_INPUTS['occupation']}\n")
+    print("[OK] Cached results are copied, keyed on content, inputs come last")
+
+
+def test_structured_output():
+    """Test the response schema and parsing schema-constrained responses."""
+    print("\n[TEST] Structured output...")
+    template_text = _template_text() + "### Secrets\n"
+    structure = parse_template_structure(template_text)
+    schema = build_response_schema(template_text)
+
+    assert schema['property_ordering'] == list(structure)
+    assert schema['properties']['Secrets'] == {'type': 'STRING'}
+    demographics = schema['properties']['Demographics']
+    assert demographics['required'] == list(structure['Demographics'])
+    schema['properties'].clear()
+    assert build_response_schema(template_text)['properties']  # copies, not the cached dict
+
+    # The SDK accepts the schema (converted locally, no request is sent)
+    config = GeminiClient._generation_config(0.7, 2048, build_response_schema(template_text))
+    assert config.to_dict()['response_mime_type'] == 'application/json'
+
+    latency = FakeLatencyModel(latency_median=0.0, latency_sigma=0.0, time_scale=0.001)
+    client = FakeGeminiClient(latency=latency, output_tokens=200)
+    response = client.generate(
+        format_character_inputs(SAMPLE_INPUTS),
+        prefix=STRUCTURED_OUTPUT_PROMPT_PREFIX,
+        response_schema=build_response_schema(template_text)
+    )
+    is_valid, data, _ = validate_json_output(response, structured=True)
+    assert is_valid and list(data) == list(structure)
+    assert not validate_json_output('{"Demographics": {"Name": "Ast', structured=True)[0]
+    print(f"[OK] {len(structure)} sections constrained by the schema")
+
+
+def main():
+    print("=" * 60)
+    print("Template Parser Tests")
+    print("=" * 60)
+
+    tests = {
+        "Render/parse round trip": test_render_round_trip,
+        "Compact schema": test_compact_schema,
+        "Compact prompt": test_compact_prompt,
+        "Template caching": test_template_caching,
+        "Structured output": test_structured_output,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
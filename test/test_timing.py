@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Test per-stage timing spans and their reports."""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.timing import StageTimer, percentile
+
+
+def test_percentile():
+    """Test linear-interpolation percentiles."""
+    print("\n[TEST] Percentiles...")
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([1.0, 2.0], 100) == 2.0
+    print("[OK] Percentiles interpolate between samples")
+
+
+def test_spans_and_summary():
+    """Test that spans are aggregated per stage, including failures."""
+    print("\n[TEST] Spans and summary...")
+    timer = StageTimer()
+    for seconds in (0.1, 0.2, 0.3):
+        timer.record('base_generation', seconds)
+    with timer.span('tracker_write'):
+        pass
+    try:
+        with timer.span('doc_create'):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    summary = timer.summary()
+    assert list(summary) == ['base_generation', 'tracker_write', 'doc_create']
+    assert summary['base_generation']['count'] == 3
+    assert abs(summary['base_generation']['total_s'] - 0.6) < 1e-9
+    assert abs(summary['base_generation']['p50_s'] - 0.2) < 1e-9
+    assert summary['doc_create']['errors'] == 1
+    assert 'base_generation' in timer.format_summary()
+    print("[OK] 3 stages summarized, failed span counted as an error")
+
+
+def test_report_files():
+    """Test the JSON and Prometheus textfile outputs."""
+    print("\n[TEST] Report files...")
+    timer = StageTimer()
+    timer.record('doc_insert', 0.5)
+    timer.record('doc_insert', 1.5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'timings.json')
+        timer.write_json(json_path, extra={'run_id': 'run-1'})
+        with open(json_path, 'r', encoding='utf-8') as fh:
+            payload = json.load(fh)
+        assert payload['run_id'] == 'run-1'
+        assert payload['stages']['doc_insert']['count'] == 2
+
+        prom_path = os.path.join(tmp, 'metrics', 'timings.prom')
+        timer.write_prometheus(prom_path, labels={'job': 'characters'})
+        with open(prom_path, 'r', encoding='utf-8') as fh:
+            text = fh.read()
+        assert '# TYPE character_stage_duration_seconds summary' in text
+        assert 'character_stage_duration_seconds{stage="doc_insert",job="characters",quantile="0.5"} 1.000000' in text
+        assert 'character_stage_duration_seconds_sum{stage="doc_insert",job="characters"} 2.000000' in text
+        assert 'character_stage_duration_seconds_count{stage="doc_insert",job="characters"} 2' in text
+        assert not os.path.exists(prom_path + '.tmp')
+    print("[OK] JSON and Prometheus textfile written")
+
+
+def main():
+    print("=" * 60)
+    print("Stage Timing Tests")
+    print("=" * 60)
+
+    tests = {
+        "Percentiles": test_percentile,
+        "Spans and summary": test_spans_and_summary,
+        "Report files": test_report_files,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Test Gemini token usage accounting and cost estimates."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_services import FakeGeminiClient, FakeLatencyModel
+from src.usage import (
+    TokenUsage,
+    UsageTracker,
+    estimate_cost,
+    get_model_pricing,
+    usage_scope,
+)
+
+
+def _fake_client(model_name='fake-gemini'):
+    latency = FakeLatencyModel(latency_median=0.0, latency_sigma=0.0, time_scale=0.001)
+    return FakeGeminiClient(model_name=model_name, latency=latency, output_tokens=40)
+
+
+def test_pricing():
+    """Test model price lookup and cost estimates."""
+    print("\n[TEST] Pricing...")
+    assert get_model_pricing('gemini-2.5-flash') == (0.30, 2.50)
+    assert get_model_pricing('gemini-2.5-flash-lite-001') == (0.10, 0.40)
+    assert get_model_pricing('fake-gemini') is None
+
+    usage = TokenUsage(calls=1, prompt_tokens=1_000_000, candidates_tokens=100_000)
+    assert abs(estimate_cost('gemini-2.5-flash', usage) - 0.55) < 1e-9
+    assert estimate_cost('fake-gemini', usage) is None
+    print("[OK] Longest-prefix pricing and cost estimate")
+
+
+def test_client_records_usage():
+    """Test that GeminiClient keeps run totals from usage_metadata."""
+    print("\n[TEST] Client usage totals...")
+    client = _fake_client('gemini-2.5-flash')
+    client.generate('Describe a lighthouse keeper.')
+    client.generate('Describe a cartographer.')
+
+    total = client.usage.total()
+    assert total.calls == 2
+    assert total.candidates_tokens > 0 and total.prompt_tokens > 0
+    assert total.total_tokens == total.prompt_tokens + total.candidates_tokens
+    assert client.usage.estimated_cost() > 0
+    assert 'gemini-2.5-flash: 2 call(s)' in client.usage.format_summary()
+    print(f"[OK] {total.total_tokens} tokens over {total.calls} calls")
+
+
+def test_usage_scopes():
+    """Test per-character scopes, including async calls and nesting."""
+    print("\n[TEST] Usage scopes...")
+    client = _fake_client()
+
+    with usage_scope() as outer:
+        client.generate('first')
+        with usage_scope() as inner:
+            asyncio.run(client.agenerate_many(['second', 'third']))
+    client.generate('outside any scope')
+
+    assert inner.total().calls == 2
+    assert outer.total().calls == 3
+    assert client.usage.total().calls == 4
+    record = outer.to_dict()
+    assert record['models'] == ['fake-gemini']
+    assert record['estimated_cost_usd'] is None
+    assert UsageTracker().format_summary() == "   (no Gemini calls)"
+    print("[OK] Scopes count only the calls made inside them")
+
+
+def main():
+    print("=" * 60)
+    print("Token Usage Tests")
+    print("=" * 60)
+
+    tests = {
+        "Pricing": test_pricing,
+        "Client usage totals": test_client_records_usage,
+        "Usage scopes": test_usage_scopes,
+    }
+
+    results = {}
+    for test_name, test in tests.items():
+        try:
+            test()
+            results[test_name] = True
+        except Exception as e:
+            print(f"[ERROR] {test_name} failed: {e!r}")
+            results[test_name] = False
+
+    print("\n" + "=" * 60)
+    for test_name, passed in results.items():
+        status = "[OK]" if passed else "[FAILED]"
+        print(f"{status} {test_name}")
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())